@@ -12,6 +12,7 @@ import time
 from datetime import datetime
 from flask import Flask, jsonify, request
 from flask_cors import CORS
+from serializacao import configurar_json_flask
 
 # Adicionar ao path
 sys.path.insert(0, os.path.dirname(__file__))
@@ -21,6 +22,8 @@ from monitor_selenium import verificar, carregar_resultados
 
 app = Flask(__name__)
 CORS(app)
+# jsonify via serializacao (orjson se instalado; compacto, ?pretty=1 para indentar)
+configurar_json_flask(app)
 
 # Inicializar sistema de liquidação
 sistema = SistemaLiquidacao()
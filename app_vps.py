@@ -9,17 +9,20 @@ Aplicação completa para VPS
 
 import os
 import sys
-import json
 import threading
 import time
+import math
+import base64
 from datetime import datetime
 try:
     from zoneinfo import ZoneInfo
 except ImportError:
     from pytz import timezone
     ZoneInfo = lambda tz: timezone(tz)
-from flask import Flask, jsonify, send_from_directory, render_template_string, request
+from flask import Flask, Response, jsonify, render_template_string, request, g
 from flask_cors import CORS
+import serializacao
+from serializacao import configurar_json_flask, pretty_pedido
 
 # Adicionar venv ao path
 venv_path = os.path.join(os.path.dirname(__file__), 'venv', 'lib', 'python3.14', 'site-packages')
@@ -28,6 +31,8 @@ if os.path.exists(venv_path):
 
 app = Flask(__name__)
 CORS(app)
+# jsonify via serializacao (orjson se instalado; compacto, ?pretty=1 para indentar)
+configurar_json_flask(app)
 
 # Configurar logging
 import logging
@@ -36,19 +41,41 @@ logger = logging.getLogger(__name__)
 
 # Importar monitor Bicho Certo e integração PHP
 try:
-    from monitor_selenium import verificar, carregar_resultados
+    from monitor_selenium import (
+        verificar, carregar_resultados, carregar_resultados_data, carregar_resultados_estado
+    )
 except ImportError:
     print("⚠️  Monitor Bicho Certo não encontrado. API funcionará, mas monitor não rodará.")
     verificar = None
     carregar_resultados = lambda: {'resultados': [], 'ultima_verificacao': None}
+    carregar_resultados_data = lambda data: []
+    carregar_resultados_estado = lambda estado, data=None: []
+
+from visoes_resultados import (
+    obter_visao, versao_dados, montar_organizados, gravar_resultados_php, ler_resultados_php
+)
+from banco_resultados import obter_banco, expandir_sorteios, expandir_sorteio
+from registro_resultado import ATRIBUTOS
+from lideranca import iniciar_candidatura, e_lider, estado_lideranca
+from compressao import escolher_codificacao, comprimir, obter_comprimido, guardar_comprimido, TAMANHO_MINIMO
 
 # Importar integração com endpoint PHP (opcional)
 try:
-    from integracao_endpoint_php import processar_resultados_via_php
+    from integracao_endpoint_php import (
+        obter_resultados_php, atualizar_cache_php, atualizar_cache_php_em_segundo_plano,
+        iniciar_atualizador_php, estado_cache_php, registrar_ao_atualizar
+    )
     INTEGRACAO_PHP_DISPONIVEL = True
 except ImportError:
     INTEGRACAO_PHP_DISPONIVEL = False
-    processar_resultados_via_php = None
+    obter_resultados_php = None
+
+def resultados_php():
+    """
+    Última resposta do endpoint PHP: do cache deste processo (líder, que roda o
+    atualizador) ou da cópia gravada pelo líder no banco (demais processos).
+    """
+    return obter_resultados_php() or ler_resultados_php()
 
 # Importar bot de liquidação (opcional)
 try:
@@ -58,6 +85,10 @@ except ImportError:
     BOT_DISPONIVEL = False
     BotLiquidacao = None
 
+# Onde rodam monitor, bot e atualizador PHP: 'interno' (processo líder entre os workers
+# web) ou 'externo' (worker_monitor.py, processo dedicado; a web só lê o banco)
+MONITOR_MODO = os.getenv('MONITOR_MODO', 'interno').lower()
+
 # Variável global para controlar monitor
 monitor_rodando = False
 monitor_thread = None
@@ -68,10 +99,33 @@ watchdog_rodando = False
 # Variável global para bot de liquidação
 bot_liquidacao = None
 
+def roda_tarefas_de_fundo():
+    """True se este processo roda monitor/bot/atualizador PHP: líder e MONITOR_MODO=interno"""
+    return MONITOR_MODO != 'externo' and e_lider()
+
+def responder_nao_lider(mensagem):
+    """409 para ações que só o processo líder executa (monitor, bot, atualizador PHP)"""
+    if MONITOR_MODO == 'externo':
+        mensagem = f"{mensagem} (MONITOR_MODO=externo: roda no worker_monitor.py)"
+    return jsonify({
+        'sucesso': False,
+        'mensagem': mensagem,
+        'modo': MONITOR_MODO,
+        'lideranca': estado_lideranca()
+    }), 409
+
 def iniciar_monitor(intervalo=60):
-    """Inicia o monitor em uma thread separada"""
+    """Inicia o monitor em uma thread separada (só no processo líder)"""
     global monitor_thread, monitor_iniciado, monitor_rodando
     
+    if MONITOR_MODO == 'externo':
+        logger.info("ℹ️  Monitor não iniciado: roda no worker dedicado (MONITOR_MODO=externo)")
+        return
+    
+    if not e_lider():
+        logger.info("ℹ️  Monitor não iniciado: este processo não é o líder")
+        return
+    
     if monitor_iniciado and monitor_thread and monitor_thread.is_alive():
         logger.warning("⚠️  Monitor já está rodando")
         return
@@ -146,6 +200,122 @@ def monitor_loop(intervalo=60):
     
     logger.info("🛑 Monitor Bicho Certo encerrado")
 
+# Endpoints (GET) cujas respostas dependem só dos dados do banco: validados por
+# ETag (fraca, geração) e Last-Modified (escrita da geração). A última verificação
+# muda a cada ciclo sem mudar os dados: vai no cabeçalho X-Ultima-Verificacao
+# (também nas respostas 304) e em /api/status, não nos validadores
+ENDPOINTS_VALIDADOS = {
+    'api_resultados',
+    'api_resultados_por_estado',
+    'api_resultados_estado',
+    'api_resultados_por_data',
+    'api_debug_loteria_nacional',
+    'api_resultados_organizados',
+    'api_resultados_data',
+    'api_resultados_estado_data',
+    'api_resultados_desde',
+    'resultados_json',
+}
+
+# Endpoints com respostas grandes: comprimidas (gzip/brotli) conforme o Accept-Encoding
+ENDPOINTS_COMPRIMIDOS = ENDPOINTS_VALIDADOS
+
+def validadores_cache():
+    """(etag, last_modified, ultima_verificacao) da versão atual dos dados"""
+    banco = obter_banco()
+    geracao, ultima_verificacao = versao_dados(banco)
+    geracao_em = banco.geracao_em()
+    modificado = None
+    if geracao_em:
+        try:
+            modificado = datetime.fromisoformat(geracao_em).replace(microsecond=0)
+            if modificado.tzinfo is None:
+                modificado = modificado.replace(tzinfo=ZoneInfo('America/Sao_Paulo'))
+        except ValueError:
+            pass
+    return f"g{geracao}", modificado, ultima_verificacao
+
+def etag_codificada(etag, codificacao):
+    """ETag da representação: cada codificação tem bytes diferentes"""
+    return f"{etag}-{codificacao}" if codificacao else etag
+
+def aplicar_validadores(resposta, etag, modificado, ultima_verificacao):
+    # Fraca: o corpo ainda traz ultima_verificacao, que pode variar dentro da mesma geração
+    resposta.set_etag(etag, weak=True)
+    if modificado:
+        resposta.last_modified = modificado
+    if ultima_verificacao:
+        resposta.headers['X-Ultima-Verificacao'] = ultima_verificacao
+    # Navegador guarda a resposta, mas revalida (If-None-Match) a cada uso
+    resposta.headers['Cache-Control'] = 'no-cache'
+
+@app.before_request
+def responder_nao_modificado():
+    """
+    Responde sem executar o endpoint quando possível: 304 se o cliente já tem a
+    versão atual, ou os bytes comprimidos já guardados para esta versão.
+    """
+    if request.method not in ('GET', 'HEAD') or request.endpoint not in ENDPOINTS_VALIDADOS:
+        return None
+    # /api/resultados completo vem do endpoint PHP quando a integração está ativa (fora do banco)
+    if (request.endpoint == 'api_resultados' and INTEGRACAO_PHP_DISPONIVEL
+            and not PARAMETROS_CONSULTA.intersection(request.args)):
+        return None
+    try:
+        etag, modificado, ultima_verificacao = validadores_cache()
+    except Exception as e:
+        logger.warning(f"Erro ao calcular ETag: {e}")
+        return None
+    g.validadores = (etag, modificado, ultima_verificacao)
+    codificacao = escolher_codificacao(request.accept_encodings)
+    
+    if request.if_none_match:
+        nao_modificado = any(
+            request.if_none_match.contains_weak(etag_codificada(etag, c)) for c in (None, 'gzip', 'br')
+        )
+    elif request.if_modified_since and modificado:
+        nao_modificado = modificado <= request.if_modified_since
+    else:
+        nao_modificado = False
+    if nao_modificado:
+        resposta = app.response_class(status=304)
+        aplicar_validadores(resposta, etag_codificada(etag, codificacao), modificado, ultima_verificacao)
+        resposta.vary.add('Accept-Encoding')
+        return resposta
+    
+    comprimido = codificacao and obter_comprimido((request.full_path, codificacao), etag)
+    if comprimido:
+        resposta = app.response_class(comprimido, mimetype='application/json')
+        resposta.headers['Content-Encoding'] = codificacao
+        return resposta
+    return None
+
+@app.after_request
+def adicionar_validadores(resposta):
+    """ETag/Last-Modified e compressão nas respostas 200 dos endpoints validados"""
+    validadores = g.pop('validadores', None)
+    if resposta.status_code != 200 or request.endpoint not in ENDPOINTS_COMPRIMIDOS:
+        return resposta
+    resposta.vary.add('Accept-Encoding')
+    
+    codificacao = resposta.headers.get('Content-Encoding')
+    if codificacao is None and not resposta.direct_passthrough:
+        codificacao = escolher_codificacao(request.accept_encodings)
+        conteudo = resposta.get_data()
+        if codificacao and len(conteudo) >= TAMANHO_MINIMO:
+            comprimido = comprimir(conteudo, codificacao)
+            if validadores:
+                guardar_comprimido((request.full_path, codificacao), validadores[0], comprimido)
+            resposta.set_data(comprimido)
+            resposta.headers['Content-Encoding'] = codificacao
+        else:
+            codificacao = None
+    
+    if validadores:
+        etag, modificado, ultima_verificacao = validadores
+        aplicar_validadores(resposta, etag_codificada(etag, codificacao), modificado, ultima_verificacao)
+    return resposta
+
 @app.route('/')
 def index():
     """Dashboard principal"""
@@ -165,14 +335,103 @@ def index():
         </html>
         """
 
+# Parâmetros que ativam a consulta paginada de /api/resultados (sem eles: lista completa)
+PARAMETROS_CONSULTA = {
+    'loteria', 'estado', 'horario', 'data', 'data_inicio', 'data_fim',
+    'limite', 'limit', 'cursor', 'campos', 'fields', 'ordem',
+}
+LIMITE_PADRAO = 100
+LIMITE_MAXIMO = 1000
+
+def codificar_cursor(sorteio_id, posicao):
+    """Cursor opaco: último resultado entregue (sorteio, posição)"""
+    return base64.urlsafe_b64encode(f"{sorteio_id}:{posicao}".encode()).decode().rstrip('=')
+
+def decodificar_cursor(cursor):
+    texto = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+    sorteio_id, posicao = texto.split(':')
+    return int(sorteio_id), int(posicao)
+
+def consultar_resultados():
+    """
+    /api/resultados com filtros (loteria, estado, horario, data ou data_inicio/data_fim),
+    paginação por cursor (limite, cursor, ordem=asc|desc) e projeção (campos=numero,animal,...).
+    Os filtros são aplicados no banco (índices de sorteios); a página busca no máximo
+    limite+1 sorteios.
+    """
+    args = request.args
+    try:
+        limite = min(max(int(args.get('limite') or args.get('limit') or LIMITE_PADRAO), 1), LIMITE_MAXIMO)
+        cursor = decodificar_cursor(args['cursor']) if args.get('cursor') else None
+    except (ValueError, UnicodeDecodeError):
+        return jsonify({'erro': 'limite ou cursor inválido'}), 400
+    decrescente = args.get('ordem', 'asc').lower() == 'desc'
+    
+    campos = None
+    lista_campos = args.get('campos') or args.get('fields')
+    if lista_campos:
+        campos = [
+            'data_extração' if campo.strip() == 'data_extracao' else campo.strip()
+            for campo in lista_campos.split(',') if campo.strip()
+        ]
+        invalidos = [campo for campo in campos if campo not in ATRIBUTOS]
+        if invalidos:
+            return jsonify({'erro': f"Campos inválidos: {', '.join(invalidos)}", 'campos_validos': list(ATRIBUTOS)}), 400
+    
+    banco = obter_banco()
+    sorteios = banco.listar_sorteios_pagina(
+        loteria=args.get('loteria'),
+        horario=args.get('horario'),
+        estado=args.get('estado'),
+        data_inicio=args.get('data_inicio') or args.get('data'),
+        data_fim=args.get('data_fim') or args.get('data'),
+        a_partir_de=cursor[0] if cursor else None,
+        limite=limite + 1,
+        decrescente=decrescente,
+    )
+    
+    resultados = []
+    proximo_cursor = None
+    for sorteio in sorteios:
+        for resultado in expandir_sorteio(sorteio):
+            if cursor and sorteio['id'] == cursor[0] and resultado['posicao'] <= cursor[1]:
+                continue
+            if len(resultados) == limite:
+                ultimo = resultados[-1]
+                proximo_cursor = codificar_cursor(ultimo[0], ultimo[1]['posicao'])
+                break
+            resultados.append((sorteio['id'], resultado))
+        if proximo_cursor:
+            break
+    
+    if campos:
+        linhas = [{campo: resultado.get(campo) for campo in campos} for _, resultado in resultados]
+    else:
+        linhas = [resultado for _, resultado in resultados]
+    return jsonify({
+        'resultados': linhas,
+        'total': len(linhas),
+        'proximo_cursor': proximo_cursor,
+        'ultima_verificacao': banco.ultima_verificacao(),
+        'fonte': 'bichocerto.com'
+    })
+
 @app.route('/api/resultados')
 def api_resultados():
     """API para retornar resultados do Bicho Certo"""
-    # Se integração PHP disponível, usar ela
-    if INTEGRACAO_PHP_DISPONIVEL and processar_resultados_via_php:
+    # Filtros/paginação/projeção: consulta direto no banco
+    if PARAMETROS_CONSULTA.intersection(request.args):
+        return consultar_resultados()
+    
+    # Se integração PHP disponível, servir a última resposta dela (atualizada em segundo plano)
+    if INTEGRACAO_PHP_DISPONIVEL and obter_resultados_php:
         try:
-            resultado = processar_resultados_via_php()
-            if resultado.get('sucesso'):
+            resultado = resultados_php()
+            if resultado is None:
+                # Ainda sem resposta do PHP: o líder dispara a atualização; responde com o banco local
+                if roda_tarefas_de_fundo():
+                    atualizar_cache_php_em_segundo_plano()
+            else:
                 resultados = resultado.get('resultados', [])
                 # Adicionar estado se não existir
                 from monitor_selenium import identificar_estado
@@ -182,7 +441,7 @@ def api_resultados():
                 return jsonify({
                     'resultados': resultados,
                     'summary': resultado.get('summary', {}),
-                    'ultima_verificacao': datetime.now(ZoneInfo('America/Sao_Paulo')).isoformat(),
+                    'ultima_verificacao': resultado.get('atualizado_em'),
                     'fonte': 'bichocerto.com'
                 })
         except Exception as e:
@@ -206,37 +465,18 @@ def api_resultados():
             'fonte': 'bichocerto.com'
         }), 500
 
+def responder_visao(nome):
+    """Resposta com os bytes prontos de uma visão materializada (?pretty=1 para indentar)"""
+    conteudo = obter_visao(nome)
+    if pretty_pedido(request):
+        return jsonify(serializacao.loads(conteudo))
+    return app.response_class(conteudo, mimetype='application/json')
+
 @app.route('/api/resultados/por-estado')
 def api_resultados_por_estado():
-    """API para retornar resultados agrupados por estado"""
+    """API para retornar resultados agrupados por estado (visão materializada)"""
     try:
-        dados = carregar_resultados()
-        resultados = dados.get('resultados', [])
-        
-        # Adicionar estado se não existir
-        from monitor_selenium import identificar_estado
-        for r in resultados:
-            if 'estado' not in r:
-                r['estado'] = identificar_estado(r.get('loteria', ''))
-        
-        # Agrupar por estado
-        por_estado = {}
-        for r in resultados:
-            estado = r.get('estado', 'BR')
-            if estado not in por_estado:
-                por_estado[estado] = []
-            por_estado[estado].append(r)
-        
-        # Estatísticas
-        stats = {estado: len(grupo) for estado, grupo in por_estado.items()}
-        
-        return jsonify({
-            'por_estado': por_estado,
-            'estatisticas': stats,
-            'total_resultados': len(resultados),
-            'total_estados': len(por_estado),
-            'ultima_verificacao': dados.get('ultima_verificacao')
-        })
+        return responder_visao('por_estado')
     except Exception as e:
         return jsonify({
             'por_estado': {},
@@ -247,17 +487,8 @@ def api_resultados_por_estado():
 def api_resultados_estado(estado):
     """API para retornar resultados de um estado específico"""
     try:
-        dados = carregar_resultados()
-        resultados = dados.get('resultados', [])
-        
-        # Adicionar estado se não existir
-        from monitor_selenium import identificar_estado
-        for r in resultados:
-            if 'estado' not in r:
-                r['estado'] = identificar_estado(r.get('loteria', ''))
-        
-        # Filtrar por estado
-        resultados_estado = [r for r in resultados if r.get('estado', '').upper() == estado.upper()]
+        # Consulta pelo índice (estado, data) do banco
+        resultados_estado = carregar_resultados_estado(estado)
         
         # Agrupar por loteria e horário
         por_loteria = {}
@@ -283,52 +514,9 @@ def api_resultados_estado(estado):
 
 @app.route('/api/resultados/por-data')
 def api_resultados_por_data():
-    """API para retornar resultados agrupados por data"""
+    """API para retornar resultados agrupados por data (visão materializada)"""
     try:
-        dados = carregar_resultados()
-        resultados = dados.get('resultados', [])
-        
-        # Adicionar estado se não existir
-        from monitor_selenium import identificar_estado
-        for r in resultados:
-            if 'estado' not in r:
-                r['estado'] = identificar_estado(r.get('loteria', ''))
-        
-        # Extrair data de cada resultado
-        def extrair_data(resultado):
-            # Tentar data_extração primeiro (formato DD/MM/YYYY)
-            if 'data_extração' in resultado and resultado['data_extração']:
-                return resultado['data_extração']
-            # Tentar timestamp (formato ISO)
-            if 'timestamp' in resultado and resultado['timestamp']:
-                try:
-                    from datetime import datetime
-                    dt = datetime.fromisoformat(resultado['timestamp'].replace('Z', '+00:00'))
-                    return dt.strftime('%d/%m/%Y')
-                except:
-                    pass
-            # Fallback: data atual
-            from datetime import datetime
-            return datetime.now().strftime('%d/%m/%Y')
-        
-        # Agrupar por data
-        por_data = {}
-        for r in resultados:
-            data = extrair_data(r)
-            if data not in por_data:
-                por_data[data] = []
-            por_data[data].append(r)
-        
-        # Estatísticas
-        stats = {data: len(grupo) for data, grupo in por_data.items()}
-        
-        return jsonify({
-            'por_data': por_data,
-            'estatisticas': stats,
-            'total_resultados': len(resultados),
-            'total_datas': len(por_data),
-            'ultima_verificacao': dados.get('ultima_verificacao')
-        })
+        return responder_visao('por_data')
     except Exception as e:
         return jsonify({
             'por_data': {},
@@ -371,195 +559,12 @@ def api_debug_loteria_nacional():
 
 @app.route('/api/resultados/organizados')
 def api_resultados_organizados():
-    """API para retornar resultados organizados por tabela (loteria) e horário"""
+    """
+    API para retornar resultados organizados por tabela (loteria) e horário.
+    Servida da visão materializada (montada uma vez por ciclo do monitor).
+    """
     try:
-        dados = carregar_resultados()
-        resultados = dados.get('resultados', [])
-        
-        # Adicionar estado se não existir
-        from monitor_selenium import identificar_estado
-        for r in resultados:
-            if 'estado' not in r:
-                r['estado'] = identificar_estado(r.get('loteria', ''))
-        
-        # Função para extrair data normalizada
-        def extrair_data_normalizada(resultado):
-            from datetime import datetime
-            try:
-                from zoneinfo import ZoneInfo
-            except ImportError:
-                from pytz import timezone
-                ZoneInfo = lambda tz: timezone(tz)
-            
-            if 'data_extração' in resultado and resultado['data_extração']:
-                data = resultado['data_extração']
-                if data and str(data).strip():
-                    return str(data).strip()
-            if 'timestamp' in resultado and resultado['timestamp']:
-                try:
-                    timestamp = resultado['timestamp']
-                    if timestamp:
-                        dt = datetime.fromisoformat(str(timestamp).replace('Z', '+00:00'))
-                        return dt.strftime('%d/%m/%Y')
-                except Exception as e:
-                    logger.debug(f"Erro ao extrair data do timestamp: {e}")
-                    pass
-            return datetime.now(ZoneInfo('America/Sao_Paulo')).strftime('%d/%m/%Y')
-        
-        # Organizar por tabela (loteria), horário e data (sorteio específico)
-        # Usar chave única: loteria + horário + data para separar sorteios diferentes
-        organizados = {}
-        
-        # Debug: verificar quantos resultados da Loteria Nacional existem e seus horários
-        resultados_ln = [r for r in resultados if r.get('loteria') == 'Loteria Nacional']
-        if resultados_ln:
-            horarios_ln = {}
-            for r in resultados_ln:
-                horario = r.get('horario', 'N/A')
-                if horario not in horarios_ln:
-                    horarios_ln[horario] = 0
-                horarios_ln[horario] += 1
-            logger.info(f"🔍 DEBUG API: Loteria Nacional tem {len(resultados_ln)} resultados em {len(horarios_ln)} horários: {list(horarios_ln.keys())}")
-            for horario, count in horarios_ln.items():
-                logger.info(f"   🕐 {horario}: {count} resultados")
-        
-        for r in resultados:
-            loteria = r.get('loteria', 'Desconhecida')
-            horario = r.get('horario', 'N/A')
-            data = extrair_data_normalizada(r)
-            
-            # Criar chave única para cada sorteio: loteria + horário + data
-            # Isso permite que múltiplos sorteios no mesmo horário sejam separados
-            chave_tabela = loteria
-            # Usar horário + data como chave para separar sorteios diferentes
-            chave_horario_data = f"{horario}_{data}"
-            
-            # Inicializar estrutura se não existir
-            if chave_tabela not in organizados:
-                organizados[chave_tabela] = {}
-            
-            if chave_horario_data not in organizados[chave_tabela]:
-                organizados[chave_tabela][chave_horario_data] = []
-            
-            # Adicionar resultado formatado
-            resultado_formatado = {
-                'horario': horario,
-                'animal': r.get('animal', ''),
-                'numero': r.get('numero', ''),
-                'posicao': r.get('posicao', 0),
-                'colocacao': r.get('colocacao', ''),
-                'estado': r.get('estado', 'BR'),
-                'data_extracao': data,
-                'timestamp': r.get('timestamp', '')
-            }
-            
-            organizados[chave_tabela][chave_horario_data].append(resultado_formatado)
-        
-        # Processar e limitar a 7 posições por sorteio
-        # Agora cada chave horario_data já representa um sorteio único
-        organizados_final = {}
-        
-        for tabela in organizados:
-            organizados_final[tabela] = {}
-            
-            # Agrupar por horário para exibir múltiplos sorteios do mesmo horário separadamente
-            horarios_agrupados = {}
-            for chave_horario_data in organizados[tabela]:
-                # Extrair horário da chave (formato: "horario_data")
-                partes = chave_horario_data.split('_', 1)
-                horario = partes[0] if partes else 'N/A'
-                data = partes[1] if len(partes) > 1 else None
-                
-                if horario not in horarios_agrupados:
-                    horarios_agrupados[horario] = []
-                
-                # Processar resultados deste sorteio
-                resultados_sorteio = organizados[tabela][chave_horario_data]
-                # Ordenar por posição
-                resultados_sorteio.sort(key=lambda x: x.get('posicao', 0))
-                
-                # Recalcular posições relativas (normalizar para começar em 1)
-                # Isso corrige casos onde posições estão sequenciais entre sorteios
-                posicoes_unicas = sorted(set(r.get('posicao', 0) for r in resultados_sorteio))
-                if posicoes_unicas:
-                    posicao_minima = min(posicoes_unicas)
-                    # Se a posição mínima não é 1, recalcular
-                    if posicao_minima > 1:
-                        mapa_posicoes = {pos_antiga: idx + 1 for idx, pos_antiga in enumerate(posicoes_unicas)}
-                        for r in resultados_sorteio:
-                            pos_antiga = r.get('posicao', 0)
-                            if pos_antiga in mapa_posicoes:
-                                r['posicao'] = mapa_posicoes[pos_antiga]
-                                r['colocacao'] = f"{mapa_posicoes[pos_antiga]}°"
-                
-                # Limitar a 7 posições (1° a 7°)
-                resultados_sorteio = [r for r in resultados_sorteio if r.get('posicao', 0) >= 1 and r.get('posicao', 0) <= 7]
-                resultados_sorteio.sort(key=lambda x: x.get('posicao', 0))
-                resultados_sorteio = resultados_sorteio[:7]
-                
-                # Adicionar apenas se tiver resultados válidos (posição 1-7)
-                if resultados_sorteio and resultados_sorteio[0].get('posicao', 0) >= 1:
-                    horarios_agrupados[horario].append({
-                        'data': data,
-                        'resultados': resultados_sorteio
-                    })
-            
-            # Para cada horário, ordenar sorteios por data (mais recente primeiro)
-            # e exibir todos os sorteios separadamente
-            horarios_ordenados = sorted(horarios_agrupados.keys(), key=lambda h: int(h.replace('h', '').replace(':', '')) if h.replace('h', '').replace(':', '').isdigit() else 999, reverse=True)
-            
-            for horario in horarios_ordenados:
-                sorteios = horarios_agrupados[horario]
-                if not sorteios:
-                    continue
-                
-                # Ordenar sorteios por data (mais recente primeiro)
-                def ordenar_por_data(item):
-                    data = item.get('data')
-                    if data is None:
-                        return ''
-                    return data
-                sorteios.sort(key=ordenar_por_data, reverse=True)
-                
-                # Sempre usar o sorteio mais recente para cada horário
-                # Cada horário representa um sorteio único
-                organizados_final[tabela][horario] = sorteios[0]['resultados']
-                
-                # Log para debug - verificar quantos horários estão sendo retornados
-                if tabela == "Loteria Nacional":
-                    logger.info(f"📊 API Loteria Nacional: Retornando sorteio {horario} com {len(sorteios[0]['resultados'])} resultados")
-            
-            # Log final para Loteria Nacional
-            if tabela == "Loteria Nacional":
-                total_horarios_retornados = len(organizados_final[tabela])
-                logger.info(f"📊 API Loteria Nacional: Total de {total_horarios_retornados} horários retornados: {list(organizados_final[tabela].keys())}")
-        
-        # Estatísticas
-        total_tabelas = len(organizados_final)
-        total_horarios = sum(len(horarios) for horarios in organizados_final.values())
-        total_resultados = sum(
-            len(resultados) 
-            for tabela in organizados_final.values() 
-            for resultados in tabela.values()
-        )
-        
-        # Log detalhado para Loteria Nacional
-        if "Loteria Nacional" in organizados_final:
-            ln_horarios = organizados_final["Loteria Nacional"]
-            logger.info(f"📊 API Final: Loteria Nacional tem {len(ln_horarios)} horários: {list(ln_horarios.keys())}")
-            for horario, resultados in ln_horarios.items():
-                logger.info(f"   🕐 {horario}: {len(resultados)} resultados")
-        
-        return jsonify({
-            'organizados': organizados_final,
-            'estatisticas': {
-                'total_tabelas': total_tabelas,
-                'total_horarios': total_horarios,
-                'total_resultados': total_resultados
-            },
-            'ultima_verificacao': dados.get('ultima_verificacao'),
-            'fonte': 'bichocerto.com'
-        })
+        return responder_visao('organizados')
     except Exception as e:
         logger.error(f"Erro ao organizar resultados: {e}")
         return jsonify({
@@ -567,6 +572,153 @@ def api_resultados_organizados():
             'erro': str(e)
         }), 500
 
+def normalizar_ts(valor):
+    """
+    Horário ISO 8601 ou epoch (segundos) -> ISO no fuso de São Paulo (formato gravado no banco).
+    ValueError se o valor não é um horário válido (inclusive epoch inf/nan ou fora do intervalo).
+    """
+    try:
+        epoch = float(valor)
+    except ValueError:
+        epoch = None
+    
+    if epoch is not None:
+        if not math.isfinite(epoch):
+            raise ValueError(f"Epoch inválido: {valor}")
+        try:
+            momento = datetime.fromtimestamp(epoch, ZoneInfo('America/Sao_Paulo'))
+        except (OverflowError, OSError, ValueError) as e:
+            raise ValueError(f"Epoch fora do intervalo: {valor}") from e
+    else:
+        # '+' do fuso chega como espaço quando não vem codificado na URL
+        momento = datetime.fromisoformat(valor.replace('Z', '+00:00').replace(' ', '+'))
+        if momento.tzinfo is None:
+            momento = momento.replace(tzinfo=ZoneInfo('America/Sao_Paulo'))
+    return momento.astimezone(ZoneInfo('America/Sao_Paulo')).isoformat()
+
+@app.route('/api/resultados/desde')
+def api_resultados_desde():
+    """
+    Delta para consumidores incrementais: só os sorteios gravados/alterados depois de
+    ?geracao=N (campo 'geracao' da resposta anterior) ou de ?ts= (ISO 8601 ou epoch).
+    Sorteios alterados vêm inteiros (todas as posições); 'completo': true indica que
+    a resposta traz a base inteira e substitui a cópia do consumidor.
+    ?formato=resultados (padrão, lista plana) | sorteios | organizados
+    """
+    geracao = request.args.get('geracao')
+    ts = request.args.get('ts')
+    formato = request.args.get('formato', 'resultados')
+    if (geracao is None) == (ts is None):
+        return jsonify({'erro': 'Informe geracao ou ts'}), 400
+    if formato not in ('resultados', 'sorteios', 'organizados'):
+        return jsonify({'erro': f'Formato inválido: {formato}'}), 400
+    try:
+        if geracao is not None:
+            delta = obter_banco().listar_sorteios_desde(geracao=int(geracao))
+        else:
+            delta = obter_banco().listar_sorteios_desde(atualizado_apos=normalizar_ts(ts))
+    except (ValueError, OverflowError, OSError):
+        return jsonify({'erro': 'geracao deve ser inteiro e ts ISO 8601 ou epoch'}), 400
+    
+    sorteios = delta['sorteios']
+    resposta = {
+        'geracao': delta['geracao'],
+        'completo': delta['completo'],
+        'total_sorteios': len(sorteios),
+        'ultima_verificacao': obter_banco().ultima_verificacao(),
+    }
+    if formato == 'sorteios':
+        resposta['sorteios'] = sorteios
+    elif formato == 'organizados':
+        resposta.update(montar_organizados(sorteios))
+    else:
+        resposta['resultados'] = expandir_sorteios(sorteios)
+    return jsonify(resposta)
+
+# Stream SSE: intervalo de consulta ao log de eventos, heartbeat e duração máxima
+# de cada conexão (o EventSource reconecta sozinho, retomando pelo Last-Event-ID)
+SSE_INTERVALO = float(os.getenv('SSE_INTERVALO', '1'))
+SSE_HEARTBEAT = int(os.getenv('SSE_HEARTBEAT', '15'))
+SSE_DURACAO_MAXIMA = int(os.getenv('SSE_DURACAO_MAXIMA', '300'))
+# Eventos lidos do log por consulta
+SSE_LOTE = int(os.getenv('SSE_LOTE', '500'))
+# Streams simultâneos por processo: cada um ocupa uma thread do gthread por até
+# SSE_DURACAO_MAXIMA; acima do limite responde 503 e o dashboard volta a consultar
+# (polling). Padrão: metade das threads do worker, o resto fica para a API
+SSE_MAXIMO_CONEXOES = int(os.getenv('SSE_MAXIMO_CONEXOES', str(max(1, int(os.getenv('GUNICORN_THREADS', '32')) // 2))))
+_sse_vagas = threading.BoundedSemaphore(SSE_MAXIMO_CONEXOES)
+
+def eventos_sse(depois_de, tipos=None):
+    """Gerador das mensagens SSE do log de eventos com id maior que depois_de"""
+    banco = obter_banco()
+    yield 'retry: 3000\n\n'
+    if depois_de is None:
+        depois_de = banco.ultimo_evento()
+    else:
+        eventos = banco.listar_eventos(depois_de, limite=1)
+        # Eventos já descartados do log: o cliente deve recarregar tudo
+        if depois_de > 0 and eventos and eventos[0]['id'] > depois_de + 1:
+            yield 'event: reset\ndata: {}\n\n'
+    
+    inicio = ultimo_envio = time.monotonic()
+    reler = True
+    while time.monotonic() - inicio < SSE_DURACAO_MAXIMA:
+        # O escritor (monitor/bot, talvez em outro processo) regrava o arquivo de
+        # notificação com o último id do log a cada escrita: o banco só é consultado
+        # quando há id novo, sem notificação legível ou a cada heartbeat (por garantia)
+        notificacao = banco.ler_notificacao()
+        if reler or not notificacao or (notificacao.get('ultimo_evento') or 0) > depois_de:
+            reler = False
+            # Em páginas de SSE_LOTE: continua enquanto vier página cheia
+            while True:
+                eventos = banco.listar_eventos(depois_de, limite=SSE_LOTE)
+                for evento in eventos:
+                    depois_de = evento['id']
+                    if tipos and evento['tipo'] not in tipos:
+                        continue
+                    yield f"id: {evento['id']}\nevent: {evento['tipo']}\ndata: {evento['dados']}\n\n"
+                    ultimo_envio = time.monotonic()
+                if len(eventos) < SSE_LOTE:
+                    break
+        if time.monotonic() - ultimo_envio >= SSE_HEARTBEAT:
+            yield ': ping\n\n'
+            ultimo_envio = time.monotonic()
+            reler = True
+        time.sleep(SSE_INTERVALO)
+
+@app.route('/api/resultados/stream')
+def api_resultados_stream():
+    """
+    Server-Sent Events com os sorteios novos/alterados (evento 'sorteio') e as
+    liquidações (evento 'liquidacao') assim que são gravados.
+    Retomada: cabeçalho Last-Event-ID (ou ?ultimo_id=N); sem ele, só eventos futuros.
+    Filtro opcional: ?tipos=sorteio,liquidacao
+    No máximo SSE_MAXIMO_CONEXOES streams por processo; acima disso, 503 (o cliente
+    deve consultar os endpoints normais até o Retry-After).
+    """
+    if not _sse_vagas.acquire(blocking=False):
+        resposta = jsonify({
+            'erro': 'Limite de streams simultâneos atingido; consulte /api/resultados periodicamente',
+            'maximo_conexoes': SSE_MAXIMO_CONEXOES,
+        })
+        resposta.status_code = 503
+        resposta.headers['Retry-After'] = str(SSE_DURACAO_MAXIMA)
+        return resposta
+    ultimo_id = request.headers.get('Last-Event-ID') or request.args.get('ultimo_id')
+    try:
+        depois_de = int(ultimo_id) if ultimo_id else None
+    except ValueError:
+        depois_de = None
+    tipos = {t.strip() for t in request.args.get('tipos', '').split(',') if t.strip()}
+    
+    resposta = Response(eventos_sse(depois_de, tipos), mimetype='text/event-stream')
+    # Vaga devolvida quando o servidor fecha a resposta (fim do stream ou cliente saiu)
+    resposta.call_on_close(_sse_vagas.release)
+    resposta.headers['Cache-Control'] = 'no-cache'
+    # Nginx/proxies: não acumular o stream em buffer
+    resposta.headers['X-Accel-Buffering'] = 'no'
+    return resposta
+
 @app.route('/api/resultados/liquidar', methods=['POST'])
 def api_liquidar_resultados():
     """Endpoint para forçar liquidação de apostas (placeholder)"""
@@ -589,34 +741,11 @@ def api_liquidar_resultados():
 def api_resultados_data(data):
     """API para retornar resultados de uma data específica (formato: DD-MM-YYYY ou DD/MM/YYYY)"""
     try:
-        dados = carregar_resultados()
-        resultados = dados.get('resultados', [])
-        
         # Normalizar formato da data (aceitar DD-MM-YYYY ou DD/MM/YYYY)
         data_normalizada = data.replace('-', '/')
         
-        # Adicionar estado se não existir
-        from monitor_selenium import identificar_estado
-        for r in resultados:
-            if 'estado' not in r:
-                r['estado'] = identificar_estado(r.get('loteria', ''))
-        
-        # Função para extrair data do resultado
-        def extrair_data(resultado):
-            if 'data_extração' in resultado and resultado['data_extração']:
-                return resultado['data_extração']
-            if 'timestamp' in resultado and resultado['timestamp']:
-                try:
-                    from datetime import datetime
-                    dt = datetime.fromisoformat(resultado['timestamp'].replace('Z', '+00:00'))
-                    return dt.strftime('%d/%m/%Y')
-                except:
-                    pass
-            from datetime import datetime
-            return datetime.now().strftime('%d/%m/%Y')
-        
-        # Filtrar por data
-        resultados_data = [r for r in resultados if extrair_data(r) == data_normalizada]
+        # Ler apenas a partição (dia) pedida
+        resultados_data = carregar_resultados_data(data_normalizada)
         
         # Agrupar por estado
         por_estado = {}
@@ -654,38 +783,11 @@ def api_resultados_data(data):
 def api_resultados_estado_data(estado, data):
     """API para retornar resultados de um estado e data específicos"""
     try:
-        dados = carregar_resultados()
-        resultados = dados.get('resultados', [])
-        
         # Normalizar formato da data
         data_normalizada = data.replace('-', '/')
         
-        # Adicionar estado se não existir
-        from monitor_selenium import identificar_estado
-        for r in resultados:
-            if 'estado' not in r:
-                r['estado'] = identificar_estado(r.get('loteria', ''))
-        
-        # Função para extrair data do resultado
-        def extrair_data(resultado):
-            if 'data_extração' in resultado and resultado['data_extração']:
-                return resultado['data_extração']
-            if 'timestamp' in resultado and resultado['timestamp']:
-                try:
-                    from datetime import datetime
-                    dt = datetime.fromisoformat(resultado['timestamp'].replace('Z', '+00:00'))
-                    return dt.strftime('%d/%m/%Y')
-                except:
-                    pass
-            from datetime import datetime
-            return datetime.now().strftime('%d/%m/%Y')
-        
-        # Filtrar por estado e data
-        resultados_filtrados = [
-            r for r in resultados 
-            if r.get('estado', '').upper() == estado.upper() 
-            and extrair_data(r) == data_normalizada
-        ]
+        # Consulta pelo índice (estado, data), só na partição (dia) pedida
+        resultados_filtrados = carregar_resultados_estado(estado, data_normalizada)
         
         # Agrupar por loteria e horário
         por_loteria = {}
@@ -714,6 +816,8 @@ def api_resultados_estado_data(estado, data):
 @app.route('/api/monitor/start', methods=['POST'])
 def api_monitor_start():
     """Inicia o monitor automaticamente"""
+    if not roda_tarefas_de_fundo():
+        return responder_nao_lider('O monitor roda no processo líder')
     try:
         intervalo = request.json.get('intervalo', 60) if request.is_json else 60
         iniciar_monitor(intervalo)
@@ -746,6 +850,11 @@ def api_monitor_stop():
             'erro': str(e)
         }), 500
 
+def metricas_monitor():
+    """Tempos do último ciclo do monitor (gravados no banco pelo processo que o roda)"""
+    metricas = obter_banco().ler_meta('metricas_monitor')
+    return serializacao.loads(metricas) if metricas else None
+
 @app.route('/api/monitor/health', methods=['GET'])
 def api_monitor_health():
     """Health check do monitor - verifica se está rodando e reinicia se necessário"""
@@ -758,15 +867,17 @@ def api_monitor_health():
         monitor_ativo = monitor_thread and monitor_thread.is_alive() if monitor_thread else False
         watchdog_ativo = watchdog_thread and watchdog_thread.is_alive() if watchdog_thread else False
         
-        # Se monitor deveria estar rodando mas não está, tentar reiniciar
-        if auto_start and verificar and not monitor_ativo:
+        lider = roda_tarefas_de_fundo()
+        
+        # Se monitor deveria estar rodando mas não está, tentar reiniciar (só no líder)
+        if lider and auto_start and verificar and not monitor_ativo:
             logger.warning("⚠️  Health check detectou monitor parado. Reiniciando...")
             monitor_iniciado = False
             iniciar_monitor(intervalo)
             monitor_ativo = monitor_thread and monitor_thread.is_alive() if monitor_thread else False
         
         # Garantir que watchdog está rodando
-        if auto_start and not watchdog_ativo:
+        if lider and auto_start and not watchdog_ativo:
             logger.info("🔄 Iniciando watchdog via health check...")
             iniciar_watchdog()
             watchdog_ativo = watchdog_thread and watchdog_thread.is_alive() if watchdog_thread else False
@@ -777,8 +888,17 @@ def api_monitor_health():
             'watchdog_ativo': watchdog_ativo,
             'auto_start': auto_start,
             'intervalo': intervalo,
-            'status': 'ok' if monitor_ativo else 'inativo',
-            'mensagem': 'Monitor ativo' if monitor_ativo else 'Monitor inativo - tentando reiniciar...'
+            'modo': MONITOR_MODO,
+            'lideranca': estado_lideranca(),
+            'notificacao': obter_banco().ler_notificacao(),
+            'metricas': metricas_monitor(),
+            'status': 'ok' if monitor_ativo or not lider else 'inativo',
+            'mensagem': (
+                'Monitor ativo' if monitor_ativo
+                else 'Monitor inativo - tentando reiniciar...' if lider
+                else 'Monitor roda no worker dedicado' if MONITOR_MODO == 'externo'
+                else 'Monitor roda no processo líder'
+            )
         })
     except Exception as e:
         logger.error(f"Erro no health check: {e}")
@@ -797,16 +917,20 @@ def api_monitor_status():
         'thread_ativa': monitor_thread.is_alive() if monitor_thread else False,
         'watchdog_ativo': watchdog_thread.is_alive() if watchdog_thread else False,
         'verificar_disponivel': verificar is not None,
+        'modo': MONITOR_MODO,
+        'lideranca': estado_lideranca(),
         'auto_start': os.getenv('MONITOR_AUTO_START', 'true').lower() == 'true',
         'intervalo': int(os.getenv('MONITOR_INTERVALO', '60'))
     })
 
 @app.route('/api/resultados/processar', methods=['POST'])
 def api_processar_resultados():
-    """Força processamento de resultados"""
-    if INTEGRACAO_PHP_DISPONIVEL and processar_resultados_via_php:
+    """Força processamento de resultados (junta-se ao processamento em andamento, se houver)"""
+    if INTEGRACAO_PHP_DISPONIVEL and obter_resultados_php:
+        if not roda_tarefas_de_fundo():
+            return responder_nao_lider('O processamento PHP roda no processo líder')
         try:
-            resultado = processar_resultados_via_php()
+            resultado = atualizar_cache_php()
             if resultado.get('sucesso'):
                 return jsonify(resultado)
             else:
@@ -838,6 +962,9 @@ def api_status():
         'fonte': 'bichocerto.com',
         'monitor_disponivel': verificar is not None,
         'bot_disponivel': BOT_DISPONIVEL,
+        'integracao_php': estado_cache_php() if INTEGRACAO_PHP_DISPONIVEL else None,
+        'modo': MONITOR_MODO,
+        'lideranca': estado_lideranca(),
         'auto_start': os.getenv('MONITOR_AUTO_START', 'true').lower() == 'true',
         'intervalo': int(os.getenv('MONITOR_INTERVALO', '60'))
     })
@@ -1010,6 +1137,9 @@ def verificar_agora():
     """Força verificação imediata - apenas Bicho Certo"""
     if not verificar:
         return jsonify({'erro': 'Monitor Bicho Certo não disponível'}), 500
+    # Só no processo dono do scraping: nunca dois processos gravando ciclos em paralelo
+    if not roda_tarefas_de_fundo():
+        return responder_nao_lider('A verificação roda no processo líder')
     
     try:
         novos = verificar()
@@ -1028,6 +1158,8 @@ def verificar_agora():
 @app.route('/api/monitor/start', methods=['POST'])
 def monitor_start():
     """Inicia monitor"""
+    if not roda_tarefas_de_fundo():
+        return responder_nao_lider('O monitor roda no processo líder')
     try:
         intervalo = int(request.json.get('intervalo', 60)) if request.is_json and request.json else 60
         iniciar_monitor(intervalo)
@@ -1136,8 +1268,11 @@ def iniciar_watchdog():
     watchdog_thread.start()
     logger.info("✅ Watchdog iniciado")
 
-def inicializar_bot_liquidacao():
-    """Inicializa bot de liquidação se disponível"""
+def inicializar_bot_liquidacao(iniciar=True):
+    """
+    Inicializa bot de liquidação se disponível. Todo processo cria o bot (endpoints de
+    apostas); só o líder (iniciar=True) roda o loop de liquidação.
+    """
     global bot_liquidacao
     
     if not BOT_DISPONIVEL:
@@ -1145,20 +1280,23 @@ def inicializar_bot_liquidacao():
         return
     
     try:
-        # Configurações do bot
-        database_url = os.getenv('BOT_DATABASE_URL', 'sqlite:///apostas.db')
-        site_api_url = os.getenv('SITE_API_URL', None)
-        api_key = os.getenv('SITE_API_KEY', None)
-        
-        bot_liquidacao = BotLiquidacao(
-            database_url=database_url,
-            site_api_url=site_api_url,
-            api_key=api_key
-        )
+        if bot_liquidacao is None:
+            # Configurações do bot
+            database_url = os.getenv('BOT_DATABASE_URL', 'sqlite:///apostas.db')
+            site_api_url = os.getenv('SITE_API_URL', None)
+            api_key = os.getenv('SITE_API_KEY', None)
+            
+            bot_liquidacao = BotLiquidacao(
+                database_url=database_url,
+                site_api_url=site_api_url,
+                api_key=api_key
+            )
         
         # Iniciar bot automaticamente
         bot_auto_start = os.getenv('BOT_AUTO_START', 'true').lower() == 'true'
-        if bot_auto_start:
+        if not iniciar:
+            logger.info("ℹ️  Bot de liquidação criado (loop roda no processo líder)")
+        elif bot_auto_start:
             bot_liquidacao.iniciar()
             logger.info("✅ Bot de liquidação iniciado automaticamente")
         else:
@@ -1168,8 +1306,8 @@ def inicializar_bot_liquidacao():
         logger.error(f"❌ Erro ao inicializar bot de liquidação: {e}", exc_info=True)
         bot_liquidacao = None
 
-def inicializar_monitor_automatico():
-    """Inicializa o monitor automaticamente se configurado"""
+def assumir_tarefas_lider():
+    """Tarefas de fundo do processo líder: monitor + watchdog, atualizador PHP e bot de liquidação"""
     # Verificar variável de ambiente
     auto_start = os.getenv('MONITOR_AUTO_START', 'true').lower() == 'true'
     intervalo = int(os.getenv('MONITOR_INTERVALO', '60'))
@@ -1182,9 +1320,29 @@ def inicializar_monitor_automatico():
     else:
         logger.info("ℹ️  Monitor não será iniciado automaticamente (use MONITOR_AUTO_START=true)")
     
+    # Atualizador do cache do endpoint PHP (a chamada não acontece mais dentro dos GETs)
+    if INTEGRACAO_PHP_DISPONIVEL:
+        registrar_ao_atualizar(gravar_resultados_php)
+        iniciar_atualizador_php()
+    
     # Inicializar bot de liquidação
     inicializar_bot_liquidacao()
 
+def inicializar_monitor_automatico():
+    """
+    Candidata este processo à liderança: o líder roda as tarefas de fundo
+    (assumir_tarefas_lider); os demais só servem leituras e assumem se o líder morrer.
+    Pode ser chamada várias vezes (import, hooks do gunicorn): uma candidatura por processo.
+    Com MONITOR_MODO=externo as tarefas de fundo rodam no worker_monitor.py: nenhum
+    processo web se candidata.
+    """
+    if bot_liquidacao is None:
+        inicializar_bot_liquidacao(iniciar=False)
+    if MONITOR_MODO == 'externo':
+        logger.info("ℹ️  MONITOR_MODO=externo: monitor, bot e atualizador PHP rodam no worker_monitor.py")
+        return
+    iniciar_candidatura(assumir_tarefas_lider)
+
 # Hook do Gunicorn para iniciar monitor quando worker é criado
 def on_starting(server):
     """Hook executado quando Gunicorn inicia"""
@@ -1210,8 +1368,8 @@ if os.getenv('FLASK_ENV') != 'production' or os.getenv('MONITOR_AUTO_START', 'tr
     # Iniciar em thread separada para não bloquear
     threading.Thread(target=iniciar_ao_carregar, daemon=True).start()
 else:
-    # Mesmo sem monitor, inicializar bot se configurado
-    inicializar_bot_liquidacao()
+    # Mesmo sem monitor, candidatar-se (bot e atualizador PHP rodam no líder)
+    inicializar_monitor_automatico()
 
 if __name__ == '__main__':
     import argparse
@@ -1222,9 +1380,11 @@ if __name__ == '__main__':
     parser.add_argument('--intervalo', type=int, default=60, help='Intervalo do monitor em segundos')
     args = parser.parse_args()
     
-    # Iniciar monitor se solicitado
+    # Iniciar monitor se solicitado (processo único: assume a liderança)
     if args.monitor and verificar:
-        iniciar_monitor(args.intervalo)
+        from lideranca import tentar_lideranca
+        if tentar_lideranca():
+            iniciar_monitor(args.intervalo)
     
     print(f"🚀 Servidor iniciando em http://{args.host}:{args.port}")
     print(f"📊 Dashboard: http://{args.host}:{args.port}/")
@@ -0,0 +1,1028 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Armazenamento de resultados em SQLite (modo WAL)
+Substitui o antigo resultados.json como fonte de verdade dos resultados coletados.
+
+- Modelo por sorteio: uma linha por (loteria, horário, dia) com os números e
+  animais de todas as posições; a lista plana (um dicionário por posição) dos
+  endpoints legados é só uma visão gerada a partir dos sorteios
+- Índices em (loteria_normalizada, horario_normalizado, data) e (estado, data)
+- Contador de geração incrementado a cada escrita (usado para invalidar caches)
+- Partições por dia (data_extração): catálogo com geração própria por dia e
+  arquivamento em .jsonl.gz dos dias mais antigos que a retenção configurada
+- Índice persistente de deduplicação (sorteio, número): cada resultado é verificado
+  em O(1) no momento da inserção e ocupa a posição capturada no site (posições
+  ainda não capturadas ficam vazias, '')
+- Importação automática do resultados.json legado na primeira abertura
+- Visões materializadas (ex: resultados organizados) gravadas já serializadas,
+  compartilhadas entre os processos
+- Snapshot resultados.json publicado de forma atômica (temporário + fsync + rename),
+  com a geração embutida e no máximo uma vez por geração
+- Cada sorteio guarda a geração (e o horário) da última escrita que o alterou:
+  consumidores incrementais pedem só o que mudou desde a geração N
+- Log de eventos (sorteios novos/alterados, liquidações) com id crescente, lido
+  pelo stream SSE (/api/resultados/stream) para retomar a partir do Last-Event-ID
+- Arquivo de notificação (<banco>.notificacao: geração + último evento) regravado a
+  cada escrita: processos leitores (web) detectam mudanças por um stat, sem consultar
+  o banco, quando o monitor roda em outro processo (worker_monitor.py)
+"""
+
+import os
+import gzip
+import sqlite3
+import tempfile
+import threading
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    from pytz import timezone
+    ZoneInfo = lambda tz: timezone(tz)
+
+import serializacao
+from registro_resultado import Resultado, internar
+
+logger = logging.getLogger(__name__)
+
+# Campos de um sorteio (formato em memória e dos arquivos arquivados)
+CAMPOS_SORTEIO = (
+    'id', 'loteria', 'estado', 'horario', 'data', 'url_origem', 'capturado_em', 'numeros', 'animais'
+)
+
+# Eventos mantidos no log (os mais antigos são descartados a cada escrita)
+MAX_EVENTOS = int(os.getenv('MAX_EVENTOS', '5000'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sorteios (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    loteria TEXT,
+    estado TEXT,
+    horario TEXT,
+    data TEXT,
+    url_origem TEXT,
+    capturado_em TEXT,
+    loteria_normalizada TEXT NOT NULL,
+    horario_normalizado TEXT,
+    numeros TEXT NOT NULL DEFAULT '[]',
+    animais TEXT NOT NULL DEFAULT '[]',
+    quantidade INTEGER NOT NULL DEFAULT 0,
+    geracao INTEGER NOT NULL DEFAULT 0,
+    atualizado_em TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sorteios_loteria_horario_data
+    ON sorteios (loteria_normalizada, horario_normalizado, data);
+CREATE INDEX IF NOT EXISTS idx_sorteios_estado_data
+    ON sorteios (estado, data);
+CREATE INDEX IF NOT EXISTS idx_sorteios_data
+    ON sorteios (data);
+CREATE INDEX IF NOT EXISTS idx_sorteios_geracao
+    ON sorteios (geracao);
+CREATE INDEX IF NOT EXISTS idx_sorteios_atualizado_em
+    ON sorteios (atualizado_em);
+CREATE TABLE IF NOT EXISTS particoes (
+    data TEXT PRIMARY KEY,
+    geracao INTEGER NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    arquivo TEXT
+);
+CREATE TABLE IF NOT EXISTS indice_sorteios (
+    sorteio_id INTEGER NOT NULL,
+    numero TEXT NOT NULL,
+    posicao INTEGER NOT NULL,
+    campos INTEGER NOT NULL,
+    PRIMARY KEY (sorteio_id, numero)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS visoes (
+    nome TEXT PRIMARY KEY,
+    versao TEXT NOT NULL,
+    conteudo BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS eventos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tipo TEXT NOT NULL,
+    geracao INTEGER NOT NULL,
+    criado_em TEXT NOT NULL,
+    dados TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    chave TEXT PRIMARY KEY,
+    valor TEXT
+);
+"""
+
+def normalizar_horario(horario):
+    """Normaliza formato de horário para comparação"""
+    if not horario:
+        return None
+    # Remover espaços e converter para minúsculas
+    horario = str(horario).strip().lower()
+    # Remover 'h' e ':' para normalizar "09:30", "9:30", "09h30", "9h30" -> "0930"
+    horario = horario.replace('h', '').replace(':', '').replace(' ', '')
+    # Garantir formato HHMM (adicionar zero à esquerda se necessário)
+    if len(horario) == 3:
+        horario = '0' + horario
+    return horario if len(horario) == 4 else None
+
+def normalizar_loteria(loteria):
+    """Normaliza nome da loteria para comparação"""
+    if not loteria:
+        return ''
+    loteria = str(loteria).strip().upper()
+    # Normalizar variações comuns - fazer antes de outras transformações
+    # Substituir variações de PT Rio de Janeiro
+    if 'RIO DE JANEIRO' in loteria or 'RIO' in loteria:
+        if 'PT' in loteria or 'PPT' in loteria or 'PTM' in loteria or 'PTV' in loteria:
+            return 'PT-RJ'
+    # Outras normalizações
+    loteria = loteria.replace('PT-RIO', 'PT-RJ')
+    loteria = loteria.replace('PPT-RJ', 'PT-RJ')  # PPT-RJ é variação de PT-RJ
+    loteria = loteria.replace('PTM-RJ', 'PT-RJ')
+    loteria = loteria.replace('PTV-RJ', 'PT-RJ')
+    return loteria
+
+def normalizar_data(data):
+    """Converte data DD/MM/YYYY ou DD-MM-YYYY para YYYY-MM-DD (formato indexado)"""
+    if not data:
+        return None
+    data = str(data).strip().replace('-', '/')
+    partes = data.split('/')
+    if len(partes) == 3:
+        if len(partes[0]) == 4:
+            ano, mes, dia = partes
+        else:
+            dia, mes, ano = partes
+        if dia.isdigit() and mes.isdigit() and ano.isdigit():
+            return f"{int(ano):04d}-{int(mes):02d}-{int(dia):02d}"
+    return None
+
+def extrair_data_resultado(resultado):
+    """Data do resultado em YYYY-MM-DD (de data_extração ou do timestamp)"""
+    data = normalizar_data(resultado.get('data_extração'))
+    if data:
+        return data
+    timestamp = resultado.get('timestamp')
+    if timestamp:
+        try:
+            return datetime.fromisoformat(str(timestamp).replace('Z', '+00:00')).strftime('%Y-%m-%d')
+        except ValueError:
+            pass
+    return None
+
+
+def formatar_data(data):
+    """Converte YYYY-MM-DD para DD/MM/YYYY (formato de data_extração dos resultados)"""
+    if not data:
+        return None
+    ano, mes, dia = data.split('-')
+    return f"{dia}/{mes}/{ano}"
+
+def chave_dedup(resultado):
+    """Chave de deduplicação: (loteria normalizada, horário normalizado, dia, número)"""
+    return (
+        normalizar_loteria(resultado.get('loteria', '')),
+        normalizar_horario(resultado.get('horario', '')) or '',
+        extrair_data_resultado(resultado),
+        str(resultado.get('numero', '')).strip(),
+    )
+
+def posicao_capturada(resultado):
+    """Posição (1, 2, ...) informada pelo scraper, ou None se ausente/inválida"""
+    try:
+        posicao = int(resultado.get('posicao'))
+    except (TypeError, ValueError):
+        return None
+    return posicao if posicao >= 1 else None
+
+def posicoes_por_sorteio(resultados, chaves):
+    """
+    Posição de cada resultado dentro do seu sorteio (lista paralela a resultados, None
+    onde não há posição capturada). Quando as posições de um sorteio no lote não começam
+    em 1 (resultados.json legado e páginas que numeram em sequência entre dias/horários,
+    ex: 8..14 no segundo sorteio), são renumeradas 1..N na ordem original.
+    Só vale para sorteios ainda vazios: num sorteio já gravado, um lote que começa no
+    meio (ex: só a 5ª posição chegou agora) traz as posições reais.
+    """
+    grupos = {}
+    for indice, (resultado, chave) in enumerate(zip(resultados, chaves)):
+        posicao = posicao_capturada(resultado)
+        if posicao is not None:
+            grupos.setdefault(chave[:3], []).append((indice, posicao))
+    posicoes = [None] * len(resultados)
+    for itens in grupos.values():
+        unicas = sorted({posicao for _, posicao in itens})
+        mapa = {posicao: nova for nova, posicao in enumerate(unicas, start=1)} if unicas[0] > 1 else None
+        for indice, posicao in itens:
+            posicoes[indice] = mapa[posicao] if mapa else posicao
+    return posicoes
+
+def contar_campos(resultado):
+    """Quantidade de campos preenchidos (critério para manter a versão mais completa)"""
+    return sum(1 for v in resultado.values() if v)
+
+def _json_compacto(valor):
+    return serializacao.dumps_str(valor)
+
+# Campos categóricos do sorteio: strings internadas (uma cópia por processo)
+_CAMPOS_SORTEIO_INTERNADOS = ('loteria', 'estado', 'horario', 'data', 'url_origem', 'capturado_em')
+
+_COLOCACOES = tuple(f"{posicao}°" for posicao in range(100))
+
+def _linha_para_sorteio(linha):
+    """Converte linha da tabela sorteios no dicionário do sorteio"""
+    sorteio = {campo: linha[campo] for campo in CAMPOS_SORTEIO}
+    for campo in _CAMPOS_SORTEIO_INTERNADOS:
+        sorteio[campo] = internar(sorteio[campo])
+    sorteio['numeros'] = serializacao.loads(linha['numeros'])
+    sorteio['animais'] = [internar(animal) for animal in serializacao.loads(linha['animais'])]
+    return sorteio
+
+def expandir_sorteio(sorteio):
+    """
+    Visão plana de um sorteio no formato legado: um Resultado (registro com
+    interface de dicionário) por posição preenchida. Os campos do sorteio são
+    compartilhados entre as posições, não copiados.
+    """
+    loteria = sorteio.get('loteria')
+    estado = sorteio.get('estado')
+    horario = sorteio.get('horario')
+    capturado_em = sorteio.get('capturado_em')
+    data_extracao = internar(formatar_data(sorteio.get('data')))
+    url_origem = sorteio.get('url_origem')
+    return [
+        Resultado(
+            numero, animal, loteria, estado, horario, posicao,
+            _COLOCACOES[posicao] if posicao < len(_COLOCACOES) else f"{posicao}°",
+            f"{numero} {animal}".strip(), capturado_em, data_extracao, url_origem
+        )
+        for posicao, (numero, animal) in enumerate(zip(sorteio['numeros'], sorteio['animais']), start=1)
+        if numero
+    ]
+
+def expandir_sorteios(sorteios):
+    """Visão plana (formato legado) de uma lista de sorteios"""
+    resultados = []
+    for sorteio in sorteios:
+        resultados.extend(expandir_sorteio(sorteio))
+    return resultados
+
+class BancoResultados:
+    """
+    Acesso ao banco SQLite de resultados.
+    Uma conexão por thread; seguro para uso por vários processos (WAL).
+    """
+
+    def __init__(self, caminho='resultados.db'):
+        self.caminho = caminho
+        self.arquivo_notificacao = os.path.splitext(caminho)[0] + '.notificacao'
+        self._local = threading.local()
+        self._conexao().executescript(SCHEMA)
+
+    def _conexao(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.caminho, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transacao(self):
+        """Transação de escrita (BEGIN IMMEDIATE ... COMMIT/ROLLBACK)"""
+        conn = self._conexao()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    # ---------------- meta ----------------
+
+    def _ler_meta(self, chave, padrao=None):
+        linha = self._conexao().execute('SELECT valor FROM meta WHERE chave = ?', (chave,)).fetchone()
+        return linha['valor'] if linha else padrao
+
+    @staticmethod
+    def _gravar_meta(conn, chave, valor):
+        conn.execute(
+            'INSERT INTO meta (chave, valor) VALUES (?, ?) '
+            'ON CONFLICT(chave) DO UPDATE SET valor = excluded.valor',
+            (chave, valor)
+        )
+
+    @staticmethod
+    def _incrementar_geracao(conn):
+        linha = conn.execute("SELECT valor FROM meta WHERE chave = 'geracao'").fetchone()
+        geracao = int(linha['valor']) + 1 if linha else 1
+        BancoResultados._gravar_meta(conn, 'geracao', str(geracao))
+        BancoResultados._gravar_meta(conn, 'geracao_em', datetime.now(ZoneInfo('America/Sao_Paulo')).isoformat())
+        return geracao
+
+    @staticmethod
+    def _marcar_sorteios(conn, geracao, ids=None):
+        """Grava a geração/horário da escrita atual nos sorteios informados (ou em todos, se ids=None)"""
+        atualizado_em = datetime.now(ZoneInfo('America/Sao_Paulo')).isoformat()
+        if ids is None:
+            conn.execute('UPDATE sorteios SET geracao = ?, atualizado_em = ?', (geracao, atualizado_em))
+        else:
+            conn.executemany(
+                'UPDATE sorteios SET geracao = ?, atualizado_em = ? WHERE id = ?',
+                [(geracao, atualizado_em, id_sorteio) for id_sorteio in ids]
+            )
+
+    @staticmethod
+    def _atualizar_particoes(conn, geracao, datas=None):
+        """
+        Recalcula o catálogo de partições (dias) informados — ou de todos, se datas=None —
+        marcando-os com a geração da escrita atual. Partições arquivadas não são tocadas
+        (um dia arquivado que recebe resultados é restaurado antes: _restaurar_particoes).
+        O total de cada partição é o número de resultados (posições), não de sorteios.
+        """
+        if datas is None:
+            conn.execute('DELETE FROM particoes WHERE arquivo IS NULL')
+            linhas = conn.execute(
+                'SELECT data, SUM(quantidade) AS total FROM sorteios WHERE data IS NOT NULL GROUP BY data'
+            ).fetchall()
+        else:
+            linhas = [
+                (data, conn.execute(
+                    'SELECT COALESCE(SUM(quantidade), 0) FROM sorteios WHERE data = ?', (data,)
+                ).fetchone()[0])
+                for data in datas if data
+            ]
+        for data, total in linhas:
+            conn.execute(
+                'INSERT INTO particoes (data, geracao, total) VALUES (?, ?, ?) '
+                'ON CONFLICT(data) DO UPDATE SET geracao = excluded.geracao, total = excluded.total',
+                (data, geracao, total)
+            )
+
+    def ler_meta(self, chave, padrao=None):
+        """Valor de uma chave da tabela meta"""
+        return self._ler_meta(chave, padrao)
+
+    def gravar_meta(self, chave, valor):
+        """Grava uma chave da tabela meta (não altera a geração)"""
+        with self._transacao() as conn:
+            self._gravar_meta(conn, chave, valor)
+
+    def geracao(self):
+        """Número da geração atual (muda a cada escrita)"""
+        return int(self._ler_meta('geracao', '0'))
+
+    def ultima_verificacao(self):
+        return self._ler_meta('ultima_verificacao')
+
+    def geracao_em(self):
+        """Horário (ISO) da escrita que criou a geração atual (None se nunca houve escrita)"""
+        return self._ler_meta('geracao_em')
+
+    def total(self):
+        """Total de resultados (posições) no banco"""
+        return self._conexao().execute('SELECT COALESCE(SUM(quantidade), 0) FROM sorteios').fetchone()[0]
+
+    # ---------------- notificação ----------------
+
+    def notificar(self):
+        """Regrava o arquivo de notificação com a geração e o último evento atuais"""
+        try:
+            gravar_arquivo_atomico(self.arquivo_notificacao, serializacao.dumps({
+                'geracao': self.geracao(),
+                'ultimo_evento': self.ultimo_evento(),
+                'notificado_em': datetime.now(ZoneInfo('America/Sao_Paulo')).isoformat(),
+            }))
+        except OSError as e:
+            logger.warning(f"⚠️  Não foi possível gravar {self.arquivo_notificacao}: {e}")
+
+    def marca_notificacao(self):
+        """Marca (mtime em ns) da última notificação; muda a cada escrita. None se não existe."""
+        try:
+            return os.stat(self.arquivo_notificacao).st_mtime_ns
+        except OSError:
+            return None
+
+    def ler_notificacao(self):
+        """Conteúdo do arquivo de notificação ({'geracao', 'ultimo_evento', 'notificado_em'}) ou None"""
+        try:
+            with open(self.arquivo_notificacao, 'rb') as f:
+                return serializacao.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    # ---------------- escrita ----------------
+
+    @staticmethod
+    def _restaurar_particoes(conn, datas):
+        """
+        Dias já arquivados que voltam a receber resultados (coleta atrasada): devolve os
+        sorteios do arquivo ao banco, com o índice de deduplicação, e desmarca a partição.
+        Assim os novos são deduplicados contra os arquivados e o próximo arquivamento
+        grava o dia inteiro. Retorna as datas restauradas.
+        """
+        datas = sorted(data for data in datas if data)
+        if not datas:
+            return set()
+        linhas = conn.execute(
+            f"SELECT data, arquivo FROM particoes WHERE arquivo IS NOT NULL AND data IN ({','.join('?' * len(datas))})",
+            datas
+        ).fetchall()
+        for linha in linhas:
+            for sorteio in ler_sorteios_arquivados(linha['arquivo']):
+                cursor = conn.execute(
+                    'INSERT INTO sorteios (loteria, estado, horario, data, url_origem, capturado_em, '
+                    'loteria_normalizada, horario_normalizado, numeros, animais, quantidade) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (sorteio.get('loteria'), sorteio.get('estado'), sorteio.get('horario'), linha['data'],
+                     sorteio.get('url_origem'), sorteio.get('capturado_em'),
+                     normalizar_loteria(sorteio.get('loteria')), normalizar_horario(sorteio.get('horario')),
+                     _json_compacto(sorteio['numeros']), _json_compacto(sorteio['animais']),
+                     sum(1 for numero in sorteio['numeros'] if numero))
+                )
+                conn.executemany(
+                    'INSERT OR IGNORE INTO indice_sorteios (sorteio_id, numero, posicao, campos) VALUES (?, ?, ?, ?)',
+                    [(cursor.lastrowid, resultado['numero'], resultado['posicao'], contar_campos(resultado.to_dict()))
+                     for resultado in expandir_sorteio(sorteio)]
+                )
+            conn.execute('UPDATE particoes SET arquivo = NULL WHERE data = ?', (linha['data'],))
+            logger.info(f"📂 Partição {linha['data']} restaurada de {linha['arquivo']}: chegaram resultados atrasados")
+        return {linha['data'] for linha in linhas}
+
+    @staticmethod
+    def _sorteio_do_resultado(conn, sorteios, resultado, chave):
+        """
+        Sorteio (loteria + horário + dia) ao qual o resultado pertence; cria o sorteio
+        se ainda não existir. Os sorteios lidos pelo lote ficam em cache em `sorteios`.
+        """
+        sorteio = sorteios.get(chave[:3])
+        if sorteio is not None:
+            return sorteio
+        loteria, horario, data = chave[:3]
+        linha = conn.execute(
+            'SELECT * FROM sorteios WHERE loteria_normalizada = ? AND horario_normalizado IS ? AND data IS ? '
+            'ORDER BY id LIMIT 1',
+            (loteria, horario or None, data)
+        ).fetchone()
+        if linha is not None:
+            sorteio = sorteios[chave[:3]] = _linha_para_sorteio(linha)
+            return sorteio
+
+        sorteio = {
+            'loteria': resultado.get('loteria'),
+            'estado': resultado.get('estado'),
+            'horario': resultado.get('horario'),
+            'data': data,
+            'url_origem': resultado.get('url_origem'),
+            'capturado_em': resultado.get('timestamp'),
+        }
+        cursor = conn.execute(
+            'INSERT INTO sorteios (loteria, estado, horario, data, url_origem, capturado_em, '
+            'loteria_normalizada, horario_normalizado) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (*sorteio.values(), loteria, horario or None)
+        )
+        sorteio['id'] = cursor.lastrowid
+        sorteio['numeros'] = []
+        sorteio['animais'] = []
+        sorteios[chave[:3]] = sorteio
+        return sorteio
+
+    @staticmethod
+    def _posicionar(sorteio, numero, animal, posicao):
+        """
+        Coloca o número na posição capturada (completando as anteriores com '' se
+        ainda faltam). Sem posição, ou com a posição já ocupada por outro número,
+        acrescenta no fim. Retorna a posição usada.
+        """
+        numeros, animais = sorteio['numeros'], sorteio['animais']
+        if posicao is not None:
+            if posicao > len(numeros):
+                faltam = posicao - len(numeros)
+                numeros.extend([''] * faltam)
+                animais.extend([''] * faltam)
+            if not numeros[posicao - 1]:
+                numeros[posicao - 1] = numero
+                animais[posicao - 1] = animal
+                return posicao
+            logger.warning(
+                f"⚠️  {sorteio['loteria']} {sorteio['horario']} {sorteio['data']}: posição {posicao} já "
+                f"ocupada por {numeros[posicao - 1]}, {numero} vai para o fim"
+            )
+        numeros.append(numero)
+        animais.append(animal)
+        return len(numeros)
+
+    @staticmethod
+    def _inserir_deduplicado(conn, resultados):
+        """
+        Insere resultados (formato plano) nos sorteios, consultando o índice de deduplicação
+        (sorteio do dia + número).
+        Número novo no sorteio -> ocupa a posição capturada ('posicao', renumerada por
+        sorteio em posicoes_por_sorteio; no fim se ausente), criando o sorteio se preciso; número existente com menos campos preenchidos ->
+        completa a posição existente (animal, estado, origem); caso contrário ignora.
+        Cada resultado inserido recebe 'posicao'/'colocacao' dentro do seu sorteio.
+        Retorna (inseridos, substituidos, datas_afetadas, sorteios_alterados).
+        """
+        inseridos = []
+        substituidos = []
+        datas = set()
+        sorteios = {}
+        alterados = {}
+        # Sorteio -> estava vazio antes do lote (posições renumeradas só nesse caso)
+        vazios = {}
+        chaves = [chave_dedup(resultado) for resultado in resultados]
+        for resultado, chave, posicao_lote in zip(resultados, chaves, posicoes_por_sorteio(resultados, chaves)):
+            if not chave[3]:
+                continue
+            campos = contar_campos(resultado)
+            sorteio = BancoResultados._sorteio_do_resultado(conn, sorteios, resultado, chave)
+            if sorteio['id'] not in vazios:
+                vazios[sorteio['id']] = not any(sorteio['numeros'])
+            existente = conn.execute(
+                'SELECT posicao, campos FROM indice_sorteios WHERE sorteio_id = ? AND numero = ?',
+                (sorteio['id'], chave[3])
+            ).fetchone()
+            if existente is None:
+                posicao = BancoResultados._posicionar(
+                    sorteio, chave[3], resultado.get('animal') or '',
+                    posicao_lote if vazios[sorteio['id']] else posicao_capturada(resultado)
+                )
+                conn.execute(
+                    'INSERT INTO indice_sorteios (sorteio_id, numero, posicao, campos) VALUES (?, ?, ?, ?)',
+                    (sorteio['id'], chave[3], posicao, campos)
+                )
+                inseridos.append(resultado)
+            elif campos > existente['campos']:
+                posicao = existente['posicao']
+                if resultado.get('animal'):
+                    sorteio['animais'][posicao - 1] = resultado['animal']
+                for campo in ('estado', 'url_origem'):
+                    if not sorteio.get(campo) and resultado.get(campo):
+                        sorteio[campo] = resultado[campo]
+                conn.execute(
+                    'UPDATE indice_sorteios SET campos = ? WHERE sorteio_id = ? AND numero = ?',
+                    (campos, sorteio['id'], chave[3])
+                )
+                substituidos.append(resultado)
+            else:
+                continue
+            alterados[sorteio['id']] = sorteio
+            resultado['posicao'] = posicao
+            resultado['colocacao'] = f"{posicao}°"
+            datas.add(sorteio['data'])
+
+        for sorteio in alterados.values():
+            conn.execute(
+                'UPDATE sorteios SET estado = ?, url_origem = ?, numeros = ?, animais = ?, quantidade = ? '
+                'WHERE id = ?',
+                (sorteio['estado'], sorteio['url_origem'], _json_compacto(sorteio['numeros']),
+                 _json_compacto(sorteio['animais']), sum(1 for numero in sorteio['numeros'] if numero),
+                 sorteio['id'])
+            )
+        return inseridos, substituidos, datas, [
+            {campo: sorteio[campo] for campo in CAMPOS_SORTEIO} for sorteio in alterados.values()
+        ]
+
+    def inserir(self, resultados, ultima_verificacao=None):
+        """
+        Insere resultados novos (formato plano, deduplicados pelo índice) em uma única
+        transação; cada um vira uma posição do sorteio correspondente.
+        A geração só muda se algo foi inserido ou substituído (ultima_verificacao
+        é gravada sempre, sem invalidar caches).
+        Cada sorteio alterado gera um evento 'sorteio' na mesma transação.
+        Retorna {'geracao', 'inseridos', 'substituidos'}.
+        """
+        with self._transacao() as conn:
+            restauradas = self._restaurar_particoes(conn, {extrair_data_resultado(r) for r in resultados})
+            inseridos, substituidos, datas, sorteios = self._inserir_deduplicado(conn, resultados)
+            if ultima_verificacao:
+                self._gravar_meta(conn, 'ultima_verificacao', ultima_verificacao)
+            if inseridos or substituidos or restauradas:
+                geracao = self._incrementar_geracao(conn)
+                self._atualizar_particoes(conn, geracao, datas | restauradas)
+                self._marcar_sorteios(conn, geracao, [sorteio['id'] for sorteio in sorteios])
+                self._registrar_eventos(conn, 'sorteio', geracao, sorteios)
+            else:
+                geracao = int(self._ler_meta('geracao', '0'))
+        if inseridos or substituidos or restauradas:
+            self.notificar()
+        return {'geracao': geracao, 'inseridos': inseridos, 'substituidos': substituidos}
+
+    def substituir(self, dados):
+        """
+        Substitui todo o conteúdo pelos dados informados (formato legado do resultados.json),
+        reagrupando em sorteios e reconstruindo o índice de deduplicação. Retorna a nova geração.
+        """
+        with self._transacao() as conn:
+            conn.execute('DELETE FROM sorteios')
+            conn.execute('DELETE FROM indice_sorteios')
+            self._restaurar_particoes(conn, {extrair_data_resultado(r) for r in dados.get('resultados', [])})
+            self._inserir_deduplicado(conn, dados.get('resultados', []))
+            if dados.get('ultima_verificacao'):
+                self._gravar_meta(conn, 'ultima_verificacao', dados['ultima_verificacao'])
+            geracao = self._incrementar_geracao(conn)
+            self._atualizar_particoes(conn, geracao)
+            self._marcar_sorteios(conn, geracao)
+            # Conteúdo trocado por inteiro: deltas anteriores a esta geração não valem mais
+            self._gravar_meta(conn, 'geracao_base', str(geracao))
+            self._gravar_meta(conn, 'substituido_em', datetime.now(ZoneInfo('America/Sao_Paulo')).isoformat())
+        self.notificar()
+        return geracao
+
+    def completar_estados(self, identificar_estado):
+        """
+        Preenche o estado dos sorteios que não o têm usando identificar_estado(loteria).
+        Retorna quantos sorteios foram atualizados.
+        """
+        with self._transacao() as conn:
+            linhas = conn.execute(
+                "SELECT id, loteria, data FROM sorteios WHERE estado IS NULL OR estado = ''"
+            ).fetchall()
+            if not linhas:
+                return 0
+            for linha in linhas:
+                conn.execute(
+                    'UPDATE sorteios SET estado = ? WHERE id = ?',
+                    (identificar_estado(linha['loteria'] or ''), linha['id'])
+                )
+            geracao = self._incrementar_geracao(conn)
+            self._atualizar_particoes(conn, geracao, {linha['data'] for linha in linhas})
+            self._marcar_sorteios(conn, geracao, [linha['id'] for linha in linhas])
+        self.notificar()
+        return len(linhas)
+
+    # ---------------- eventos ----------------
+
+    @staticmethod
+    def _registrar_eventos(conn, tipo, geracao, lista_dados):
+        criado_em = datetime.now(ZoneInfo('America/Sao_Paulo')).isoformat()
+        conn.executemany(
+            'INSERT INTO eventos (tipo, geracao, criado_em, dados) VALUES (?, ?, ?, ?)',
+            [(tipo, geracao, criado_em, _json_compacto(dados)) for dados in lista_dados]
+        )
+        conn.execute(
+            'DELETE FROM eventos WHERE id <= (SELECT MAX(id) FROM eventos) - ?', (MAX_EVENTOS,)
+        )
+
+    def registrar_evento(self, tipo, dados):
+        """Acrescenta um evento ao log (ex: 'liquidacao'); não altera a geração. Retorna o id."""
+        with self._transacao() as conn:
+            self._registrar_eventos(conn, tipo, int(self._ler_meta('geracao', '0')), [dados])
+            id_evento = conn.execute('SELECT MAX(id) FROM eventos').fetchone()[0]
+        self.notificar()
+        return id_evento
+
+    def ultimo_evento(self):
+        """Id do evento mais recente (0 se o log está vazio)"""
+        return self._conexao().execute('SELECT COALESCE(MAX(id), 0) FROM eventos').fetchone()[0]
+
+    def listar_eventos(self, depois_de=0, limite=500):
+        """
+        Eventos com id maior que depois_de, em ordem:
+        [{'id', 'tipo', 'geracao', 'criado_em', 'dados'}, ...] ('dados' é o JSON gravado, em texto)
+        """
+        linhas = self._conexao().execute(
+            'SELECT id, tipo, geracao, criado_em, dados FROM eventos WHERE id > ? ORDER BY id LIMIT ?',
+            (depois_de, limite)
+        ).fetchall()
+        return [dict(linha) for linha in linhas]
+
+    # ---------------- leitura ----------------
+
+    @staticmethod
+    def _filtros_sorteios(loteria=None, horario=None, data=None, estado=None, data_inicio=None, data_fim=None):
+        """Condições (WHERE) e parâmetros dos filtros de sorteios; todos atendidos por índices"""
+        condicoes = []
+        parametros = []
+        if loteria:
+            condicoes.append('loteria_normalizada = ?')
+            parametros.append(normalizar_loteria(loteria))
+        if horario:
+            condicoes.append('horario_normalizado = ?')
+            parametros.append(normalizar_horario(horario))
+        if data:
+            condicoes.append('data = ?')
+            parametros.append(normalizar_data(data) or data)
+        if data_inicio:
+            condicoes.append('data >= ?')
+            parametros.append(normalizar_data(data_inicio) or data_inicio)
+        if data_fim:
+            condicoes.append('data <= ?')
+            parametros.append(normalizar_data(data_fim) or data_fim)
+        if estado:
+            condicoes.append('estado = ?')
+            parametros.append(estado.upper())
+        return condicoes, parametros
+
+    def listar_sorteios(self, loteria=None, horario=None, data=None, estado=None):
+        """
+        Lista sorteios em ordem de criação, opcionalmente filtrados.
+        Filtros por loteria/horário/data/estado usam os índices da tabela.
+        """
+        condicoes, parametros = self._filtros_sorteios(loteria, horario, data, estado)
+        sql = 'SELECT * FROM sorteios'
+        if condicoes:
+            sql += ' WHERE ' + ' AND '.join(condicoes)
+        sql += ' ORDER BY id'
+        return [_linha_para_sorteio(linha) for linha in self._conexao().execute(sql, parametros)]
+
+    def listar_sorteios_pagina(self, loteria=None, horario=None, estado=None, data_inicio=None,
+                               data_fim=None, a_partir_de=None, limite=100, decrescente=False):
+        """
+        Página de sorteios filtrados, em ordem de criação (ou inversa, com decrescente=True),
+        começando no sorteio a_partir_de (inclusive). Filtros como em listar_sorteios,
+        mais intervalo de datas (data_inicio/data_fim, inclusive).
+        """
+        condicoes, parametros = self._filtros_sorteios(
+            loteria, horario, None, estado, data_inicio, data_fim
+        )
+        if a_partir_de is not None:
+            condicoes.append('id <= ?' if decrescente else 'id >= ?')
+            parametros.append(a_partir_de)
+        sql = 'SELECT * FROM sorteios'
+        if condicoes:
+            sql += ' WHERE ' + ' AND '.join(condicoes)
+        sql += ' ORDER BY id DESC LIMIT ?' if decrescente else ' ORDER BY id LIMIT ?'
+        parametros.append(limite)
+        return [_linha_para_sorteio(linha) for linha in self._conexao().execute(sql, parametros)]
+
+    def listar_sorteios_desde(self, geracao=None, atualizado_apos=None):
+        """
+        Delta para consumidores incrementais, lido em uma única transação de leitura:
+        sorteios alterados depois da geração informada (ou depois do horário ISO
+        atualizado_apos), inteiros e na ordem das escritas.
+        Retorna {'geracao', 'completo', 'sorteios'}; completo=True para geracao=0 ou quando
+        o conteúdo foi substituído depois do ponto pedido (a lista traz então todos os
+        sorteios e o consumidor deve descartar sua cópia).
+        """
+        conn = self._conexao()
+        conn.execute('BEGIN')
+        try:
+            geracao_atual = int(self._ler_meta('geracao', '0'))
+            if geracao is not None:
+                completo = geracao <= 0 or geracao < int(self._ler_meta('geracao_base', '0'))
+            else:
+                substituido_em = self._ler_meta('substituido_em')
+                completo = bool(substituido_em) and atualizado_apos < substituido_em
+            if completo:
+                condicao, parametro = 'geracao >= ?', 0
+            elif geracao is not None:
+                condicao, parametro = 'geracao > ?', geracao
+            else:
+                condicao, parametro = 'atualizado_em > ?', atualizado_apos
+            linhas = conn.execute(
+                f'SELECT * FROM sorteios WHERE {condicao} ORDER BY geracao, id', (parametro,)
+            ).fetchall()
+        finally:
+            conn.execute('COMMIT')
+        return {
+            'geracao': geracao_atual,
+            'completo': completo,
+            'sorteios': [_linha_para_sorteio(linha) for linha in linhas],
+        }
+
+    def listar(self, loteria=None, horario=None, data=None, estado=None):
+        """Visão plana (formato legado) dos sorteios filtrados: um resultado por posição"""
+        return expandir_sorteios(self.listar_sorteios(loteria, horario, data, estado))
+
+    def carregar_sorteios(self):
+        """Todos os sorteios: {'sorteios': [...], 'ultima_verificacao': ...}"""
+        return {
+            'sorteios': self.listar_sorteios(),
+            'ultima_verificacao': self.ultima_verificacao(),
+        }
+
+    def carregar(self):
+        """Todos os resultados no formato legado {'resultados': [...], 'ultima_verificacao': ...}"""
+        return {
+            'resultados': self.listar(),
+            'ultima_verificacao': self.ultima_verificacao(),
+        }
+
+    # ---------------- visões materializadas ----------------
+
+    def ler_visao(self, nome):
+        """Visão materializada gravada: {'versao', 'conteudo'} ou None"""
+        linha = self._conexao().execute(
+            'SELECT versao, conteudo FROM visoes WHERE nome = ?', (nome,)
+        ).fetchone()
+        return {'versao': linha['versao'], 'conteudo': bytes(linha['conteudo'])} if linha else None
+
+    def gravar_visao(self, nome, versao, conteudo):
+        """Grava uma visão materializada (bytes prontos para servir); não altera a geração"""
+        with self._transacao() as conn:
+            conn.execute(
+                'INSERT INTO visoes (nome, versao, conteudo) VALUES (?, ?, ?) '
+                'ON CONFLICT(nome) DO UPDATE SET versao = excluded.versao, conteudo = excluded.conteudo',
+                (nome, versao, conteudo)
+            )
+
+    # ---------------- partições por dia ----------------
+
+    def particoes(self):
+        """Catálogo de partições: [{'data', 'geracao', 'total', 'arquivo'}, ...] em ordem de data"""
+        linhas = self._conexao().execute('SELECT * FROM particoes ORDER BY data').fetchall()
+        return [dict(linha) for linha in linhas]
+
+    def particao(self, data):
+        """Entrada do catálogo para um dia (YYYY-MM-DD ou DD/MM/YYYY) ou None"""
+        linha = self._conexao().execute(
+            'SELECT * FROM particoes WHERE data = ?', (normalizar_data(data) or data,)
+        ).fetchone()
+        return dict(linha) if linha else None
+
+    def listar_particao(self, data, estado=None):
+        """
+        Resultados de um dia (opcionalmente de um estado); lê o arquivo compactado
+        se a partição já foi arquivada.
+        """
+        particao = self.particao(data)
+        if particao and particao['arquivo']:
+            resultados = ler_particao_arquivada(particao['arquivo'])
+            if estado:
+                resultados = [r for r in resultados if (r.get('estado') or '').upper() == estado.upper()]
+            return resultados
+        return self.listar(data=data, estado=estado)
+
+    def arquivar_particoes(self, antes_de, diretorio='arquivo_resultados'):
+        """
+        Move para diretorio/resultados_YYYY-MM-DD.jsonl.gz (um sorteio por linha) os dias
+        anteriores a antes_de (YYYY-MM-DD) e remove seus sorteios do banco.
+        Retorna quantos dias foram arquivados.
+        """
+        datas = [
+            linha['data'] for linha in self._conexao().execute(
+                'SELECT data FROM particoes WHERE arquivo IS NULL AND data < ? ORDER BY data',
+                (antes_de,)
+            )
+        ]
+        if not datas:
+            return 0
+
+        os.makedirs(diretorio, exist_ok=True)
+        arquivos = {}
+        for data in datas:
+            caminho = os.path.join(diretorio, f"resultados_{data}.jsonl.gz")
+            temporario = caminho + '.tmp'
+            with gzip.open(temporario, 'wt', encoding='utf-8') as f:
+                for sorteio in self.listar_sorteios(data=data):
+                    f.write(_json_compacto(sorteio) + '\n')
+            os.replace(temporario, caminho)
+            arquivos[data] = caminho
+
+        # Remoção de todos os dias arquivados em uma única escrita (uma geração)
+        with self._transacao() as conn:
+            geracao = self._incrementar_geracao(conn)
+            for data, caminho in arquivos.items():
+                conn.execute(
+                    'DELETE FROM indice_sorteios WHERE sorteio_id IN (SELECT id FROM sorteios WHERE data = ?)',
+                    (data,)
+                )
+                conn.execute('DELETE FROM sorteios WHERE data = ?', (data,))
+                conn.execute(
+                    'UPDATE particoes SET arquivo = ?, geracao = ? WHERE data = ?',
+                    (caminho, geracao, data)
+                )
+        self.notificar()
+        for data, caminho in arquivos.items():
+            logger.info(f"🗄️  Partição {data} arquivada em {caminho}")
+        return len(datas)
+
+    # ---------------- migração / exportação ----------------
+
+    def importar_json(self, arquivo='resultados.json'):
+        """
+        Importa resultados.json para o banco.
+        Só roda uma vez, enquanto o banco ainda não tem resultados.
+        """
+        if self._ler_meta('importado_json') or self.total() > 0:
+            return 0
+
+        dados = {'resultados': [], 'ultima_verificacao': None}
+        if os.path.exists(arquivo):
+            try:
+                with open(arquivo, 'rb') as f:
+                    dados = serializacao.loads(f.read())
+            except Exception as e:
+                logger.warning(f"⚠️  Não foi possível importar {arquivo}: {e}")
+
+        total = len(dados.get('resultados', []))
+        self.substituir(dados)
+        with self._transacao() as conn:
+            self._gravar_meta(conn, 'importado_json', datetime.now().isoformat())
+        if total:
+            logger.info(f"📥 {total} resultados importados de {arquivo} para {self.caminho}")
+        return total
+
+    def _ler_snapshot(self):
+        """Geração e resultados lidos em uma única transação de leitura (não trava escritas)"""
+        conn = self._conexao()
+        conn.execute('BEGIN')
+        try:
+            geracao = int(self._ler_meta('geracao', '0'))
+            dados = self.carregar()
+        finally:
+            conn.execute('COMMIT')
+        return geracao, {
+            'geracao': geracao,
+            'resultados': dados['resultados'],
+            'ultima_verificacao': dados['ultima_verificacao'],
+            'total_resultados': len(dados['resultados']),
+        }
+
+    def publicar_snapshot(self, arquivo='resultados.json'):
+        """
+        Publica o snapshot resultados.json se a geração mudou desde a última publicação
+        nesse caminho (no máximo uma serialização por geração). Leitura e serialização
+        (para um temporário) acontecem sem travar o banco; só a troca do arquivo
+        (os.replace) é feita com o banco travado para escrita, e só se nenhum processo
+        publicou uma geração igual ou mais nova no meio: o arquivo nunca volta para uma
+        geração mais antiga. Retorna a geração publicada ou None.
+        """
+        chave = f"snapshot:{os.path.abspath(arquivo)}"
+        if self._ler_meta(chave) == self._ler_meta('geracao', '0') and os.path.exists(arquivo):
+            return None
+        geracao, snapshot = self._ler_snapshot()
+        # Compacto: o snapshot é lido por programas (Cloudflare, deploy, importação)
+        temporario = gravar_temporario(arquivo, serializacao.dumps(snapshot))
+        try:
+            with self._transacao() as conn:
+                publicada = int(self._ler_meta(chave, '-1'))
+                if publicada >= geracao and os.path.exists(arquivo):
+                    return None
+                os.replace(temporario, arquivo)
+                self._gravar_meta(conn, chave, str(geracao))
+        finally:
+            if os.path.exists(temporario):
+                os.unlink(temporario)
+        return geracao
+
+def gravar_temporario(caminho, conteudo):
+    """
+    Grava bytes (com fsync) em um arquivo temporário no mesmo diretório de caminho,
+    pronto para os.replace; retorna o caminho do temporário.
+    """
+    diretorio = os.path.dirname(os.path.abspath(caminho))
+    descritor, temporario = tempfile.mkstemp(prefix=f".{os.path.basename(caminho)}.", suffix='.tmp', dir=diretorio)
+    try:
+        with os.fdopen(descritor, 'wb') as f:
+            f.write(conteudo)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temporario, 0o644)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.unlink(temporario)
+        raise
+    return temporario
+
+def gravar_arquivo_atomico(caminho, conteudo):
+    """
+    Grava bytes em caminho sem que leitores vejam o arquivo pela metade:
+    arquivo temporário no mesmo diretório, fsync e os.replace.
+    """
+    temporario = gravar_temporario(caminho, conteudo)
+    try:
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+def ler_sorteios_arquivados(caminho):
+    """Lê os sorteios de uma partição arquivada (.jsonl.gz, um sorteio por linha)"""
+    sorteios = []
+    try:
+        with gzip.open(caminho, 'rt', encoding='utf-8') as f:
+            for linha in f:
+                if linha.strip():
+                    sorteios.append(serializacao.loads(linha))
+    except FileNotFoundError:
+        logger.warning(f"⚠️  Arquivo de partição não encontrado: {caminho}")
+    return sorteios
+
+def ler_particao_arquivada(caminho):
+    """Lê os resultados (visão plana) de uma partição arquivada"""
+    return expandir_sorteios(ler_sorteios_arquivados(caminho))
+
+_bancos = {}
+_bancos_lock = threading.Lock()
+
+def obter_banco(caminho=None):
+    """
+    Retorna o BancoResultados compartilhado do processo para o caminho informado
+    (padrão: variável RESULTADOS_DB ou resultados.db). Na primeira abertura importa
+    o resultados.json legado que estiver ao lado do banco.
+    """
+    caminho = caminho or os.getenv('RESULTADOS_DB', 'resultados.db')
+    chave = os.path.abspath(caminho)
+    with _bancos_lock:
+        banco = _bancos.get(chave)
+        if banco is None:
+            banco = BancoResultados(caminho)
+            banco.importar_json(os.path.splitext(caminho)[0] + '.json')
+            _bancos[chave] = banco
+        return banco
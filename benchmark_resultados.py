@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks do dataset de resultados
+
+--modo memoria (padrão): compara o RSS de N resultados (padrão 100.000) em dois formatos:
+- dict: um dicionário por posição, como o antigo resultados.json carregado
+- registro: Resultado (__slots__ + strings internadas) gerado a partir dos sorteios
+Cada formato é medido em um subprocesso próprio (só a leitura do arquivo JSON
+correspondente) para o RSS não se misturar.
+
+--modo serializacao: tempo de encode/decode de N resultados (padrão 50.000) com o
+json antigo (indent=2), json compacto e o módulo serializacao (orjson, se instalado).
+
+Uso: python benchmark_resultados.py [--modo memoria|serializacao] [--linhas N]
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import time
+import tempfile
+import subprocess
+
+LOTERIAS = [
+    ('PT Rio de Janeiro', 'RJ'), ('PT São Paulo', 'SP'), ('PT Bahia', 'BA'),
+    ('Lotep', 'PB'), ('Look Goiás', 'GO'), ('Lotece', 'CE'), ('Loteria Nacional', 'BR'),
+]
+HORARIOS = ['09:20', '11:20', '14:20', '16:20', '18:20', '21:20']
+ANIMAIS = [
+    'Avestruz', 'Águia', 'Burro', 'Borboleta', 'Cachorro', 'Cabra', 'Carneiro', 'Camelo',
+    'Cobra', 'Coelho', 'Cavalo', 'Elefante', 'Galo', 'Gato', 'Jacaré', 'Leão', 'Macaco',
+    'Porco', 'Pavão', 'Peru', 'Touro', 'Tigre', 'Urso', 'Veado', 'Vaca',
+]
+
+def gerar_resultados(linhas):
+    """Resultados sintéticos no formato legado (7 posições por sorteio)"""
+    aleatorio = random.Random(42)
+    resultados = []
+    dia = 0
+    while len(resultados) < linhas:
+        dia += 1
+        data = f"{(dia % 28) + 1:02d}/{(dia // 28) % 12 + 1:02d}/2026"
+        for loteria, estado in LOTERIAS:
+            for horario in HORARIOS:
+                url = f"https://bichocerto.com/resultados/{loteria.lower().replace(' ', '-')}"
+                for posicao in range(1, 8):
+                    numero = f"{aleatorio.randint(0, 9999):04d}"
+                    animal = aleatorio.choice(ANIMAIS)
+                    resultados.append({
+                        'numero': numero,
+                        'animal': animal,
+                        'loteria': loteria,
+                        'estado': estado,
+                        'horario': horario,
+                        'posicao': posicao,
+                        'colocacao': f"{posicao}°",
+                        'texto_completo': f"{numero} {animal}",
+                        'timestamp': f"2026-01-01T{horario}:00-03:00",
+                        'data_extração': data,
+                        'url_origem': url,
+                    })
+    return resultados[:linhas]
+
+def rss_kb():
+    """RSS atual do processo em KB (Linux: /proc/self/status)"""
+    with open('/proc/self/status') as f:
+        for linha in f:
+            if linha.startswith('VmRSS:'):
+                return int(linha.split()[1])
+    return 0
+
+def agrupar_sorteios(resultados):
+    """Agrupa os resultados legados em sorteios (formato do banco)"""
+    from banco_resultados import normalizar_loteria, normalizar_horario, extrair_data_resultado
+    sorteios = {}
+    for r in resultados:
+        chave = (normalizar_loteria(r['loteria']), normalizar_horario(r['horario']), extrair_data_resultado(r))
+        sorteio = sorteios.setdefault(chave, {
+            'loteria': r['loteria'], 'estado': r['estado'], 'horario': r['horario'],
+            'data': chave[2], 'url_origem': r['url_origem'], 'capturado_em': r['timestamp'],
+            'numeros': [], 'animais': [],
+        })
+        sorteio['numeros'].append(r['numero'])
+        sorteio['animais'].append(r['animal'])
+    return list(sorteios.values())
+
+def medir(formato, arquivo):
+    """Executado no subprocesso: carrega o arquivo no formato pedido e imprime o RSS usado"""
+    from banco_resultados import expandir_sorteios
+    from registro_resultado import internar
+
+    with open(arquivo, 'r', encoding='utf-8') as f:
+        texto = f.read()
+    antes = rss_kb()
+    if formato == 'dict':
+        dados = json.loads(texto)
+    else:
+        sorteios = json.loads(texto)
+        for sorteio in sorteios:
+            for campo in ('loteria', 'estado', 'horario', 'data', 'url_origem', 'capturado_em'):
+                sorteio[campo] = internar(sorteio[campo])
+            sorteio['animais'] = [internar(a) for a in sorteio['animais']]
+        dados = expandir_sorteios(sorteios)
+    depois = rss_kb()
+    print(json.dumps({'formato': formato, 'linhas': len(dados), 'rss_kb': depois - antes}))
+
+def cronometrar(funcao, repeticoes=5):
+    """Menor tempo (ms) entre algumas execuções"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return min(tempos)
+
+def benchmark_serializacao(linhas):
+    import serializacao
+    from banco_resultados import expandir_sorteios
+
+    resultados = gerar_resultados(linhas)
+    registros = expandir_sorteios(agrupar_sorteios(resultados))
+    dados = {'resultados': resultados, 'ultima_verificacao': '2026-01-01T00:00:00-03:00'}
+    casos = [
+        ('json indent=2 (antigo)',
+         lambda: json.dumps(dados, ensure_ascii=False, indent=2).encode('utf-8'), json.loads),
+        ('json compacto',
+         lambda: json.dumps(dados, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), json.loads),
+        (f'serializacao ({serializacao.IMPLEMENTACAO})',
+         lambda: serializacao.dumps(dados), serializacao.loads),
+        (f'serializacao ({serializacao.IMPLEMENTACAO}) Resultado',
+         lambda: serializacao.dumps({'resultados': registros}), serializacao.loads),
+    ]
+    print(f"{len(resultados)} resultados\n")
+    print(f"{'formato':<36} {'encode (ms)':>12} {'decode (ms)':>12} {'tamanho (KB)':>13}")
+    for nome, codificar, decodificar in casos:
+        texto = codificar()
+        tempo_encode = cronometrar(codificar)
+        tempo_decode = cronometrar(lambda: decodificar(texto))
+        print(f"{nome:<36} {tempo_encode:>12.1f} {tempo_decode:>12.1f} {len(texto) / 1024:>13.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks do dataset de resultados')
+    parser.add_argument('--modo', choices=['memoria', 'serializacao'], default='memoria')
+    parser.add_argument('--linhas', type=int)
+    parser.add_argument('--medir', choices=['dict', 'registro'], help=argparse.SUPPRESS)
+    parser.add_argument('--arquivo', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir:
+        medir(args.medir, args.arquivo)
+        return
+    if args.modo == 'serializacao':
+        benchmark_serializacao(args.linhas or 50000)
+        return
+
+    resultados = gerar_resultados(args.linhas or 100000)
+    entradas = {'dict': resultados, 'registro': agrupar_sorteios(resultados)}
+    medidas = {}
+    with tempfile.TemporaryDirectory() as diretorio:
+        for formato, conteudo in entradas.items():
+            arquivo = os.path.join(diretorio, f"{formato}.json")
+            with open(arquivo, 'w', encoding='utf-8') as f:
+                json.dump(conteudo, f, ensure_ascii=False)
+            saida = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--medir', formato, '--arquivo', arquivo],
+                capture_output=True, text=True, check=True
+            ).stdout
+            medidas[formato] = json.loads(saida)
+
+    print(f"{'formato':<10} {'linhas':>8} {'RSS (MB)':>10}")
+    for formato, medida in medidas.items():
+        print(f"{formato:<10} {medida['linhas']:>8} {medida['rss_kb'] / 1024:>10.1f}")
+    economia = 1 - medidas['registro']['rss_kb'] / max(medidas['dict']['rss_kb'], 1)
+    print(f"\nEconomia de RSS: {economia:.0%}")
+
+if __name__ == '__main__':
+    main()
@@ -21,7 +21,8 @@ except ImportError:
 sys.path.insert(0, os.path.dirname(__file__))
 
 from models import Base, Aposta, Resultado, Liquidacao, Usuario, Transacao
-from monitor_selenium import carregar_resultados
+from monitor_selenium import buscar_resultados
+from banco_resultados import obter_banco
 from matching_resultados import MatchingResultados
 from integracao_site import IntegracaoSite
 
@@ -233,22 +234,15 @@ class BotLiquidacao:
     def processar_liquidacao_automatica(self):
         """
         Processa liquidação automática:
-        1. Carrega resultados da API
-        2. Busca apostas pendentes
+        1. Busca apostas pendentes
+        2. Consulta resultados da loteria de cada aposta (índice do banco)
         3. Faz matching de resultados
         4. Processa liquidação
         5. Envia liquidação para o site
         """
         session = self.Session()
         try:
-            # 1. Carregar resultados da API
-            dados = carregar_resultados()
-            resultados_coletados = dados.get('resultados', [])
-            
-            if not resultados_coletados:
-                return
-            
-            # 2. Buscar apostas pendentes
+            # 1. Buscar apostas pendentes
             apostas_pendentes = self.matching.buscar_apostas_pendentes(session)
             
             if not apostas_pendentes:
@@ -256,9 +250,16 @@ class BotLiquidacao:
             
             logger.info(f"🔄 Processando {len(apostas_pendentes)} apostas pendentes...")
             
-            # 3. Para cada aposta pendente, tentar encontrar resultado
+            # 2. Para cada aposta pendente, tentar encontrar resultado
+            # (consulta indexada por loteria em vez de varrer todos os resultados)
+            resultados_por_loteria = {}
             for aposta in apostas_pendentes:
                 try:
+                    if aposta.loteria not in resultados_por_loteria:
+                        resultados_por_loteria[aposta.loteria] = buscar_resultados(loteria=aposta.loteria)
+                    resultados_coletados = resultados_por_loteria[aposta.loteria]
+                    if not resultados_coletados:
+                        continue
                     self.processar_liquidacao_aposta(aposta, resultados_coletados, session)
                 except Exception as e:
                     logger.error(f"❌ Erro ao processar aposta {aposta.id}: {e}")
@@ -342,6 +343,25 @@ class BotLiquidacao:
         
         session.commit()
         
+        # Publicar no log de eventos (stream SSE dos dashboards)
+        try:
+            obter_banco().registrar_evento('liquidacao', {
+                'aposta_id': aposta.id,
+                'aposta_id_externo': aposta.aposta_id_externo,
+                'status': aposta.status,
+                'valor_ganho': valor_ganho,
+                'loteria': aposta.loteria,
+                'horario': aposta.horario,
+                'resultado': {
+                    'numero': numero_resultado,
+                    'animal': resultado_dict.get('animal', ''),
+                    'posicao': resultado_dict.get('posicao', 0)
+                },
+                'timestamp': agora.isoformat()
+            })
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao registrar evento de liquidação: {e}")
+        
         # Enviar liquidação para o site
         if self.integracao and aposta.aposta_id_externo:
             liquidacao_dict = {
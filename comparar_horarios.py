@@ -190,13 +190,12 @@ def comparar_horarios(url_api=None):
     horarios_api = buscar_horarios_api(url_api)
     
     if not horarios_api:
-        print("⚠️  Não foi possível buscar dados da API. Tentando ler resultados.json...")
+        print("⚠️  Não foi possível buscar dados da API. Tentando ler banco de resultados local...")
         try:
-            with open('resultados.json', 'r', encoding='utf-8') as f:
-                dados = json.load(f)
+            from banco_resultados import obter_banco
             
             horarios_api = {}
-            for resultado in dados.get('resultados', []):
+            for resultado in obter_banco().listar():
                 loteria = normalizar_loteria(resultado.get('loteria', ''))
                 horario = normalizar_horario(resultado.get('horario', ''))
                 
@@ -205,10 +204,8 @@ def comparar_horarios(url_api=None):
                         horarios_api[loteria] = []
                     if horario not in horarios_api[loteria]:
                         horarios_api[loteria].append(horario)
-        except FileNotFoundError:
-            print("⚠️  Arquivo resultados.json não encontrado")
         except Exception as e:
-            print(f"❌ Erro ao ler resultados.json: {e}")
+            print(f"❌ Erro ao ler banco de resultados: {e}")
     
     print(f"✅ Encontrados {sum(len(h) for h in horarios_api.values())} horários na API")
     print()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compressão das respostas grandes (histórico de resultados)
+
+Negocia gzip ou brotli (quando o pacote brotli está instalado) pelo Accept-Encoding
+e guarda os bytes comprimidos por versão dos dados: a mesma resposta é comprimida
+uma vez por ciclo do monitor, não uma vez por requisição.
+"""
+
+import os
+import gzip
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+    BROTLI_DISPONIVEL = True
+except ImportError:
+    brotli = None
+    BROTLI_DISPONIVEL = False
+
+# Abaixo disso não vale a pena comprimir (cabeçalhos custam mais que a economia)
+TAMANHO_MINIMO = int(os.getenv('COMPRESSAO_TAMANHO_MINIMO', '1024'))
+# Níveis moderados: a compressão roda uma vez por versão, mas dentro da requisição
+NIVEL_GZIP = int(os.getenv('COMPRESSAO_NIVEL_GZIP', '6'))
+QUALIDADE_BROTLI = int(os.getenv('COMPRESSAO_QUALIDADE_BROTLI', '5'))
+# Respostas comprimidas mantidas em memória (URL x codificação)
+MAX_ENTRADAS = int(os.getenv('COMPRESSAO_CACHE_MAX', '64'))
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def escolher_codificacao(accept_encodings):
+    """
+    Melhor codificação aceita pelo cliente ('br', 'gzip') ou None.
+    accept_encodings: request.accept_encodings do Flask/Werkzeug
+    """
+    if BROTLI_DISPONIVEL and accept_encodings.quality('br') > 0:
+        return 'br'
+    if accept_encodings.quality('gzip') > 0:
+        return 'gzip'
+    return None
+
+def comprimir(conteudo, codificacao):
+    """Comprime bytes com a codificação pedida ('br' ou 'gzip')"""
+    if codificacao == 'br':
+        return brotli.compress(conteudo, quality=QUALIDADE_BROTLI)
+    # mtime fixo: mesmos bytes de entrada, mesmos bytes de saída
+    return gzip.compress(conteudo, compresslevel=NIVEL_GZIP, mtime=0)
+
+def obter_comprimido(chave, versao):
+    """Bytes comprimidos guardados para (chave) se ainda forem da versão pedida"""
+    with _cache_lock:
+        entrada = _cache.get(chave)
+        if entrada is None or entrada[0] != versao:
+            return None
+        _cache.move_to_end(chave)
+        return entrada[1]
+
+def guardar_comprimido(chave, versao, conteudo):
+    """Guarda os bytes comprimidos de (chave) para a versão (descarta os mais antigos)"""
+    with _cache_lock:
+        _cache[chave] = (versao, conteudo)
+        _cache.move_to_end(chave)
+        while len(_cache) > MAX_ENTRADAS:
+            _cache.popitem(last=False)
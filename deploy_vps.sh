@@ -18,7 +18,7 @@ sudo chown $USER:$USER $APP_DIR
 
 # Copiar arquivos
 echo "📦 Copiando arquivos..."
-cp -r monitor_selenium.py app_vps.py dashboard_mini.html resultados.json $APP_DIR/ 2>/dev/null || true
+cp -r monitor_selenium.py worker_monitor.py pool_navegadores.py banco_resultados.py registro_resultado.py serializacao.py visoes_resultados.py compressao.py lideranca.py app_vps.py dashboard_mini.html resultados.json $APP_DIR/ 2>/dev/null || true
 cp requirements_vps.txt $APP_DIR/requirements.txt
 
 # Criar ambiente virtual
@@ -44,7 +44,8 @@ Type=simple
 User=$USER
 WorkingDirectory=$APP_DIR
 Environment="PATH=$APP_DIR/venv/bin"
-ExecStart=$APP_DIR/venv/bin/gunicorn --bind 0.0.0.0:5000 --workers 2 --timeout 120 app_vps:app
+Environment="MONITOR_MODO=externo"
+ExecStart=$APP_DIR/venv/bin/gunicorn --bind 0.0.0.0:5000 --workers 2 --worker-class gthread --threads 32 --timeout 120 app_vps:app
 Restart=always
 RestartSec=10
 
@@ -52,7 +53,7 @@ RestartSec=10
 WantedBy=multi-user.target
 EOF
 
-# Criar serviço do monitor (opcional - pode rodar junto)
+# Criar serviço do worker (monitor + bot de liquidação, separado da web)
 sudo tee /etc/systemd/system/monitor-resultados-monitor.service > /dev/null <<EOF
 [Unit]
 Description=Monitor de Resultados - Background Monitor
@@ -63,9 +64,9 @@ Type=simple
 User=$USER
 WorkingDirectory=$APP_DIR
 Environment="PATH=$APP_DIR/venv/bin"
-ExecStart=$APP_DIR/venv/bin/python3 monitor_selenium.py
+ExecStart=$APP_DIR/venv/bin/python3 worker_monitor.py
 Restart=always
-RestartSec=60
+RestartSec=10
 
 [Install]
 WantedBy=multi-user.target
@@ -82,6 +83,7 @@ echo "  sudo systemctl start monitor-resultados      # Iniciar servidor"
 echo "  sudo systemctl enable monitor-resultados     # Iniciar no boot"
 echo "  sudo systemctl status monitor-resultados     # Ver status"
 echo "  sudo systemctl restart monitor-resultados    # Reiniciar"
+echo "  sudo systemctl enable --now monitor-resultados-monitor  # Worker do monitor + bot"
 echo ""
 echo "🌐 Acesse: http://SEU_IP_VPS:5000"
 
@@ -1,27 +1,25 @@
 # Configuração Gunicorn para produção
 
+import os
+
 bind = "0.0.0.0:8000"
 workers = 2
-worker_class = "sync"
+# gthread: conexões longas (stream SSE /api/resultados/stream) ocupam uma thread, não o worker.
+# Cada worker aceita no máximo SSE_MAXIMO_CONEXOES streams (padrão: metade das threads);
+# os demais dashboards recebem 503 e voltam a consultar a API periodicamente
+worker_class = "gthread"
+threads = int(os.getenv('GUNICORN_THREADS', '32'))
 worker_connections = 1000
 timeout = 120
 keepalive = 5
 max_requests = 1000
 max_requests_jitter = 50
-preload_app = True
+# Sem preload: o app (e suas threads de fundo) é carregado em cada worker, nunca no master
+preload_app = False
 accesslog = "-"
 errorlog = "-"
 loglevel = "info"
 
-# Hooks para inicializar monitor automaticamente
-def on_starting(server):
-    """Executado quando Gunicorn inicia"""
-    import app_vps
-    app_vps.inicializar_monitor_automatico()
-
-def when_ready(server):
-    """Executado quando Gunicorn está pronto"""
-    import app_vps
-    # Garantir que monitor está rodando
-    if not app_vps.monitor_iniciado:
-        app_vps.inicializar_monitor_automatico()
+# Monitor, watchdog, atualizador PHP e bot de liquidação: cada worker se candidata ao
+# carregar o app_vps (lideranca.py) e só o líder os executa; se o líder morrer ou for
+# reciclado (max_requests), outro worker assume
@@ -1,18 +1,21 @@
 #!/bin/bash
 # Script para iniciar aplicação com monitor automático
+#
+# MONITOR_MODO=externo (padrão): monitor + bot rodam no worker_monitor.py, processo
+# separado do gunicorn (reiniciado se cair); a web só lê o banco.
+# MONITOR_MODO=interno: o processo líder entre os workers do gunicorn roda tudo.
 
-echo "🚀 Iniciando aplicação com monitor automático..."
+export MONITOR_MODO="${MONITOR_MODO:-externo}"
 
-# Iniciar monitor em background
-python3 monitor_selenium.py &
-MONITOR_PID=$!
+echo "🚀 Iniciando aplicação com monitor automático (modo: $MONITOR_MODO)..."
 
-# Aguardar um pouco para monitor iniciar
-sleep 5
+if [ "$MONITOR_MODO" = "externo" ]; then
+    # Worker dedicado em background, reiniciado se terminar
+    (while true; do python3 worker_monitor.py; sleep 5; done) &
+    
+    # Aguardar um pouco para o worker iniciar
+    sleep 5
+fi
 
-# Iniciar servidor Flask/Gunicorn
+# Iniciar servidor Flask/Gunicorn (exec: o container acaba junto com ele)
 exec gunicorn --bind 0.0.0.0:8000 --workers 2 --timeout 120 --config gunicorn_config.py app_vps:app
-
-# Quando servidor parar, parar monitor também
-kill $MONITOR_PID 2>/dev/null
-
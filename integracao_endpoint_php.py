@@ -86,12 +86,122 @@ def processar_resultados_via_php():
             'erro': str(e)
         }
 
+# ==================== CACHE / ATUALIZAÇÃO EM SEGUNDO PLANO ====================
+# A chamada ao PHP (até 300s, dispara busca e liquidação do lado do painel) roda só
+# no atualizador em segundo plano; os GETs servem a última resposta bem-sucedida.
+# Single-flight: chamadas concorrentes se juntam à execução em andamento em vez
+# de disparar outra.
+
+PHP_INTERVALO = int(os.getenv('PHP_INTERVALO', '300'))
+
+_cache_php = {
+    'resposta': None,        # última resposta com sucesso
+    'atualizado_em': None,   # quando essa resposta foi obtida (ISO)
+    'ultimo_erro': None,
+    'ultima_tentativa': None,
+    'duracao': None,         # segundos da última chamada
+}
+_voo_php = None              # threading.Event da chamada em andamento (ou None)
+_voo_php_lock = threading.Lock()
+_atualizador_php_thread = None
+_ao_atualizar = []           # funções chamadas com cada resposta bem-sucedida
+
+def registrar_ao_atualizar(funcao):
+    """Registra funcao(resultado) para cada resposta nova do PHP (ex: compartilhar com outros processos)"""
+    _ao_atualizar.append(funcao)
+
+def atualizar_cache_php(aguardar=True):
+    """
+    Chama o endpoint PHP e atualiza o cache. Se já houver uma chamada em andamento,
+    não dispara outra: espera por ela (aguardar=True) ou retorna na hora.
+    Retorna o resultado da chamada (ou o estado do cache, para quem se juntou).
+    """
+    global _voo_php
+    with _voo_php_lock:
+        voo = _voo_php
+        dono = voo is None
+        if dono:
+            voo = _voo_php = threading.Event()
+    if not dono:
+        if aguardar:
+            voo.wait()
+        return obter_resultados_php() or {'sucesso': False, 'erro': _cache_php['ultimo_erro'] or 'Processamento em andamento'}
+
+    inicio = time.time()
+    try:
+        resultado = processar_resultados_via_php()
+        _cache_php['ultima_tentativa'] = datetime.now().astimezone().isoformat()
+        _cache_php['duracao'] = round(time.time() - inicio, 1)
+        if resultado.get('sucesso'):
+            _cache_php['resposta'] = resultado
+            _cache_php['atualizado_em'] = _cache_php['ultima_tentativa']
+            _cache_php['ultimo_erro'] = None
+            for funcao in _ao_atualizar:
+                try:
+                    funcao(obter_resultados_php())
+                except Exception as e:
+                    print(f"⚠️  Erro ao repassar resultados do PHP: {e}")
+        else:
+            # Mantém a última resposta boa; só registra o erro
+            _cache_php['ultimo_erro'] = resultado.get('erro')
+        return resultado
+    finally:
+        with _voo_php_lock:
+            _voo_php = None
+        voo.set()
+
+def atualizar_cache_php_em_segundo_plano():
+    """Dispara atualizar_cache_php em uma thread (não bloqueia; no-op se já em andamento)"""
+    if _voo_php is None:
+        threading.Thread(target=atualizar_cache_php, kwargs={'aguardar': False}, daemon=True).start()
+
+def obter_resultados_php():
+    """Última resposta bem-sucedida do PHP (com 'atualizado_em') ou None"""
+    resposta = _cache_php['resposta']
+    if resposta is None:
+        return None
+    return dict(resposta, atualizado_em=_cache_php['atualizado_em'])
+
+def estado_cache_php():
+    """Estado do cache/atualizador (para endpoints de status)"""
+    return {
+        'endpoint_php': get_endpoint_php(),
+        'intervalo': PHP_INTERVALO,
+        'em_andamento': _voo_php is not None,
+        'atualizador_ativo': bool(_atualizador_php_thread and _atualizador_php_thread.is_alive()),
+        'tem_resposta': _cache_php['resposta'] is not None,
+        'atualizado_em': _cache_php['atualizado_em'],
+        'ultima_tentativa': _cache_php['ultima_tentativa'],
+        'ultimo_erro': _cache_php['ultimo_erro'],
+        'duracao': _cache_php['duracao'],
+    }
+
+def iniciar_atualizador_php(intervalo=None):
+    """Inicia a thread que atualiza o cache a cada `intervalo` segundos (padrão PHP_INTERVALO)"""
+    global _atualizador_php_thread
+    if _atualizador_php_thread and _atualizador_php_thread.is_alive():
+        return _atualizador_php_thread
+    intervalo = intervalo or PHP_INTERVALO
+    
+    def loop():
+        while True:
+            try:
+                atualizar_cache_php(aguardar=False)
+            except Exception as e:
+                print(f"❌ Erro no atualizador PHP: {e}")
+            time.sleep(intervalo)
+    
+    _atualizador_php_thread = threading.Thread(target=loop, daemon=True, name="AtualizadorPHP")
+    _atualizador_php_thread.start()
+    print(f"✅ Atualizador PHP iniciado (a cada {intervalo}s)")
+    return _atualizador_php_thread
+
 # ==================== ROTAS DA API ====================
 
 @app.route('/api/resultados/processar', methods=['POST'])
 def api_processar_resultados():
-    """Endpoint para processar resultados via PHP"""
-    resultado = processar_resultados_via_php()
+    """Endpoint para processar resultados via PHP (junta-se à execução em andamento, se houver)"""
+    resultado = atualizar_cache_php()
     
     if resultado['sucesso']:
         return jsonify(resultado)
@@ -100,20 +210,21 @@ def api_processar_resultados():
 
 @app.route('/api/resultados', methods=['GET'])
 def api_listar_resultados():
-    """Lista resultados (processa primeiro se necessário)"""
-    # Processar resultados antes de retornar
-    resultado = processar_resultados_via_php()
+    """Lista resultados (última resposta do PHP em cache, atualizada em segundo plano)"""
+    resultado = obter_resultados_php()
     
-    if resultado['sucesso']:
+    if resultado:
         return jsonify({
             'resultados': resultado['resultados'],
-            'summary': resultado['summary']
+            'summary': resultado['summary'],
+            'atualizado_em': resultado['atualizado_em']
         })
     else:
+        atualizar_cache_php_em_segundo_plano()
         return jsonify({
             'resultados': [],
-            'erro': resultado.get('erro')
-        }), 500
+            'erro': _cache_php['ultimo_erro'] or 'Resultados ainda não processados; tente novamente em instantes'
+        }), 503
 
 @app.route('/api/status', methods=['GET'])
 def api_status():
@@ -122,6 +233,7 @@ def api_status():
         'sistema': 'Integração com Endpoint PHP',
         'endpoint_php': get_endpoint_php(),
         'processamento_automatico': processamento_automatico_rodando,
+        'cache': estado_cache_php(),
         'timestamp': datetime.now().isoformat()
     })
 
@@ -132,7 +244,7 @@ processamento_automatico_rodando = False
 def processar_automaticamente():
     """Processa resultados automaticamente"""
     print(f"\n⏰ [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Processamento automático...")
-    processar_resultados_via_php()
+    atualizar_cache_php(aguardar=False)
 
 def iniciar_processamento_automatico(intervalo_minutos=5):
     """Inicia processamento automático"""
@@ -204,7 +316,7 @@ def index():
     <h2>Endpoints:</h2>
     <ul>
         <li>POST /api/resultados/processar - Processar resultados</li>
-        <li>GET /api/resultados - Listar resultados (processa antes)</li>
+        <li>GET /api/resultados - Listar resultados (último processamento, em cache)</li>
         <li>GET /api/status - Status do sistema</li>
         <li>POST /api/processamento/start - Iniciar processamento automático</li>
         <li>POST /api/processamento/stop - Parar processamento automático</li>
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Eleição de líder entre processos (workers do gunicorn)
+
+Só um processo por máquina roda as tarefas de fundo (monitor Selenium, watchdog,
+atualizador PHP, bot de liquidação); os demais só servem leituras.
+A liderança é um lock exclusivo (flock) em um arquivo: o sistema operacional o
+libera quando o processo líder morre, e o próximo candidato assume na sua próxima
+tentativa (a cada LIDER_INTERVALO segundos).
+
+O lock pertence à descrição de arquivo aberta pelo líder: processos filhos criados
+por fork (preload_app) herdam o descritor, mas não a liderança (verificação por pid).
+"""
+
+import os
+import time
+import logging
+import threading
+
+try:
+    import fcntl
+    FCNTL_DISPONIVEL = True
+except ImportError:
+    fcntl = None
+    FCNTL_DISPONIVEL = False
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_LIDER = os.getenv('LIDER_ARQUIVO', 'monitor_lider.lock')
+INTERVALO_LIDER = int(os.getenv('LIDER_INTERVALO', '10'))
+
+_arquivo = None       # arquivo com o lock (aberto pelo líder)
+_pid_lider = None     # pid do processo que obteve o lock
+_candidatura = None   # (pid, thread) da candidatura deste processo
+_lock = threading.Lock()
+
+def e_lider():
+    """True se este processo detém a liderança"""
+    return _arquivo is not None and _pid_lider == os.getpid()
+
+def tentar_lideranca():
+    """Tenta obter o lock sem bloquear. Retorna True se este processo é (ou virou) o líder."""
+    global _arquivo, _pid_lider
+    with _lock:
+        if e_lider():
+            return True
+        if not FCNTL_DISPONIVEL:
+            # Sem flock (ex: Windows): processo único, sempre líder
+            _arquivo, _pid_lider = True, os.getpid()
+            return True
+        arquivo = open(ARQUIVO_LIDER, 'a+')
+        try:
+            fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            arquivo.close()
+            return False
+        arquivo.seek(0)
+        arquivo.truncate()
+        arquivo.write(f"{os.getpid()}\n")
+        arquivo.flush()
+        _arquivo, _pid_lider = arquivo, os.getpid()
+        return True
+
+def pid_lider():
+    """Pid gravado pelo líder atual (ou None)"""
+    try:
+        with open(ARQUIVO_LIDER, 'r') as f:
+            return int(f.read().strip() or 0) or None
+    except (OSError, ValueError):
+        return None
+
+def iniciar_candidatura(ao_assumir):
+    """
+    Candidata este processo à liderança (idempotente por processo): tenta agora e,
+    se outro processo for o líder, continua tentando em segundo plano.
+    ao_assumir() é chamada uma vez, quando este processo assume.
+    """
+    global _candidatura
+    with _lock:
+        if _candidatura and _candidatura[0] == os.getpid() and _candidatura[1].is_alive():
+            return _candidatura[1]
+
+        def loop():
+            avisado = False
+            while not tentar_lideranca():
+                if not avisado:
+                    logger.info(f"⏸️  Processo {os.getpid()} em espera: líder é o processo {pid_lider()}")
+                    avisado = True
+                time.sleep(INTERVALO_LIDER)
+            logger.info(f"👑 Processo {os.getpid()} assumiu a liderança (tarefas de fundo)")
+            try:
+                ao_assumir()
+            except Exception as e:
+                logger.error(f"❌ Erro ao iniciar tarefas do líder: {e}", exc_info=True)
+
+        thread = threading.Thread(target=loop, daemon=True, name="CandidaturaLider")
+        _candidatura = (os.getpid(), thread)
+    thread.start()
+    return thread
+
+def estado_lideranca():
+    """Estado da eleição (para endpoints de status)"""
+    return {
+        'lider': e_lider(),
+        'pid': os.getpid(),
+        'pid_lider': os.getpid() if e_lider() else pid_lider(),
+        'arquivo': ARQUIVO_LIDER,
+    }
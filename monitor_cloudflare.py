@@ -16,6 +16,7 @@ try:
     import requests
     import json
     from monitor_selenium import verificar, carregar_resultados
+    import serializacao
 except ImportError as e:
     print(f"❌ Erro: {e}")
     sys.exit(1)
@@ -28,7 +29,7 @@ def enviar_para_cloudflare(dados):
     try:
         response = requests.post(
             CLOUDFLARE_WORKER_URL,
-            json=dados,
+            data=serializacao.dumps(dados),
             headers={'Content-Type': 'application/json'},
             timeout=10
         )
@@ -21,15 +21,15 @@ if user_site and os.path.exists(user_site):
 try:
     from selenium import webdriver
     from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.chrome.service import Service
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
     from selenium.common.exceptions import TimeoutException, WebDriverException
     from bs4 import BeautifulSoup
-    import json
     from datetime import datetime
     import time
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
     import hashlib
     import re
     try:
@@ -44,6 +44,15 @@ except ImportError as e:
     print("Execute: pip install selenium beautifulsoup4")
     sys.exit(1)
 
+from collections import OrderedDict
+import serializacao
+from banco_resultados import (
+    obter_banco, expandir_sorteios, gravar_arquivo_atomico, chave_dedup,
+    normalizar_horario, normalizar_loteria, normalizar_data
+)
+from visoes_resultados import atualizar_visoes
+from pool_navegadores import PoolNavegadores, obter_pool, pool_permitido, estado_pool
+
 # Configuração de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -150,235 +159,281 @@ def criar_driver():
         logger.info("   ou baixe de: https://chromedriver.chromium.org/")
         return None
 
-def extrair_resultados_selenium(driver, url, loteria_nome):
-    """Extrai resultados usando Selenium (para páginas com JavaScript)"""
+# Espera pelos resultados renderizados pelo JavaScript (condições no DOM, sem sleeps fixos)
+ESPERA_MAXIMA = float(os.getenv('MONITOR_ESPERA_MAXIMA', '20'))
+ESPERA_INTERVALO = float(os.getenv('MONITOR_ESPERA_INTERVALO', '0.25'))
+# Tempo que as tabelas precisam ficar iguais para a página ser considerada pronta;
+# mais longo se ainda houver "Aguardando Numeros" (pode ser um sorteio que não correu)
+ESPERA_ESTAVEL = float(os.getenv('MONITOR_ESPERA_ESTAVEL', '0.5'))
+ESPERA_ESTAVEL_AGUARDANDO = float(os.getenv('MONITOR_ESPERA_ESTAVEL_AGUARDANDO', '2'))
+# Linhas com número que uma tabela div_display_* precisa ter para contar como preenchida
+# (também o mínimo de posições de um sorteio para aceitar o HTML baixado por HTTP)
+LINHAS_MINIMAS = int(os.getenv('MONITOR_LINHAS_MINIMAS', '5'))
+
+# Resumo do DOM em uma única chamada ao navegador: linhas com número em cada tabela
+# div_display_*, resultados em h4 e se ainda há "Aguardando Numeros"
+_SCRIPT_ESTADO_RESULTADOS = """
+var linhas = [];
+document.querySelectorAll('div[id^="div_display_"] table').forEach(function (tabela) {
+    var n = 0;
+    tabela.querySelectorAll('tr').forEach(function (tr) {
+        var tds = tr.querySelectorAll('td');
+        if (tds.length >= 3 && /^\\d{3,4}$/.test(tds[2].innerText.trim())) { n++; }
+    });
+    linhas.push(n);
+});
+var h4 = 0;
+document.querySelectorAll('h4').forEach(function (el) {
+    if (/^\\d{4}\\s+\\S+$/.test(el.innerText.trim())) { h4++; }
+});
+var texto = document.body ? document.body.innerText : '';
+return [linhas, h4, texto.indexOf('Aguardando Numeros') >= 0];
+"""
+
+class ResultadosRenderizados:
+    """
+    Condição do WebDriverWait: a página tem resultados (tabela div_display_* com
+    LINHAS_MINIMAS linhas ou resultados em h4) e o resumo do DOM parou de mudar.
+    """
+
+    def __init__(self):
+        self._sinal = None
+        self._desde = None
+
+    def __call__(self, driver):
+        linhas, h4, aguardando = driver.execute_script(_SCRIPT_ESTADO_RESULTADOS)
+        if not (any(n >= LINHAS_MINIMAS for n in linhas) or h4):
+            self._sinal = None
+            return False
+        sinal = (tuple(linhas), h4, aguardando)
+        agora = time.monotonic()
+        if sinal != self._sinal:
+            self._sinal, self._desde = sinal, agora
+            return False
+        return agora - self._desde >= (ESPERA_ESTAVEL_AGUARDANDO if aguardando else ESPERA_ESTAVEL)
+
+def resultados_completos(resultados):
+    """
+    Critério de ResultadosRenderizados aplicado aos resultados do HTML baixado por HTTP:
+    algum sorteio (loteria + horário) com pelo menos LINHAS_MINIMAS posições. Menos que
+    isso é o esqueleto/placeholder da página, que o JavaScript ainda vai preencher.
+    """
+    por_sorteio = {}
+    for r in resultados:
+        chave = (r.get('loteria'), r.get('horario'))
+        por_sorteio[chave] = por_sorteio.get(chave, 0) + 1
+    return any(n >= LINHAS_MINIMAS for n in por_sorteio.values())
+
+# Tempos da última visita a cada URL (gravados no banco ao fim do ciclo)
+_metricas_paginas = {}
+_metricas_lock = threading.Lock()
+
+def _registrar_metrica_pagina(url, loteria_nome, inicio, carregado, pronto_em, pronto, resultados, fonte='selenium'):
+    """Guarda os tempos de uma visita: carregamento (driver.get/HTTP), espera pelo JS e total"""
+    with _metricas_lock:
+        _metricas_paginas[url] = {
+            'loteria': loteria_nome,
+            'fonte': fonte,
+            'carregamento_s': round(carregado - inicio, 3),
+            'espera_s': round(pronto_em - carregado, 3),
+            'total_s': round(time.monotonic() - inicio, 3),
+            'pronto': pronto,
+            'resultados': resultados,
+        }
+
+def extrair_resultados_html(html, url, loteria_nome, fallback=True):
+    """
+    Extrai os resultados do HTML de uma página por loteria (já renderizado pelo
+    navegador ou baixado direto por HTTP). fallback=False desliga a busca genérica
+    em outras tags quando não há tabelas/h4 (usado no caminho HTTP, em que a
+    página pode ter vindo sem os resultados do JavaScript).
+    """
     resultados = []
     
-    try:
-        logger.info(f"Carregando {url}...")
-        driver.get(url)
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Método 1: Extrair de tabelas (estrutura principal das páginas específicas)
+    # Procurar por divs com id="div_display_XX" que contêm tabelas com resultados
+    # Também procurar por divs com classes relacionadas a cards/tabelas
+    divs_display = soup.find_all('div', id=re.compile(r'div_display_\d+'))
+    
+    # Debug para Loteria Nacional
+    if "loteria-nacional" in url.lower():
+        log_debug_loteria_nacional(f"Encontrados {len(divs_display)} divs com id='div_display_XX'")
+        # Verificar se há tabelas na página
+        tabelas = soup.find_all('table')
+        log_debug_loteria_nacional(f"Encontradas {len(tabelas)} tabelas na página")
+        # Verificar estrutura HTML básica
+        h4_tags = soup.find_all('h4')
+        log_debug_loteria_nacional(f"Encontrados {len(h4_tags)} elementos h4")
+        # Verificar se há elementos com classe card
+        cards = soup.find_all(class_=re.compile(r'card', re.I))
+        log_debug_loteria_nacional(f"Encontrados {len(cards)} elementos com classe 'card'")
+    
+    # Se não encontrou divs_display, procurar por outras estruturas (para Loteria Nacional)
+    if not divs_display and "loteria-nacional" in url.lower():
+        log_debug_loteria_nacional(f"Tentando métodos alternativos de extração...")
+        # Procurar por divs com classes de card ou tabela
+        divs_display = soup.find_all('div', class_=re.compile(r'card|tabela|resultado|sorteio', re.I))
+        log_debug_loteria_nacional(f"Encontrados {len(divs_display)} divs com classes relacionadas")
+        # Também procurar por divs que contenham tabelas diretamente
+        if not divs_display:
+            divs_com_tabela = soup.find_all('div')
+            divs_display = [d for d in divs_com_tabela if d.find('table')]
+            log_debug_loteria_nacional(f"Encontrados {len(divs_display)} divs contendo tabelas")
+    
+    if "loteria-nacional" in url.lower() and not divs_display:
+        logger.warning(f"⚠️  Loteria Nacional: Nenhuma estrutura de resultados encontrada. Tentando extrair de h4 tags...")
+    
+    for div_display in divs_display:
+        # Buscar título com horário
+        titulo = div_display.find('h5', class_='card-title')
+        horario = None
+        if titulo:
+            texto_titulo = titulo.get_text(strip=True)
+            horario_match = re.search(r'(\d{1,2}[:h]\d{0,2})', texto_titulo)
+            if horario_match:
+                horario = horario_match.group(1)
         
-        # Log para debug - verificar se página carregou
-        if "loteria-nacional" in url.lower():
-            logger.debug(f"🔍 DEBUG Loteria Nacional: URL carregada, verificando estrutura...")
+        # Buscar tabela dentro do div
+        tabela = div_display.find('table')
+        if tabela:
+            linhas = tabela.find_all('tr')
+            posicao = 0
+            # Obter contexto do título para ajudar na identificação
+            texto_contexto = titulo.get_text(strip=True) if titulo else ""
+            for linha in linhas:
+                # Procurar células com número e animal
+                tds = linha.find_all('td')
+                if len(tds) >= 3:
+                    # TD 1 ou primeira célula: pode conter posição/colocação
+                    # TD 2: número (dentro de <a> ou <h5>)
+                    # TD 3: número do animal (dentro de <h5>)
+                    # TD 4: nome do animal (dentro de <h5>)
+                    numero_elem = tds[2].find('a') or tds[2].find('h5')
+                    animal_elem = tds[4].find('h5') if len(tds) > 4 else None
+                    
+                    if numero_elem and animal_elem:
+                        numero = numero_elem.get_text(strip=True)
+                        animal = animal_elem.get_text(strip=True)
+                        
+                        # Tentar extrair posição da primeira célula ou usar contador
+                        posicao_texto = tds[0].get_text(strip=True) if len(tds) > 0 else ""
+                        # Procurar número de posição (1, 2, 3, etc.) ou usar contador
+                        posicao_match = re.search(r'^(\d+)', posicao_texto)
+                        if posicao_match:
+                            posicao = int(posicao_match.group(1))
+                        else:
+                            posicao += 1
+                        
+                        # Validar se é um resultado válido (número de 3-4 dígitos e animal conhecido)
+                        if re.match(r'^\d{3,4}$', numero) and len(animal) > 2:
+                            # Separar PT Paraíba e Lotep baseado no horário
+                            loteria_final = separar_pt_paraiba_lotep(loteria_nome, horario, texto_contexto)
+                            estado = identificar_estado(loteria_final)
+                            resultados.append({
+                                'numero': numero,
+                                'animal': animal,
+                                'loteria': loteria_final,
+                                'estado': estado,
+                                'horario': horario,
+                                'posicao': posicao,
+                                'colocacao': f"{posicao}°",
+                                'texto_completo': f"{numero} {animal}",
+                                'timestamp': datetime.now(ZoneInfo('America/Sao_Paulo')).isoformat(),
+                                'data_extração': datetime.now(ZoneInfo('America/Sao_Paulo')).strftime('%d/%m/%Y'),
+                                'url_origem': url
+                            })
+    
+    # Método 2: Extrair de h4 tags (página principal ou fallback)
+    h4_tags = soup.find_all('h4')
+    if "loteria-nacional" in url.lower() and not resultados:
+        log_debug_loteria_nacional(f"Tentando extrair de {len(h4_tags)} elementos h4...")
+    # Posição contada por sorteio (loteria + horário): a página lista vários horários
+    posicoes_h4 = {}
+    for h4 in h4_tags:
+        texto = h4.get_text(strip=True)
+        match = re.search(r'^(\d{4})\s+([A-Za-záàâãéêíóôõúçÁÀÂÃÉÊÍÓÔÕÚÇ]+)$', texto)
         
-        # Aguardar conteúdo carregar (até 15 segundos)
-        try:
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            # Aguardar mais tempo para JavaScript carregar resultados
-            time.sleep(5)
+        if match:
+            numero = match.group(1)
+            animal = match.group(2).strip()
             
-            # Aguardar que o elemento "Aguardando Numeros..." mude (indica que resultados carregaram)
-            try:
-                WebDriverWait(driver, 20).until(
-                    lambda d: "Aguardando Numeros" not in d.page_source or 
-                              len(d.find_elements(By.CSS_SELECTOR, "h4, [class*='card'], [id*='horario'], [id*='div_display'], table")) > 0
-                )
-                # Aguardar mais para garantir que conteúdo foi renderizado
-                # Para Loteria Nacional, pode precisar de mais tempo para carregar múltiplos sorteios
-                if "loteria-nacional" in url.lower():
-                    time.sleep(10)  # Mais tempo para Loteria Nacional
-                else:
-                    time.sleep(5)
-            except TimeoutException:
-                logger.warning(f"Timeout aguardando resultados em {url}")
-                time.sleep(3)  # Aguardar um pouco mesmo com timeout
-        except TimeoutException:
-            logger.warning(f"Timeout ao carregar {url}")
-            return resultados
-        
-        # Obter HTML após JavaScript executar
-        html = driver.page_source
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Método 1: Extrair de tabelas (estrutura principal das páginas específicas)
-        # Procurar por divs com id="div_display_XX" que contêm tabelas com resultados
-        # Também procurar por divs com classes relacionadas a cards/tabelas
-        divs_display = soup.find_all('div', id=re.compile(r'div_display_\d+'))
-        
-        # Debug para Loteria Nacional
-        if "loteria-nacional" in url.lower():
-            log_debug_loteria_nacional(f"Encontrados {len(divs_display)} divs com id='div_display_XX'")
-            # Verificar se há tabelas na página
-            tabelas = soup.find_all('table')
-            log_debug_loteria_nacional(f"Encontradas {len(tabelas)} tabelas na página")
-            # Verificar estrutura HTML básica
-            h4_tags = soup.find_all('h4')
-            log_debug_loteria_nacional(f"Encontrados {len(h4_tags)} elementos h4")
-            # Verificar se há elementos com classe card
-            cards = soup.find_all(class_=re.compile(r'card', re.I))
-            log_debug_loteria_nacional(f"Encontrados {len(cards)} elementos com classe 'card'")
-        
-        # Se não encontrou divs_display, procurar por outras estruturas (para Loteria Nacional)
-        if not divs_display and "loteria-nacional" in url.lower():
-            log_debug_loteria_nacional(f"Tentando métodos alternativos de extração...")
-            # Procurar por divs com classes de card ou tabela
-            divs_display = soup.find_all('div', class_=re.compile(r'card|tabela|resultado|sorteio', re.I))
-            log_debug_loteria_nacional(f"Encontrados {len(divs_display)} divs com classes relacionadas")
-            # Também procurar por divs que contenham tabelas diretamente
-            if not divs_display:
-                divs_com_tabela = soup.find_all('div')
-                divs_display = [d for d in divs_com_tabela if d.find('table')]
-                log_debug_loteria_nacional(f"Encontrados {len(divs_display)} divs contendo tabelas")
-        
-        if "loteria-nacional" in url.lower() and not divs_display:
-            logger.warning(f"⚠️  Loteria Nacional: Nenhuma estrutura de resultados encontrada. Tentando extrair de h4 tags...")
-        
-        for div_display in divs_display:
-            # Buscar título com horário
-            titulo = div_display.find('h5', class_='card-title')
-            horario = None
-            if titulo:
-                texto_titulo = titulo.get_text(strip=True)
-                horario_match = re.search(r'(\d{1,2}[:h]\d{0,2})', texto_titulo)
-                if horario_match:
-                    horario = horario_match.group(1)
+            contexto = h4.find_parent()
+            texto_contexto = contexto.get_text(separator=' ', strip=True) if contexto else ""
             
-            # Buscar tabela dentro do div
-            tabela = div_display.find('table')
-            if tabela:
-                linhas = tabela.find_all('tr')
-                posicao = 0
-                # Obter contexto do título para ajudar na identificação
-                texto_contexto = titulo.get_text(strip=True) if titulo else ""
-                for linha in linhas:
-                    # Procurar células com número e animal
-                    tds = linha.find_all('td')
-                    if len(tds) >= 3:
-                        # TD 1 ou primeira célula: pode conter posição/colocação
-                        # TD 2: número (dentro de <a> ou <h5>)
-                        # TD 3: número do animal (dentro de <h5>)
-                        # TD 4: nome do animal (dentro de <h5>)
-                        numero_elem = tds[2].find('a') or tds[2].find('h5')
-                        animal_elem = tds[4].find('h5') if len(tds) > 4 else None
-                        
-                        if numero_elem and animal_elem:
-                            numero = numero_elem.get_text(strip=True)
-                            animal = animal_elem.get_text(strip=True)
-                            
-                            # Tentar extrair posição da primeira célula ou usar contador
-                            posicao_texto = tds[0].get_text(strip=True) if len(tds) > 0 else ""
-                            # Procurar número de posição (1, 2, 3, etc.) ou usar contador
-                            posicao_match = re.search(r'^(\d+)', posicao_texto)
-                            if posicao_match:
-                                posicao = int(posicao_match.group(1))
-                            else:
-                                posicao += 1
-                            
-                            # Validar se é um resultado válido (número de 3-4 dígitos e animal conhecido)
-                            if re.match(r'^\d{3,4}$', numero) and len(animal) > 2:
-                                # Separar PT Paraíba e Lotep baseado no horário
-                                loteria_final = separar_pt_paraiba_lotep(loteria_nome, horario, texto_contexto)
-                                estado = identificar_estado(loteria_final)
-                                resultados.append({
-                                    'numero': numero,
-                                    'animal': animal,
-                                    'loteria': loteria_final,
-                                    'estado': estado,
-                                    'horario': horario,
-                                    'posicao': posicao,
-                                    'colocacao': f"{posicao}°",
-                                    'texto_completo': f"{numero} {animal}",
-                                    'timestamp': datetime.now(ZoneInfo('America/Sao_Paulo')).isoformat(),
-                                    'data_extração': datetime.now(ZoneInfo('America/Sao_Paulo')).strftime('%d/%m/%Y'),
-                                    'url_origem': url
-                                })
-        
-        # Método 2: Extrair de h4 tags (página principal ou fallback)
-        h4_tags = soup.find_all('h4')
-        if "loteria-nacional" in url.lower() and not resultados:
-            log_debug_loteria_nacional(f"Tentando extrair de {len(h4_tags)} elementos h4...")
-        posicao_h4 = 0
-        for h4 in h4_tags:
-            texto = h4.get_text(strip=True)
-            match = re.search(r'^(\d{4})\s+([A-Za-záàâãéêíóôõúçÁÀÂÃÉÊÍÓÔÕÚÇ]+)$', texto)
+            horario_match = re.search(r'(\d{1,2}[:h]\d{0,2})', texto_contexto.lower())
+            horario = horario_match.group(1) if horario_match else None
+            
+            # Separar PT Paraíba e Lotep baseado no horário
+            loteria_final = separar_pt_paraiba_lotep(loteria_nome, horario, texto_contexto)
+            posicao_h4 = posicoes_h4[(loteria_final, horario)] = posicoes_h4.get((loteria_final, horario), 0) + 1
+            estado = identificar_estado(loteria_final)
+            resultados.append({
+                'numero': numero,
+                'animal': animal,
+                'loteria': loteria_final,
+                'estado': estado,
+                'horario': horario,
+                'posicao': posicao_h4,
+                'colocacao': f"{posicao_h4}°",
+                'texto_completo': texto,
+                'timestamp': datetime.now(ZoneInfo('America/Sao_Paulo')).isoformat(),
+                'data_extração': datetime.now(ZoneInfo('America/Sao_Paulo')).strftime('%d/%m/%Y'),
+                'url_origem': url
+            })
+    
+    # Remover duplicatas
+    resultados_unicos = []
+    vistos = set()
+    for r in resultados:
+        chave = (r['numero'], r['animal'], r.get('horario'))
+        if chave not in vistos:
+            vistos.add(chave)
+            resultados_unicos.append(r)
+    
+    resultados = resultados_unicos
+    
+    # Se não encontrou, procurar em outras tags (fallback)
+    if not resultados and fallback:
+        if "loteria-nacional" in url.lower():
+            log_debug_loteria_nacional(f"Tentando método fallback de extração...")
+        elementos = soup.find_all(['div', 'span', 'p', 'td', 'h1', 'h2', 'h3', 'h5', 'h6'])
+        posicao_fallback = 0
+        for elem in elementos:
+            texto = elem.get_text(separator=' ', strip=True)
+            match = re.search(r'(\d{4})\s+([A-Za-záàâãéêíóôõúçÁÀÂÃÉÊÍÓÔÕÚÇ]+)', texto)
             
             if match:
                 numero = match.group(1)
                 animal = match.group(2).strip()
                 
-                contexto = h4.find_parent()
-                texto_contexto = contexto.get_text(separator=' ', strip=True) if contexto else ""
-                
-                horario_match = re.search(r'(\d{1,2}[:h]\d{0,2})', texto_contexto.lower())
-                horario = horario_match.group(1) if horario_match else None
+                animais_validos = ['cavalo', 'burro', 'gato', 'macaco', 'elefante', 'cachorro', 
+                                  'avestruz', 'veado', 'porco', 'peru', 'jacaré', 'camelo', 'vaca',
+                                  'carneiro', 'tigre', 'leão', 'coelho', 'galo', 'pavão', 'pato']
                 
-                posicao_h4 += 1
-                # Separar PT Paraíba e Lotep baseado no horário
-                loteria_final = separar_pt_paraiba_lotep(loteria_nome, horario, texto_contexto)
-                estado = identificar_estado(loteria_final)
-                resultados.append({
-                    'numero': numero,
-                    'animal': animal,
-                    'loteria': loteria_final,
-                    'estado': estado,
-                    'horario': horario,
-                    'posicao': posicao_h4,
-                    'colocacao': f"{posicao_h4}°",
-                    'texto_completo': texto,
-                    'timestamp': datetime.now(ZoneInfo('America/Sao_Paulo')).isoformat(),
-                    'data_extração': datetime.now(ZoneInfo('America/Sao_Paulo')).strftime('%d/%m/%Y'),
-                    'url_origem': url
-                })
-        
-        # Remover duplicatas
-        resultados_unicos = []
-        vistos = set()
-        for r in resultados:
-            chave = (r['numero'], r['animal'], r.get('horario'))
-            if chave not in vistos:
-                vistos.add(chave)
-                resultados_unicos.append(r)
-        
-        resultados = resultados_unicos
-        
-        # Se não encontrou, procurar em outras tags (fallback)
-        if not resultados:
-            if "loteria-nacional" in url.lower():
-                log_debug_loteria_nacional(f"Tentando método fallback de extração...")
-            elementos = soup.find_all(['div', 'span', 'p', 'td', 'h1', 'h2', 'h3', 'h5', 'h6'])
-            posicao_fallback = 0
-            for elem in elementos:
-                texto = elem.get_text(separator=' ', strip=True)
-                match = re.search(r'(\d{4})\s+([A-Za-záàâãéêíóôõúçÁÀÂÃÉÊÍÓÔÕÚÇ]+)', texto)
-                
-                if match:
-                    numero = match.group(1)
-                    animal = match.group(2).strip()
+                if animal.lower() in animais_validos:
+                    horario_match = re.search(r'(\d{1,2}[:h]\d{0,2})', texto.lower())
+                    horario = horario_match.group(1) if horario_match else None
                     
-                    animais_validos = ['cavalo', 'burro', 'gato', 'macaco', 'elefante', 'cachorro', 
-                                      'avestruz', 'veado', 'porco', 'peru', 'jacaré', 'camelo', 'vaca',
-                                      'carneiro', 'tigre', 'leão', 'coelho', 'galo', 'pavão', 'pato']
-                    
-                    if animal.lower() in animais_validos:
-                        horario_match = re.search(r'(\d{1,2}[:h]\d{0,2})', texto.lower())
-                        horario = horario_match.group(1) if horario_match else None
-                        
-                        posicao_fallback += 1
-                        # Separar PT Paraíba e Lotep baseado no horário
-                        loteria_final = separar_pt_paraiba_lotep(loteria_nome, horario, texto)
-                        estado = identificar_estado(loteria_final)
-                        resultados.append({
-                            'numero': numero,
-                            'animal': animal,
-                            'loteria': loteria_final,
-                            'estado': estado,
-                            'horario': horario,
-                            'posicao': posicao_fallback,
-                            'colocacao': f"{posicao_fallback}°",
-                            'texto_completo': texto[:100],
-                            'timestamp': datetime.now(ZoneInfo('America/Sao_Paulo')).isoformat(),
-                            'data_extração': datetime.now(ZoneInfo('America/Sao_Paulo')).strftime('%d/%m/%Y'),
-                            'url_origem': url
-                        })
-                        break  # Encontrou um, pode parar
-        
-    except Exception as e:
-        logger.error(f"Erro ao extrair de {url}: {e}")
-        if "loteria-nacional" in url.lower():
-            logger.error(f"❌ Erro detalhado na Loteria Nacional: {e}", exc_info=True)
+                    posicao_fallback += 1
+                    # Separar PT Paraíba e Lotep baseado no horário
+                    loteria_final = separar_pt_paraiba_lotep(loteria_nome, horario, texto)
+                    estado = identificar_estado(loteria_final)
+                    resultados.append({
+                        'numero': numero,
+                        'animal': animal,
+                        'loteria': loteria_final,
+                        'estado': estado,
+                        'horario': horario,
+                        'posicao': posicao_fallback,
+                        'colocacao': f"{posicao_fallback}°",
+                        'texto_completo': texto[:100],
+                        'timestamp': datetime.now(ZoneInfo('America/Sao_Paulo')).isoformat(),
+                        'data_extração': datetime.now(ZoneInfo('America/Sao_Paulo')).strftime('%d/%m/%Y'),
+                        'url_origem': url
+                    })
+                    break  # Encontrou um, pode parar
     
     if "loteria-nacional" in url.lower():
         logger.info(f"📊 Loteria Nacional: Total de {len(resultados)} resultados extraídos de {url}")
@@ -398,74 +453,320 @@ def extrair_resultados_selenium(driver, url, loteria_nome):
     
     return resultados
 
-def extrair_resultados_principal():
-    """Extrai resultados da página principal (HTML estático)"""
-    import requests
-    
+def extrair_resultados_selenium(driver, url, loteria_nome):
+    """Extrai resultados usando Selenium (para páginas com JavaScript)"""
     resultados = []
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-    }
+    metrica = None
     
     try:
-        response = requests.get(URL_PRINCIPAL, headers=headers, timeout=15)
-        response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.text, 'html.parser')
+        logger.info(f"Carregando {url}...")
+        inicio = time.monotonic()
+        driver.get(url)
+        carregado = time.monotonic()
         
-        # Agrupar por loteria e horário para calcular posições
-        resultados_por_grupo = {}
+        # Log para debug - verificar se página carregou
+        if "loteria-nacional" in url.lower():
+            logger.debug(f"🔍 DEBUG Loteria Nacional: URL carregada, verificando estrutura...")
         
-        h4_tags = soup.find_all('h4')
-        for h4 in h4_tags:
-            texto = h4.get_text(strip=True)
-            match = re.search(r'^(\d{4})\s+([A-Za-záàâãéêíóôõúçÁÀÂÃÉÊÍÓÔÕÚÇ]+)$', texto)
-            
-            if match:
-                numero = match.group(1)
-                animal = match.group(2).strip()
-                
-                contexto = h4.find_parent()
-                texto_contexto = contexto.get_text(separator=' ', strip=True) if contexto else ""
-                
-                # Identificar loteria pelo contexto
-                loteria = identificar_loteria_por_contexto(texto_contexto)
-                
-                horario_match = re.search(r'(\d{1,2}[:h]\d{0,2})', texto_contexto.lower())
-                horario = horario_match.group(1) if horario_match else None
-                
-                # Chave para agrupar (loteria + horário)
-                chave_grupo = f"{loteria}_{horario}"
-                if chave_grupo not in resultados_por_grupo:
-                    resultados_por_grupo[chave_grupo] = []
-                
-                estado = identificar_estado(loteria)
-                resultados_por_grupo[chave_grupo].append({
-                    'numero': numero,
-                    'animal': animal,
-                    'loteria': loteria,
-                    'estado': estado,
-                    'horario': horario,
-                    'texto_completo': texto,
-                    'timestamp': datetime.now(ZoneInfo('America/Sao_Paulo')).isoformat(),
-                    'data_extração': datetime.now(ZoneInfo('America/Sao_Paulo')).strftime('%d/%m/%Y'),
-                    'url_origem': URL_PRINCIPAL
-                })
+        # Aguardar conteúdo carregar (até 15 segundos)
+        try:
+            WebDriverWait(driver, 15, poll_frequency=ESPERA_INTERVALO).until(
+                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            )
+        except TimeoutException:
+            logger.warning(f"Timeout ao carregar {url}")
+            _registrar_metrica_pagina(url, loteria_nome, inicio, carregado, time.monotonic(), False, 0)
+            return resultados
+        
+        # Aguardar o JavaScript preencher as tabelas: retorna assim que o DOM estabiliza
+        try:
+            WebDriverWait(driver, ESPERA_MAXIMA, poll_frequency=ESPERA_INTERVALO).until(ResultadosRenderizados())
+            pronto = True
+        except TimeoutException:
+            logger.warning(f"Timeout aguardando resultados em {url}")
+            pronto = False
+        metrica = (inicio, carregado, time.monotonic(), pronto)
+        
+        # Obter HTML após JavaScript executar (só analisado se os resultados mudaram)
+        html = driver.page_source
+        resultados = extrair_com_cache(
+            ('selenium', url), html, lambda html: extrair_resultados_html(html, url, loteria_nome)
+        )
         
-        # Adicionar posições e estados baseadas na ordem dentro de cada grupo
-        for chave, grupo_resultados in resultados_por_grupo.items():
-            for idx, resultado in enumerate(grupo_resultados, start=1):
-                resultado['posicao'] = idx
-                resultado['colocacao'] = f"{idx}°"
-                # Garantir que estado existe
-                if 'estado' not in resultado:
-                    resultado['estado'] = identificar_estado(resultado.get('loteria', ''))
-                resultados.append(resultado)
+    except Exception as e:
+        logger.error(f"Erro ao extrair de {url}: {e}")
+        if "loteria-nacional" in url.lower():
+            logger.error(f"❌ Erro detalhado na Loteria Nacional: {e}", exc_info=True)
+    
+    if metrica:
+        _registrar_metrica_pagina(url, loteria_nome, *metrica, len(resultados))
+    
+    return resultados
+
+# Caminho HTTP (sem navegador): as páginas por loteria são baixadas direto e só vão
+# para o Selenium se os resultados não vierem no HTML
+HTTP_TIMEOUT = float(os.getenv('MONITOR_HTTP_TIMEOUT', '15'))
+# Ciclos sem tentar o HTTP numa URL que precisou do Selenium (0: tenta sempre)
+HTTP_REPROVA_CICLOS = int(os.getenv('MONITOR_HTTP_REPROVA_CICLOS', '10'))
+HEADERS_HTTP = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+}
+
+_sessao_http = None
+_sessao_http_lock = threading.Lock()
+# URL -> ciclos que ainda vão direto para o Selenium
+_http_pular = {}
+
+def sessao_http():
+    """Sessão requests do processo: conexões keep-alive reaproveitadas entre páginas e ciclos"""
+    global _sessao_http
+    with _sessao_http_lock:
+        if _sessao_http is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            sessao = requests.Session()
+            sessao.headers.update(HEADERS_HTTP)
+            adaptador = HTTPAdapter(pool_connections=2, pool_maxsize=len(URLS_ESPECIFICAS) + 1)
+            sessao.mount('https://', adaptador)
+            sessao.mount('http://', adaptador)
+            _sessao_http = sessao
+        return _sessao_http
+
+# Páginas já analisadas: (fonte, url) -> hash do fragmento relevante, resultados extraídos
+# (com o dia da extração) e validadores HTTP (ETag/Last-Modified) da última resposta
+_paginas = {}
+_paginas_lock = threading.Lock()
+# Contadores acumulados (desde o início do processo) de páginas analisadas e puladas
+_contadores_pulo = {'analisadas': 0, 'nao_modificadas': 0, 'conteudo_igual': 0}
+
+# Partes do HTML de onde saem os resultados: tabelas, h4 (número + animal), h5 (horário)
+_REGEX_FRAGMENTO = re.compile(r'<(table|h4|h5)\b.*?</\1\s*>', re.S | re.I)
+
+def hash_fragmento(html):
+    """
+    Hash das tabelas/h4/h5 do HTML (o resto da página - scripts, anúncios - pode mudar
+    sem mudar os resultados), ou da página inteira se não houver nenhum. Inclui a data de
+    hoje: a data_extração dos resultados muda à meia-noite mesmo com a página igual.
+    """
+    h = hashlib.blake2b(datetime.now(ZoneInfo('America/Sao_Paulo')).strftime('%d/%m/%Y').encode(), digest_size=16)
+    encontrou = False
+    for fragmento in _REGEX_FRAGMENTO.finditer(html):
+        h.update(fragmento.group(0).encode('utf-8', 'surrogatepass'))
+        encontrou = True
+    if not encontrou:
+        h.update(html.encode('utf-8', 'surrogatepass'))
+    return h.hexdigest()
+
+def _contar_pulo(tipo):
+    with _paginas_lock:
+        _contadores_pulo[tipo] += 1
+
+def contadores_pulo():
+    """Cópia dos contadores acumulados de páginas analisadas/puladas"""
+    with _paginas_lock:
+        return dict(_contadores_pulo)
+
+def _copiar_resultados(resultados):
+    """Cópia rasa: quem recebe pode completar campos sem alterar o cache"""
+    return [dict(r) for r in resultados]
+
+def extrair_com_cache(chave, html, analisar):
+    """
+    Resultados de analisar(html), ou os da última análise de (chave) se o fragmento
+    relevante do HTML não mudou (sem BeautifulSoup)
+    """
+    hash_atual = hash_fragmento(html)
+    with _paginas_lock:
+        anterior = _paginas.get(chave)
+    if anterior and anterior.get('hash') == hash_atual:
+        _contar_pulo('conteudo_igual')
+        return _copiar_resultados(anterior['resultados'])
+    
+    resultados = analisar(html)
+    _contar_pulo('analisadas')
+    with _paginas_lock:
+        entrada = _paginas.setdefault(chave, {})
+        entrada['hash'] = hash_atual
+        entrada['resultados'] = _copiar_resultados(resultados)
+        entrada['dia'] = _hoje_iso()
+    return resultados
+
+def get_condicional(chave, url):
+    """
+    GET com If-None-Match/If-Modified-Since da última resposta de (chave).
+    Retorna (response, None), ou (None, resultados anteriores) se o servidor respondeu 304.
+    Só condicional para resultados extraídos hoje: depois da meia-noite a página é
+    analisada de novo, para os resultados levarem a data_extração do dia (como no hash).
+    """
+    with _paginas_lock:
+        anterior = dict(_paginas.get(chave) or {})
+    if anterior.get('dia') != _hoje_iso():
+        anterior.pop('resultados', None)
+    headers = {}
+    if 'resultados' in anterior:
+        if anterior.get('etag'):
+            headers['If-None-Match'] = anterior['etag']
+        if anterior.get('last_modified'):
+            headers['If-Modified-Since'] = anterior['last_modified']
+    
+    response = sessao_http().get(url, headers=headers, timeout=HTTP_TIMEOUT)
+    if response.status_code == 304 and 'resultados' in anterior:
+        _contar_pulo('nao_modificadas')
+        return None, _copiar_resultados(anterior['resultados'])
+    response.raise_for_status()
+    with _paginas_lock:
+        entrada = _paginas.setdefault(chave, {})
+        entrada['etag'] = response.headers.get('ETag')
+        entrada['last_modified'] = response.headers.get('Last-Modified')
+    return response, None
+
+def extrair_resultados_http(url, loteria_nome):
+    """
+    Extrai resultados baixando a página sem navegador; [] se os resultados não vêm no
+    HTML ou vêm incompletos (resultados_completos), para a URL ir ao Selenium
+    """
+    inicio = time.monotonic()
+    try:
+        response, resultados = get_condicional(('http', url), url)
+        carregado = time.monotonic()
+        if response is not None:
+            response.encoding = 'utf-8'
+            resultados = extrair_com_cache(
+                ('http', url), response.text,
+                lambda html: extrair_resultados_html(html, url, loteria_nome, fallback=False)
+            )
+    except Exception as e:
+        logger.warning(f"HTTP falhou em {url}: {e}")
+        return []
+    if resultados and not resultados_completos(resultados):
+        logger.info(f"  → {loteria_nome}: HTML com {len(resultados)} resultados incompletos, usando o navegador")
+        return []
+    if resultados:
+        _registrar_metrica_pagina(url, loteria_nome, inicio, carregado, carregado, True, len(resultados), fonte='http')
+        logger.info(f"  → {len(resultados)} resultados de {loteria_nome} via HTTP ({time.monotonic() - inicio:.1f}s)")
+    return resultados
+
+def extrair_urls_especificas(urls):
+    """
+    Extrai as páginas por loteria ({url: loteria_nome}): HTTP primeiro (em paralelo) e
+    Selenium só para as URLs em que o HTML não trouxe resultados.
+    Retorna {url: resultados} na ordem de urls.
+    """
+    por_url = {url: [] for url in urls}
+    
+    tentar_http = {}
+    for url, loteria_nome in urls.items():
+        if _http_pular.get(url, 0) > 0:
+            _http_pular[url] -= 1
+        else:
+            tentar_http[url] = loteria_nome
+    if tentar_http:
+        with ThreadPoolExecutor(max_workers=len(tentar_http), thread_name_prefix="HTTP") as executor:
+            futuros = {
+                url: executor.submit(extrair_resultados_http, url, loteria_nome)
+                for url, loteria_nome in tentar_http.items()
+            }
+            for url, futuro in futuros.items():
+                por_url[url] = futuro.result()
+                if not por_url[url]:
+                    _http_pular[url] = HTTP_REPROVA_CICLOS
+    
+    pendentes = {url: loteria_nome for url, loteria_nome in urls.items() if not por_url[url]}
+    if pendentes:
+        if pool_permitido():
+            # Processo do monitor: navegadores continuam abertos para o próximo ciclo
+            por_url.update(_extrair_selenium(obter_pool(criar_driver), pendentes, len(urls)))
+        else:
+            # Execução avulsa fora do líder: navegadores encerrados ao fim da chamada
+            with PoolNavegadores(criar_driver) as pool:
+                por_url.update(_extrair_selenium(pool, pendentes, len(urls)))
+    return por_url
+
+def _extrair_selenium(pool, pendentes, total):
+    """Extrai as URLs pendentes ({url: loteria_nome}) no pool (MONITOR_NAVEGADORES em paralelo)"""
+    logger.info(f"Selenium para {len(pendentes)} de {total} URLs ({pool.tamanho} navegadores)...")
+    por_url = pool.extrair(pendentes, extrair_resultados_selenium)
+    if not pool.drivers_criados:
+        logger.warning("⚠️  Selenium não disponível. URLs sem resultados no HTML não serão verificadas.")
+        logger.info("💡 Para verificar URLs específicas, instale ChromeDriver:")
+        logger.info("   brew install chromedriver")
+    return por_url
+
+def extrair_resultados_principal():
+    """
+    Extrai resultados da página principal (HTML estático). GET condicional e hash do
+    conteúdo: se a página não mudou desde o último ciclo, não é analisada de novo.
+    """
+    resultados = []
+    
+    try:
+        response, anteriores = get_condicional(('http', URL_PRINCIPAL), URL_PRINCIPAL)
+        if response is None:
+            return anteriores
+        response.encoding = 'utf-8'
+        resultados = extrair_com_cache(('http', URL_PRINCIPAL), response.text, analisar_pagina_principal)
     except Exception as e:
         logger.error(f"Erro ao extrair da página principal: {e}")
     
     return resultados
 
+def analisar_pagina_principal(html):
+    """Resultados (h4 'NNNN Animal') da página principal, com posição por loteria e horário"""
+    resultados = []
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Agrupar por loteria e horário para calcular posições
+    resultados_por_grupo = {}
+    
+    h4_tags = soup.find_all('h4')
+    for h4 in h4_tags:
+        texto = h4.get_text(strip=True)
+        match = re.search(r'^(\d{4})\s+([A-Za-záàâãéêíóôõúçÁÀÂÃÉÊÍÓÔÕÚÇ]+)$', texto)
+        
+        if match:
+            numero = match.group(1)
+            animal = match.group(2).strip()
+            
+            contexto = h4.find_parent()
+            texto_contexto = contexto.get_text(separator=' ', strip=True) if contexto else ""
+            
+            # Identificar loteria pelo contexto
+            loteria = identificar_loteria_por_contexto(texto_contexto)
+            
+            horario_match = re.search(r'(\d{1,2}[:h]\d{0,2})', texto_contexto.lower())
+            horario = horario_match.group(1) if horario_match else None
+            
+            # Chave para agrupar (loteria + horário)
+            chave_grupo = f"{loteria}_{horario}"
+            if chave_grupo not in resultados_por_grupo:
+                resultados_por_grupo[chave_grupo] = []
+            
+            estado = identificar_estado(loteria)
+            resultados_por_grupo[chave_grupo].append({
+                'numero': numero,
+                'animal': animal,
+                'loteria': loteria,
+                'estado': estado,
+                'horario': horario,
+                'texto_completo': texto,
+                'timestamp': datetime.now(ZoneInfo('America/Sao_Paulo')).isoformat(),
+                'data_extração': datetime.now(ZoneInfo('America/Sao_Paulo')).strftime('%d/%m/%Y'),
+                'url_origem': URL_PRINCIPAL
+            })
+    
+    # Adicionar posições e estados baseadas na ordem dentro de cada grupo
+    for chave, grupo_resultados in resultados_por_grupo.items():
+        for idx, resultado in enumerate(grupo_resultados, start=1):
+            resultado['posicao'] = idx
+            resultado['colocacao'] = f"{idx}°"
+            # Garantir que estado existe
+            if 'estado' not in resultado:
+                resultado['estado'] = identificar_estado(resultado.get('loteria', ''))
+            resultados.append(resultado)
+    
+    return resultados
+
 def separar_pt_paraiba_lotep(loteria_nome, horario, contexto=''):
     """
     Separa PT Paraíba e Lotep baseado no horário e contexto.
@@ -544,112 +845,205 @@ def identificar_loteria_por_contexto(texto):
     
     return "Desconhecida"
 
-def carregar_resultados(arquivo='resultados.json'):
-    """Carrega resultados salvos e adiciona posições se não existirem"""
-    if os.path.exists(arquivo):
-        try:
-            with open(arquivo, 'r', encoding='utf-8') as f:
-                dados = json.load(f)
-                # Adicionar posições e estados se não existirem
-                if 'resultados' in dados:
-                    # Sempre deduplicar primeiro
-                    dados['resultados'] = deduplicar_resultados_por_chave(dados['resultados'])
-                    # Verificar se algum resultado não tem posição ou estado
-                    precisa_atualizacao = any(
-                        'posicao' not in r or 'estado' not in r 
-                        for r in dados['resultados']
-                    )
-                    if precisa_atualizacao:
-                        dados['resultados'] = adicionar_posicoes(dados['resultados'])
-                        # Salvar com posições e estados
-                        salvar_resultados(dados, arquivo)
-                return dados
-        except:
-            return {'resultados': [], 'ultima_verificacao': None}
-    return {'resultados': [], 'ultima_verificacao': None}
+# Retenção: dias mais antigos que isso saem do banco para arquivos .jsonl.gz
+RETENCAO_DIAS = int(os.getenv('RESULTADOS_RETENCAO_DIAS', '30'))
+DIRETORIO_ARQUIVO = os.getenv('RESULTADOS_ARQUIVO_DIR', 'arquivo_resultados')
+# Quantas partições (dias) além de hoje ficam em memória
+MAX_PARTICOES_CACHE = int(os.getenv('RESULTADOS_PARTICOES_CACHE', '7'))
+
+# Cache em memória dos sorteios (por banco), validado pela geração do banco:
+# enquanto ninguém gravar, as chamadas seguintes não consultam a tabela inteira.
+# A visão plana (um resultado por posição) só é montada quando alguém a pede.
+_cache_resultados = {}
+_cache_resultados_lock = threading.Lock()
+
+def _banco(arquivo='resultados.json'):
+    """BancoResultados correspondente ao arquivo legado (resultados.json -> resultados.db)"""
+    if arquivo == 'resultados.json':
+        return obter_banco()
+    return obter_banco(os.path.splitext(arquivo)[0] + '.db')
+
+def _entrada_cache(banco, usar_cache=True):
+    """Entrada do cache para a geração atual do banco (relê os sorteios se mudou)"""
+    chave = os.path.abspath(banco.caminho)
+    geracao = banco.geracao()
+    with _cache_resultados_lock:
+        entrada = _cache_resultados.get(chave)
+    if usar_cache and entrada and entrada['geracao'] == geracao:
+        return entrada
+    
+    dados = banco.carregar_sorteios()
+    # Bases importadas sem estado: completar uma vez (a partir da loteria) e reler
+    if any(not sorteio['estado'] for sorteio in dados['sorteios']) and banco.completar_estados(identificar_estado):
+        return _entrada_cache(banco, usar_cache)
+    
+    entrada = {'geracao': geracao, 'sorteios': dados, 'resultados': None}
+    with _cache_resultados_lock:
+        _cache_resultados[chave] = entrada
+    return entrada
+
+def carregar_resultados(arquivo='resultados.json', usar_cache=True):
+    """
+    Carrega resultados do banco no formato legado (um resultado por posição).
+    
+    Camada de compatibilidade sobre banco_resultados: a lista plana é gerada a partir
+    dos sorteios em cache e só é refeita quando a geração do banco muda.
+    Os registros retornados são compartilhados com o cache: não devem ser alterados.
+    """
+    banco = _banco(arquivo)
+    entrada = _entrada_cache(banco, usar_cache)
+    resultados = entrada['resultados']
+    if resultados is None:
+        resultados = entrada['resultados'] = expandir_sorteios(entrada['sorteios']['sorteios'])
+    # ultima_verificacao muda a cada ciclo sem mudar a geração: sempre lida do banco
+    return {
+        'resultados': list(resultados),
+        'ultima_verificacao': banco.ultima_verificacao()
+    }
+
+def _completar_estados(resultados):
+    """Preenche o estado dos resultados que não o têm (a partir da loteria)"""
+    for resultado in resultados:
+        if not resultado.get('estado'):
+            resultado['estado'] = identificar_estado(resultado.get('loteria', ''))
+    return resultados
 
 def salvar_resultados(dados, arquivo='resultados.json'):
-    """Salva resultados"""
+    """
+    Substitui todos os resultados do banco pelos dados informados (formato legado).
+    Retorna True se gravou, False se a escrita falhou.
+    """
     try:
-        with open(arquivo, 'w', encoding='utf-8') as f:
-            json.dump(dados, f, ensure_ascii=False, indent=2)
+        _completar_estados(dados.get('resultados', []))
+        _banco(arquivo).substituir(dados)
+        return True
     except Exception as e:
         logger.error(f"Erro ao salvar: {e}")
+        return False
 
-def gerar_id(resultado):
-    """Gera ID único para resultado"""
-    chave = f"{resultado['loteria']}_{resultado['numero']}_{resultado['animal']}"
-    return hashlib.md5(chave.encode()).hexdigest()
+def registrar_resultados(resultados, ultima_verificacao=None, arquivo='resultados.json'):
+    """
+    Registra no banco os resultados do ciclo (uma transação). O índice de deduplicação
+    descarta os que já existem e cada novo número entra na próxima posição do sorteio
+    do dia, então o custo é proporcional ao lote, não ao histórico.
+    Retorna a lista de resultados efetivamente inseridos.
+    """
+    try:
+        retorno = _banco(arquivo).inserir(
+            _completar_estados(resultados),
+            ultima_verificacao or datetime.now(ZoneInfo('America/Sao_Paulo')).isoformat()
+        )
+        return retorno['inseridos']
+    except Exception as e:
+        logger.error(f"Erro ao registrar resultados: {e}")
+        return []
 
-def adicionar_posicoes(resultados):
-    """Adiciona posições/colocações e estados aos resultados baseado na ordem dentro de cada grupo (loteria + horário)"""
-    # Agrupar por loteria normalizada e horário normalizado
-    grupos = {}
-    for resultado in resultados:
-        loteria_norm = normalizar_loteria(resultado.get('loteria', ''))
-        horario_norm = normalizar_horario(resultado.get('horario', ''))
-        chave = f"{loteria_norm}_{horario_norm}"
-        if chave not in grupos:
-            grupos[chave] = []
-        grupos[chave].append(resultado)
-    
-    # Adicionar posições e estados dentro de cada grupo
-    resultados_com_posicao = []
-    for chave, grupo in grupos.items():
-        # Ordenar por timestamp ou manter ordem original
-        for idx, resultado in enumerate(grupo, start=1):
-            resultado['posicao'] = idx
-            resultado['colocacao'] = f"{idx}°"
-            # Adicionar estado se não existir
-            if 'estado' not in resultado:
-                resultado['estado'] = identificar_estado(resultado.get('loteria', ''))
-            resultados_com_posicao.append(resultado)
+def deduplicar_base(arquivo='resultados.json'):
+    """
+    Manutenção: deduplica a base inteira, reagrupa os sorteios e reconstrói o índice
+    de deduplicação (ex: depois de mudar regras de normalização). Retorna quantos
+    resultados foram removidos, ou None se a base não pôde ser gravada.
+    """
+    banco = _banco(arquivo)
+    dados = banco.carregar()
+    total_antes = len(dados['resultados'])
+    dados['resultados'] = deduplicar_resultados_por_chave(dados['resultados'])
+    if not salvar_resultados(dados, arquivo):
+        logger.error("❌ Deduplicação da base não gravada: o banco continua como estava")
+        return None
+    removidos = total_antes - banco.total()
+    logger.info(f"🧹 Deduplicação completa da base: {removidos} resultados removidos")
+    return removidos
+
+# Cache de partições (um dia por entrada), validado pela geração de cada partição.
+# A partição de hoje nunca é descartada; as demais são carregadas sob demanda (LRU).
+_cache_particoes = OrderedDict()
+
+def _hoje_iso():
+    return datetime.now(ZoneInfo('America/Sao_Paulo')).strftime('%Y-%m-%d')
+
+def carregar_resultados_data(data, arquivo='resultados.json'):
+    """
+    Resultados de um único dia (DD/MM/YYYY, DD-MM-YYYY ou YYYY-MM-DD), lendo apenas
+    essa partição do banco (ou do arquivo compactado, se já foi arquivada).
+    Os registros retornados são compartilhados com o cache: não devem ser alterados.
+    """
+    data_iso = normalizar_data(data)
+    if not data_iso:
+        return []
+    banco = _banco(arquivo)
+    particao = banco.particao(data_iso)
+    if particao is None:
+        return []
+    
+    chave = (os.path.abspath(banco.caminho), data_iso)
+    with _cache_resultados_lock:
+        entrada = _cache_particoes.get(chave)
+        if entrada and entrada['geracao'] == particao['geracao']:
+            _cache_particoes.move_to_end(chave)
+            return list(entrada['resultados'])
     
-    return resultados_com_posicao
+    resultados = banco.listar_particao(data_iso)
+    hoje = _hoje_iso()
+    with _cache_resultados_lock:
+        _cache_particoes[chave] = {'geracao': particao['geracao'], 'resultados': resultados}
+        _cache_particoes.move_to_end(chave)
+        antigas = [c for c in _cache_particoes if c[1] != hoje]
+        while len(antigas) > MAX_PARTICOES_CACHE:
+            _cache_particoes.pop(antigas.pop(0), None)
+    return list(resultados)
 
-def normalizar_horario(horario):
-    """Normaliza formato de horário para comparação"""
-    if not horario:
-        return None
-    # Remover espaços e converter para minúsculas
-    horario = str(horario).strip().lower()
-    # Remover 'h' e ':' para normalizar "09:30", "9:30", "09h30", "9h30" -> "0930"
-    horario = horario.replace('h', '').replace(':', '').replace(' ', '')
-    # Garantir formato HHMM (adicionar zero à esquerda se necessário)
-    if len(horario) == 3:
-        horario = '0' + horario
-    return horario if len(horario) == 4 else None
-
-def normalizar_loteria(loteria):
-    """Normaliza nome da loteria para comparação"""
-    if not loteria:
-        return ''
-    loteria = str(loteria).strip().upper()
-    # Normalizar variações comuns - fazer antes de outras transformações
-    # Substituir variações de PT Rio de Janeiro
-    if 'RIO DE JANEIRO' in loteria or 'RIO' in loteria:
-        if 'PT' in loteria or 'PPT' in loteria or 'PTM' in loteria or 'PTV' in loteria:
-            return 'PT-RJ'
-    # Outras normalizações
-    loteria = loteria.replace('PT-RIO', 'PT-RJ')
-    loteria = loteria.replace('PPT-RJ', 'PT-RJ')  # PPT-RJ é variação de PT-RJ
-    loteria = loteria.replace('PTM-RJ', 'PT-RJ')
-    loteria = loteria.replace('PTV-RJ', 'PT-RJ')
-    return loteria
+def carregar_resultados_estado(estado, data=None, arquivo='resultados.json'):
+    """
+    Resultados de um estado (e, opcionalmente, de um dia) pelo índice (estado, data)
+    do banco: o custo é proporcional à resposta, não ao histórico.
+    """
+    banco = _banco(arquivo)
+    if data:
+        data_iso = normalizar_data(data)
+        return banco.listar_particao(data_iso, estado=estado) if data_iso else []
+    return banco.listar(estado=estado)
+
+def arquivar_resultados_antigos(arquivo='resultados.json', retencao_dias=None):
+    """
+    Arquiva (jsonl.gz) as partições mais antigas que a retenção configurada.
+    Roda no máximo uma vez por dia; retorna quantos dias foram arquivados.
+    """
+    from datetime import timedelta
+    
+    retencao_dias = RETENCAO_DIAS if retencao_dias is None else retencao_dias
+    if retencao_dias <= 0:
+        return 0
+    banco = _banco(arquivo)
+    hoje = _hoje_iso()
+    if banco.ler_meta('ultimo_arquivamento') == hoje:
+        return 0
+    limite = (datetime.now(ZoneInfo('America/Sao_Paulo')) - timedelta(days=retencao_dias)).strftime('%Y-%m-%d')
+    try:
+        arquivados = banco.arquivar_particoes(limite, DIRETORIO_ARQUIVO)
+        banco.gravar_meta('ultimo_arquivamento', hoje)
+    except Exception as e:
+        logger.error(f"Erro ao arquivar partições antigas: {e}")
+        return 0
+    if arquivados:
+        logger.info(f"🗄️  {arquivados} dias anteriores a {limite} arquivados em {DIRETORIO_ARQUIVO}")
+    return arquivados
+
+def buscar_resultados(loteria=None, horario=None, data=None, estado=None, arquivo='resultados.json'):
+    """Consulta indexada no banco (ex: loteria='PT Rio', horario='14:20', data='18/10/2026')"""
+    return _banco(arquivo).listar(loteria=loteria, horario=horario, data=data, estado=estado)
 
 def deduplicar_resultados_por_chave(resultados):
-    """Remove resultados duplicados baseado em (loteria normalizada, horario normalizado, numero)"""
+    """
+    Remove resultados duplicados do mesmo sorteio: chave do banco (loteria normalizada,
+    horário normalizado, dia, número). O mesmo número em dias diferentes não é duplicata.
+    """
     total_antes = len(resultados)
     unicos = {}
     duplicados_removidos = 0
     
     for r in resultados:
-        loteria_norm = normalizar_loteria(r.get('loteria', ''))
-        horario_norm = normalizar_horario(r.get('horario', ''))
-        numero = str(r.get('numero', '')).strip()
-        
-        # Criar chave única
-        chave = (loteria_norm, horario_norm, numero)
+        chave = chave_dedup(r)
         
         # Se já existe, manter o primeiro (ou o que tem mais informações)
         if chave not in unicos:
@@ -672,69 +1066,112 @@ def deduplicar_resultados_por_chave(resultados):
 def verificar():
     """Faz verificação em todas as URLs"""
     logger.info(f"Verificando {len(URLS_ESPECIFICAS)} URLs específicas + página principal...")
+    inicio_ciclo = time.monotonic()
+    pulos_inicio = contadores_pulo()
+    with _metricas_lock:
+        _metricas_paginas.clear()
     
-    dados_anteriores = carregar_resultados()
-    # Deduplicar base anterior para evitar acúmulo entre execuções
-    if 'resultados' in dados_anteriores:
-        dados_anteriores['resultados'] = deduplicar_resultados_por_chave(dados_anteriores['resultados'])
-        dados_anteriores['resultados'] = adicionar_posicoes(dados_anteriores['resultados'])
-        salvar_resultados(dados_anteriores)
-    ids_anteriores = {gerar_id(r) for r in dados_anteriores.get('resultados', [])}
+    # Tirar do banco os dias fora da retenção (no máximo uma vez por dia)
+    arquivar_resultados_antigos()
     
     todos_resultados = []
     
     # 1. Extrair da página principal (rápido)
     logger.info("Verificando página principal...")
+    inicio_principal = time.monotonic()
     resultados_principal = extrair_resultados_principal()
+    principal_s = time.monotonic() - inicio_principal
     logger.info(f"  → {len(resultados_principal)} resultados da página principal")
     todos_resultados.extend(resultados_principal)
     
-    # 2. Extrair das URLs específicas (com Selenium)
-    driver = criar_driver()
-    if driver:
-        try:
-            for url, loteria_nome in URLS_ESPECIFICAS.items():
-                logger.info(f"Verificando: {url}")
-                resultados = extrair_resultados_selenium(driver, url, loteria_nome)
-                logger.info(f"  → {len(resultados)} resultados")
-                todos_resultados.extend(resultados)
-        finally:
-            driver.quit()
-    else:
-        logger.warning("⚠️  Selenium não disponível. Apenas página principal será verificada.")
-        logger.info("💡 Para verificar URLs específicas, instale ChromeDriver:")
-        logger.info("   brew install chromedriver")
+    # 2. Extrair das URLs específicas (HTTP direto; Selenium só onde o HTML vem sem resultados)
+    inicio_especificas = time.monotonic()
+    por_url = extrair_urls_especificas(URLS_ESPECIFICAS)
+    especificas_s = time.monotonic() - inicio_especificas
+    # Mesclados na ordem de URLS_ESPECIFICAS, como no ciclo sequencial: a deduplicação
+    # não depende de qual navegador terminou primeiro
+    for resultados in por_url.values():
+        todos_resultados.extend(resultados)
     
     # Remover duplicados entre fontes (mesma loteria, horário e número)
     todos_resultados = deduplicar_resultados_por_chave(todos_resultados)
     
-    # Adicionar posições aos resultados
-    todos_resultados = adicionar_posicoes(todos_resultados)
-    
-    # Detectar novos resultados
-    novos = [r for r in todos_resultados if gerar_id(r) not in ids_anteriores]
-    
-    if novos:
-        logger.info(f"✓ {len(novos)} novos resultados encontrados!")
-        dados_anteriores['resultados'].extend(novos)
-        # Deduplicar antes de adicionar posições
-        dados_anteriores['resultados'] = deduplicar_resultados_por_chave(dados_anteriores['resultados'])
-        # Re-adicionar posições a todos os resultados (incluindo antigos)
-        dados_anteriores['resultados'] = adicionar_posicoes(dados_anteriores['resultados'])
-        dados_anteriores['ultima_verificacao'] = datetime.now(ZoneInfo('America/Sao_Paulo')).isoformat()
-        dados_anteriores['total_resultados'] = len(dados_anteriores['resultados'])
-        salvar_resultados(dados_anteriores)
+    agora = datetime.now(ZoneInfo('America/Sao_Paulo')).isoformat()
+    
+    # Registrar o lote: o índice persistente insere apenas os novos (com a próxima
+    # posição de cada grupo tocado) e substitui versões menos completas dos existentes
+    inseridos = registrar_resultados(todos_resultados, agora)
+    if inseridos:
+        logger.info(f"✓ {len(inseridos)} novos resultados encontrados!")
+    
+    # Uma única publicação do resultados.json por ciclo (e só se a geração mudou)
+    publicar_resultados_json()
+    
+    # Visões materializadas (ex: /api/resultados/organizados) montadas uma vez por ciclo
+    try:
+        atualizar_visoes(_banco())
+    except Exception as e:
+        logger.error(f"Erro ao atualizar visões: {e}")
+    
+    if inseridos:
         # Sincronizar com Cloudflare
         sincronizar_cloudflare()
-        return len(novos)
     
-    # Atualizar posições mesmo se não houver novos resultados
-    # Deduplicar antes de adicionar posições
-    dados_anteriores['resultados'] = deduplicar_resultados_por_chave(dados_anteriores['resultados'])
-    dados_anteriores['resultados'] = adicionar_posicoes(dados_anteriores['resultados'])
-    dados_anteriores['ultima_verificacao'] = datetime.now(ZoneInfo('America/Sao_Paulo')).isoformat()
-    salvar_resultados(dados_anteriores)
-    return 0
+    gravar_metricas_ciclo(time.monotonic() - inicio_ciclo, principal_s, especificas_s, estado_pool(),
+                          pulos_inicio)
+    return len(inseridos)
+
+def _taxas_pulo(contadores):
+    """Contadores de páginas analisadas/puladas com a taxa de pulo (fração não analisada)"""
+    total = sum(contadores.values())
+    puladas = contadores['nao_modificadas'] + contadores['conteudo_igual']
+    return {**contadores, 'total': total, 'taxa_pulo': round(puladas / total, 3) if total else None}
+
+def gravar_metricas_ciclo(ciclo_s, principal_s, especificas_s, navegadores, pulos_inicio):
+    """
+    Grava no banco (meta 'metricas_monitor') os tempos do ciclo e de cada página, para
+    o /api/monitor/health do servidor web (que pode estar em outro processo)
+    """
+    with _metricas_lock:
+        paginas = {url: dict(metrica) for url, metrica in _metricas_paginas.items()}
+    esperas = [m['espera_s'] for m in paginas.values() if m['pronto'] and m['fonte'] == 'selenium']
+    metricas = {
+        'ciclo_s': round(ciclo_s, 3),
+        'principal_s': round(principal_s, 3),
+        'especificas_s': round(especificas_s, 3),
+        'paginas_http': sum(1 for m in paginas.values() if m['fonte'] == 'http'),
+        'paginas_selenium': sum(1 for m in paginas.values() if m['fonte'] == 'selenium'),
+        'espera_media_s': round(sum(esperas) / len(esperas), 3) if esperas else None,
+        'espera_maxima_s': max(esperas) if esperas else None,
+        'paginas_sem_resultados_prontos': sorted(m['loteria'] for m in paginas.values() if not m['pronto']),
+        'paginas': paginas,
+        'navegadores': navegadores,
+        # Páginas não analisadas: 304 do servidor ou fragmento com o mesmo hash
+        'pulos': _taxas_pulo({k: v - pulos_inicio[k] for k, v in contadores_pulo().items()}),
+        'pulos_total': _taxas_pulo(contadores_pulo()),
+        'atualizado_em': datetime.now(ZoneInfo('America/Sao_Paulo')).isoformat(),
+    }
+    try:
+        _banco().gravar_meta('metricas_monitor', serializacao.dumps_str(metricas))
+    except Exception as e:
+        logger.error(f"Erro ao gravar métricas do monitor: {e}")
+    logger.info(f"⏱️  Ciclo em {ciclo_s:.1f}s (páginas por loteria {especificas_s:.1f}s: "
+                f"{metricas['paginas_http']} via HTTP, {metricas['paginas_selenium']} via Selenium)")
+
+def publicar_resultados_json(arquivo='resultados.json'):
+    """
+    Publica o snapshot resultados.json (com a geração do banco) de forma atômica,
+    apenas quando a geração mudou desde a última publicação.
+    Retorna a geração publicada ou None se nada mudou.
+    """
+    try:
+        geracao = _banco().publicar_snapshot(arquivo)
+    except Exception as e:
+        logger.error(f"Erro ao publicar {arquivo}: {e}")
+        return None
+    if geracao is not None:
+        logger.info(f"💾 {arquivo} publicado (geração {geracao})")
+    return geracao
 
 def sincronizar_cloudflare():
     """Sincroniza resultados.json com Cloudflare via Git"""
@@ -754,11 +1191,14 @@ def sincronizar_cloudflare():
             # Está em repositório Git
             logger.info("📤 Sincronizando com Cloudflare via Git...")
             
-            # Copiar para deploy/
+            # Garantir o snapshot resultados.json da geração atual (sem reserializar se já publicado)
+            publicar_resultados_json('resultados.json')
+            
+            # Copiar para deploy/ (substituição atômica)
             deploy_dir = os.path.join(os.path.dirname(__file__), 'deploy')
             if os.path.exists(deploy_dir):
-                import shutil
-                shutil.copy('resultados.json', os.path.join(deploy_dir, 'resultados.json'))
+                with open('resultados.json', 'rb') as f:
+                    gravar_arquivo_atomico(os.path.join(deploy_dir, 'resultados.json'), f.read())
             
             # Adicionar e commitar
             subprocess.run(['git', 'add', 'resultados.json'], check=False, cwd=os.path.dirname(__file__))
@@ -800,9 +1240,13 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--intervalo', type=int, default=60)
     parser.add_argument('--uma-vez', action='store_true')
+    parser.add_argument('--deduplicar', action='store_true', help='Deduplicar toda a base (manutenção) e sair')
     args = parser.parse_args()
     
-    if args.uma_vez:
+    if args.deduplicar:
+        if deduplicar_base() is None:
+            sys.exit(1)
+    elif args.uma_vez:
         verificar()
     else:
         logger.info(f"Monitor iniciado (verifica a cada {args.intervalo}s)")
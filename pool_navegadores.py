@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pool de navegadores (Selenium) para extrair as URLs específicas em paralelo
+
+Cada thread do pool usa o seu próprio driver do Chrome (um driver do Selenium não
+pode ser usado por duas threads ao mesmo tempo). Com MONITOR_NAVEGADORES drivers,
+o ciclo do monitor leva o tempo das páginas mais lentas, não a soma de todas.
+
+Os drivers vivem entre ciclos (obter_pool): abrir o Chrome custa segundos a cada
+ciclo. Só o processo que roda o monitor (o líder: worker_monitor.py ou o líder entre
+os workers web) mantém esse pool; os demais usam um pool descartável por chamada.
+
+Antes de cada URL o driver passa por uma verificação rápida (comando ao navegador);
+é reciclado (encerrado e recriado) se falhar, depois de MONITOR_PAGINAS_POR_DRIVER
+páginas ou se o Chrome passar de MONITOR_RSS_MAX_MB, para que vazamentos de memória
+do navegador não se acumulem.
+
+Cada URL tem um prazo (MONITOR_TIMEOUT_URL): se estourar, o driver é encerrado
+(o que destrava a chamada presa do Selenium), a URL volta sem resultados e a
+thread cria um driver novo na próxima URL.
+"""
+
+import os
+import time
+import atexit
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from lideranca import e_lider
+
+logger = logging.getLogger(__name__)
+
+# Navegadores simultâneos (cada Chrome headless custa ~100-300 MB)
+NAVEGADORES = int(os.getenv('MONITOR_NAVEGADORES', '3'))
+# Prazo máximo de uma URL (carregamento + espera pelo JavaScript + extração)
+TIMEOUT_URL = int(os.getenv('MONITOR_TIMEOUT_URL', '90'))
+# Reciclagem: páginas por driver e memória máxima (chromedriver + Chrome), 0 desliga
+PAGINAS_POR_DRIVER = int(os.getenv('MONITOR_PAGINAS_POR_DRIVER', '200'))
+RSS_MAX_MB = int(os.getenv('MONITOR_RSS_MAX_MB', '800'))
+
+def _filhos(pid):
+    """Pids dos processos filhos (Linux, /proc); [] se indisponível"""
+    filhos = []
+    try:
+        for tarefa in os.listdir(f'/proc/{pid}/task'):
+            with open(f'/proc/{pid}/task/{tarefa}/children') as f:
+                filhos.extend(int(p) for p in f.read().split())
+    except (OSError, ValueError):
+        pass
+    return filhos
+
+def rss_mb(pid):
+    """Memória residente (MB) do processo e de todos os seus descendentes, ou None sem /proc"""
+    total = 0
+    encontrou = False
+    pendentes = [pid]
+    while pendentes:
+        atual = pendentes.pop()
+        try:
+            with open(f'/proc/{atual}/status') as f:
+                for linha in f:
+                    if linha.startswith('VmRSS:'):
+                        total += int(linha.split()[1])
+                        encontrou = True
+                        break
+        except (OSError, ValueError):
+            continue
+        pendentes.extend(_filhos(atual))
+    return total / 1024 if encontrou else None
+
+def _pid_driver(driver):
+    """Pid do chromedriver (o Chrome roda como seu descendente)"""
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+class PoolNavegadores:
+    """
+    Pool de drivers do Selenium. Uso no processo líder (drivers mantidos entre ciclos):
+
+        por_url = obter_pool(criar_driver).extrair(URLS_ESPECIFICAS, extrair_resultados_selenium)
+
+    Nos demais processos, descartável: with PoolNavegadores(criar_driver) as pool: ...
+    """
+
+    def __init__(self, criar_driver, tamanho=None, timeout_url=None,
+                 paginas_por_driver=None, rss_max_mb=None):
+        self.criar_driver = criar_driver
+        self.tamanho = max(1, tamanho or NAVEGADORES)
+        self.timeout_url = timeout_url or TIMEOUT_URL
+        self.paginas_por_driver = PAGINAS_POR_DRIVER if paginas_por_driver is None else paginas_por_driver
+        self.rss_max_mb = RSS_MAX_MB if rss_max_mb is None else rss_max_mb
+        self.drivers_criados = 0
+        self.drivers_reciclados = 0
+        self._local = threading.local()
+        self._drivers = {}    # driver -> páginas carregadas
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.tamanho, thread_name_prefix="Navegador")
+
+    # ---------------- drivers ----------------
+
+    def _motivo_reciclar(self, driver):
+        """Por que o driver deve ser trocado antes da próxima página (None se está bom)"""
+        with self._lock:
+            paginas = self._drivers.get(driver)
+        if paginas is None:
+            return 'descartado'
+        if self.paginas_por_driver and paginas >= self.paginas_por_driver:
+            return f'{paginas} páginas'
+        if self.rss_max_mb:
+            pid = _pid_driver(driver)
+            memoria = rss_mb(pid) if pid else None
+            if memoria is not None and memoria > self.rss_max_mb:
+                return f'{memoria:.0f} MB de memória'
+        try:
+            # Verificação barata: o navegador responde a um comando
+            driver.execute_script('return 1')
+        except Exception as e:
+            return f'não responde ({type(e).__name__})'
+        return None
+
+    def _driver(self):
+        """Driver saudável da thread atual (cria, ou recicla o anterior, quando preciso)"""
+        driver = getattr(self._local, 'driver', None)
+        if driver is not None:
+            motivo = self._motivo_reciclar(driver)
+            if motivo is None:
+                return driver
+            logger.info(f"♻️  Reciclando navegador: {motivo}")
+            self._descartar(driver)
+            self._local.driver = None
+            with self._lock:
+                self.drivers_reciclados += 1
+
+        driver = self.criar_driver()
+        if driver is None:
+            return None
+        self._local.driver = driver
+        with self._lock:
+            self._drivers[driver] = 0
+            self.drivers_criados += 1
+        return driver
+
+    def _descartar(self, driver):
+        """Encerra o driver e o tira do pool (a thread dona cria outro quando precisar)"""
+        with self._lock:
+            if self._drivers.pop(driver, None) is None:
+                return
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Erro ao encerrar driver: {e}")
+
+    # ---------------- extração ----------------
+
+    def _extrair_url(self, extrair, url, loteria_nome):
+        """Executa extrair(driver, url, loteria_nome) no driver da thread, com prazo"""
+        driver = self._driver()
+        if driver is None:
+            return []
+
+        estourou = threading.Event()
+        def prazo_estourado():
+            estourou.set()
+            logger.warning(f"⏱️  {url} passou de {self.timeout_url}s - encerrando o navegador")
+            self._descartar(driver)
+        timer = threading.Timer(self.timeout_url, prazo_estourado)
+        timer.daemon = True
+
+        inicio = time.monotonic()
+        timer.start()
+        try:
+            resultados = extrair(driver, url, loteria_nome)
+        except Exception as e:
+            logger.error(f"Erro ao extrair de {url}: {e}")
+            resultados = []
+        finally:
+            timer.cancel()
+
+        if estourou.is_set():
+            self._local.driver = None
+            return []
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers[driver] += 1
+        logger.info(f"  → {len(resultados)} resultados de {loteria_nome} ({time.monotonic() - inicio:.1f}s)")
+        return resultados
+
+    def extrair(self, urls, extrair):
+        """
+        Extrai todas as URLs ({url: loteria_nome}) em paralelo.
+        Retorna {url: resultados} na ordem de urls (URLs que falharam ficam com []).
+        """
+        futuros = {
+            url: self._executor.submit(self._extrair_url, extrair, url, loteria_nome)
+            for url, loteria_nome in urls.items()
+        }
+        return {url: futuro.result() for url, futuro in futuros.items()}
+
+    def estado(self):
+        """Drivers vivos, criados e reciclados (para logs/health)"""
+        with self._lock:
+            drivers = dict(self._drivers)
+            criados, reciclados = self.drivers_criados, self.drivers_reciclados
+        return {
+            'tamanho': self.tamanho,
+            'drivers_vivos': len(drivers),
+            'drivers_criados': criados,
+            'drivers_reciclados': reciclados,
+            'paginas_por_driver': sorted(drivers.values(), reverse=True),
+        }
+
+    def fechar(self):
+        """Encerra as threads e todos os drivers do pool"""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            drivers = list(self._drivers)
+        for driver in drivers:
+            self._descartar(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+# Pool do processo (monitor): drivers reaproveitados entre ciclos
+_pool = None
+_pool_lock = threading.Lock()
+
+def pool_permitido():
+    """
+    True se este processo pode manter o pool compartilhado: só o líder (que roda o
+    monitor). Em workers web os navegadores ficariam abertos até o fim do processo.
+    """
+    return e_lider()
+
+def obter_pool(criar_driver):
+    """Pool compartilhado do processo líder (criado na primeira chamada, encerrado na saída)"""
+    global _pool
+    if not pool_permitido():
+        raise RuntimeError("Pool de navegadores compartilhado só existe no processo líder")
+    with _pool_lock:
+        if _pool is None:
+            _pool = PoolNavegadores(criar_driver)
+            atexit.register(fechar_pool)
+        return _pool
+
+def estado_pool():
+    """Estado do pool compartilhado, ou None se ele não foi criado neste processo"""
+    with _pool_lock:
+        pool = _pool
+    return pool.estado() if pool is not None else None
+
+def fechar_pool():
+    """Encerra o pool do processo e seus navegadores (idempotente)"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.fechar()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registro compacto de resultado (uma posição de um sorteio)
+
+Substitui o dicionário por posição no dataset em memória: atributos em __slots__
+(sem __dict__ por registro) e strings categóricas (loteria, estado, horário,
+url, datas, animal) internadas, de modo que milhares de registros compartilham
+o mesmo objeto 'PT Rio de Janeiro', 'RJ', etc.
+
+O registro se comporta como o dicionário legado (get, [], in, keys, items,
+values, copy), então os consumidores existentes não precisam mudar.
+Para JSON: to_dict() ou json_padrao (json.dumps(default=...)); o módulo
+serializacao já usa json_padrao.
+"""
+
+import sys
+from operator import attrgetter
+from collections.abc import MutableMapping
+
+# Campo do dicionário legado -> atributo do registro
+ATRIBUTOS = {
+    'numero': 'numero',
+    'animal': 'animal',
+    'loteria': 'loteria',
+    'estado': 'estado',
+    'horario': 'horario',
+    'posicao': 'posicao',
+    'colocacao': 'colocacao',
+    'texto_completo': 'texto_completo',
+    'timestamp': 'timestamp',
+    'data_extração': 'data_extracao',
+    'url_origem': 'url_origem',
+}
+
+# Campos com poucos valores distintos: uma única cópia de cada string no processo
+CAMPOS_INTERNADOS = frozenset((
+    'animal', 'loteria', 'estado', 'horario', 'colocacao', 'timestamp', 'data_extração', 'url_origem'
+))
+
+_CAMPOS = tuple(ATRIBUTOS)
+_VALORES = attrgetter(*ATRIBUTOS.values())
+
+def internar(valor):
+    """sys.intern para strings; outros valores passam inalterados"""
+    return sys.intern(valor) if type(valor) is str else valor
+
+class Resultado(MutableMapping):
+    """Resultado de uma posição de sorteio com interface de dicionário"""
+
+    __slots__ = tuple(ATRIBUTOS.values())
+
+    def __init__(self, numero=None, animal=None, loteria=None, estado=None, horario=None,
+                 posicao=None, colocacao=None, texto_completo=None, timestamp=None,
+                 data_extracao=None, url_origem=None):
+        # Os valores chegam prontos (já internados por quem monta os sorteios)
+        self.numero = numero
+        self.animal = animal
+        self.loteria = loteria
+        self.estado = estado
+        self.horario = horario
+        self.posicao = posicao
+        self.colocacao = colocacao
+        self.texto_completo = texto_completo
+        self.timestamp = timestamp
+        self.data_extracao = data_extracao
+        self.url_origem = url_origem
+
+    # ---------------- interface de dicionário ----------------
+
+    def __getitem__(self, campo):
+        atributo = ATRIBUTOS.get(campo)
+        valor = getattr(self, atributo) if atributo else None
+        if valor is None:
+            raise KeyError(campo)
+        return valor
+
+    def __setitem__(self, campo, valor):
+        atributo = ATRIBUTOS.get(campo)
+        if atributo is None:
+            raise KeyError(f"Campo desconhecido em Resultado: {campo}")
+        setattr(self, atributo, internar(valor) if campo in CAMPOS_INTERNADOS else valor)
+
+    def __delitem__(self, campo):
+        self[campo]
+        setattr(self, ATRIBUTOS[campo], None)
+
+    def __iter__(self):
+        for campo, atributo in ATRIBUTOS.items():
+            if getattr(self, atributo) is not None:
+                yield campo
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, campo):
+        atributo = ATRIBUTOS.get(campo)
+        return atributo is not None and getattr(self, atributo) is not None
+
+    def get(self, campo, padrao=None):
+        atributo = ATRIBUTOS.get(campo)
+        if atributo is None:
+            return padrao
+        valor = getattr(self, atributo)
+        return padrao if valor is None else valor
+
+    def to_dict(self):
+        """Dicionário legado (só os campos preenchidos)"""
+        return {campo: valor for campo, valor in zip(_CAMPOS, _VALORES(self)) if valor is not None}
+
+    copy = to_dict
+
+    def __repr__(self):
+        return f"Resultado({self.to_dict()!r})"
+
+def json_padrao(valor):
+    """Função default para json.dumps: converte Resultado em dicionário"""
+    if isinstance(valor, Resultado):
+        return valor.to_dict()
+    raise TypeError(f"Objeto do tipo {type(valor).__name__} não é serializável em JSON")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Serialização JSON dos resultados (persistência e respostas da API)
+
+Usa orjson quando instalado e cai para o json da biblioteca padrão caso contrário;
+as duas implementações produzem o mesmo JSON (UTF-8, sem escapes ASCII).
+
+- Saída compacta por padrão (consumidores são programas: dashboards, PHP, Cloudflare)
+- Saída indentada só quando pedida (pretty=True ou ?pretty=1 nas rotas Flask)
+- Respostas da API (api=True) no formato do jsonify padrão do Flask: chaves ordenadas
+  e datas em RFC 822 (formatadas pelo default do provedor do Flask)
+- Resultado (registro_resultado) é serializado como o dicionário legado
+"""
+
+import json
+import logging
+
+from registro_resultado import json_padrao
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_DISPONIVEL = True
+    _OPCOES = orjson.OPT_NON_STR_KEYS
+    _OPCOES_PRETTY = orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2
+    # Respostas da API: datas vão para o default (como no json da biblioteca padrão)
+    _OPCOES_API = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+except ImportError:
+    orjson = None
+    ORJSON_DISPONIVEL = False
+
+IMPLEMENTACAO = 'orjson' if ORJSON_DISPONIVEL else 'json'
+
+def dumps(valor, pretty=False, default=json_padrao, api=False):
+    """
+    Serializa para bytes UTF-8 (compacto; indentado com pretty=True).
+    api=True: chaves ordenadas e datas passadas ao default (formato das respostas da API).
+    """
+    if ORJSON_DISPONIVEL:
+        opcoes = _OPCOES_PRETTY if pretty else _OPCOES
+        return orjson.dumps(valor, default=default, option=opcoes | _OPCOES_API if api else opcoes)
+    if pretty:
+        texto = json.dumps(valor, ensure_ascii=False, indent=2, default=default, sort_keys=api)
+    else:
+        texto = json.dumps(valor, ensure_ascii=False, separators=(',', ':'), default=default, sort_keys=api)
+    return texto.encode('utf-8')
+
+def dumps_str(valor, pretty=False, default=json_padrao, api=False):
+    """Como dumps, mas retorna str (ex: colunas TEXT do SQLite, linhas .jsonl)"""
+    return dumps(valor, pretty, default, api).decode('utf-8')
+
+def loads(dados):
+    """Desserializa bytes ou str"""
+    if ORJSON_DISPONIVEL:
+        return orjson.loads(dados)
+    return json.loads(dados)
+
+def pretty_pedido(request):
+    """?pretty=1 (ou true/sim) na requisição Flask"""
+    return request.args.get('pretty', '').lower() in ('1', 'true', 'sim')
+
+def configurar_json_flask(app):
+    """
+    Troca o provedor JSON do app Flask: jsonify passa a usar dumps/loads deste módulo,
+    aceita Resultado e só indenta a resposta com ?pretty=1. O formato continua o do
+    provedor padrão: chaves ordenadas (sort_keys) e datas em RFC 822 (default do Flask).
+    """
+    from flask import request, has_request_context
+
+    provedor = type(app.json)
+
+    class ProvedorJSONResultados(provedor):
+        @staticmethod
+        def default(valor):
+            if hasattr(valor, 'to_dict'):
+                return valor.to_dict()
+            return provedor.default(valor)
+
+        def dumps(self, obj, **kwargs):
+            return dumps_str(obj, pretty='indent' in kwargs, default=self.default, api=self.sort_keys)
+
+        def loads(self, s, **kwargs):
+            return loads(s)
+
+        def response(self, *args, **kwargs):
+            obj = self._prepare_response_obj(args, kwargs)
+            pretty = has_request_context() and pretty_pedido(request)
+            return self._app.response_class(
+                dumps(obj, pretty=pretty, default=self.default, api=self.sort_keys), mimetype=self.mimetype
+            )
+
+    app.json = ProvedorJSONResultados(app)
+    logger.info(f"🧾 Serialização JSON das respostas: {IMPLEMENTACAO}")
@@ -1,7 +1,7 @@
 // Função para atualizar resultados
 async function atualizarResultados() {
     try {
-        const response = await fetch('/api/resultados');
+        const response = await fetch('/api/resultados', { cache: 'no-cache' });
         const dados = await response.json();
         
         // Atualizar estatísticas
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do banco de resultados: importação do resultados.json legado
+
+Uso: python -m pytest -q test_banco_resultados.py
+"""
+
+import json
+
+from banco_resultados import BancoResultados
+from visoes_resultados import montar_organizados
+
+ANIMAIS = ['Avestruz', 'Águia', 'Burro', 'Borboleta', 'Cachorro', 'Cabra', 'Carneiro']
+
+def resultados_legados(dias):
+    """
+    Resultados no formato do resultados.json legado: a posição segue contando entre os
+    dias do mesmo grupo (loteria, horário), ou seja, o segundo dia fica com 8..14
+    """
+    resultados = []
+    posicao = 0
+    for dia, numeros in dias:
+        for numero, animal in zip(numeros, ANIMAIS):
+            posicao += 1
+            resultados.append({
+                'numero': numero,
+                'animal': animal,
+                'loteria': 'PT Rio de Janeiro',
+                'estado': 'RJ',
+                'horario': '14:20',
+                'posicao': posicao,
+                'colocacao': f"{posicao}°",
+                'timestamp': f"{dia[6:]}-{dia[3:5]}-{dia[:2]}T14:30:00-03:00",
+                'data_extração': dia,
+                'url_origem': 'https://bichocerto.com/resultados/rj/para-todos',
+            })
+    return resultados
+
+def test_importar_json_multiplos_dias(tmp_path):
+    dia1 = ['1001', '1002', '1003', '1004', '1005', '1006', '1007']
+    # 1002 repete no segundo dia: é outro sorteio, não uma duplicata
+    dia2 = ['1700', '1002', '1702', '1703', '1704', '1705', '1706']
+    arquivo = tmp_path / 'resultados.json'
+    arquivo.write_text(json.dumps({
+        'resultados': resultados_legados([('17/10/2026', dia1), ('18/10/2026', dia2)]),
+        'ultima_verificacao': '2026-10-18T14:31:00-03:00',
+    }), encoding='utf-8')
+
+    banco = BancoResultados(str(tmp_path / 'resultados.db'))
+    assert banco.importar_json(str(arquivo)) == 14
+
+    sorteios = {sorteio['data']: sorteio for sorteio in banco.listar_sorteios()}
+    assert sorteios['2026-10-17']['numeros'] == dia1
+    assert sorteios['2026-10-18']['numeros'] == dia2
+    assert sorteios['2026-10-18']['animais'] == ANIMAIS
+
+    plano = banco.listar(data='2026-10-18')
+    assert [(r['numero'], r['posicao']) for r in plano] == list(zip(dia2, range(1, 8)))
+
+    organizados = montar_organizados(banco.listar_sorteios())['organizados']
+    assert [r['numero'] for r in organizados['PT Rio de Janeiro']['14:20']] == dia2
+
+def test_lote_parcial_mantem_posicoes_capturadas(tmp_path):
+    banco = BancoResultados(str(tmp_path / 'resultados.db'))
+    primeiros = resultados_legados([('18/10/2026', ['2001', '2002', '2003'])])
+    banco.inserir(primeiros)
+
+    # Coleta seguinte: só a 5ª posição já saiu; a 4ª fica vazia até chegar
+    quinta = dict(primeiros[0], numero='2005', animal='Cabra', posicao=5, colocacao='5°')
+    banco.inserir([quinta])
+
+    sorteio, = banco.listar_sorteios(data='2026-10-18')
+    assert sorteio['numeros'] == ['2001', '2002', '2003', '', '2005']
+    assert [(r['numero'], r['posicao']) for r in banco.listar(data='2026-10-18')] == [
+        ('2001', 1), ('2002', 2), ('2003', 3), ('2005', 5)
+    ]
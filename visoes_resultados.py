@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Visões materializadas dos resultados
+
+Respostas caras de montar (ex: /api/resultados/organizados, /por-estado, /por-data)
+são calculadas uma vez por geração do banco, normalmente ao fim do ciclo do monitor
+que gravou dados novos, e gravadas já serializadas na tabela visoes do banco.
+Os endpoints só devolvem os bytes prontos: a latência não depende do histórico.
+
+A ultima_verificacao muda a cada ciclo sem mudar os dados; ela não faz parte da
+visão gravada e é acrescentada aos bytes na hora de servir.
+"""
+
+import threading
+import logging
+from datetime import datetime
+
+import serializacao
+from banco_resultados import obter_banco, formatar_data, expandir_sorteio
+
+logger = logging.getLogger(__name__)
+
+# Máximo de posições exibidas por sorteio (1° a 7°)
+MAX_POSICOES = 7
+
+def _chave_horario(horario):
+    """Ordenação dos horários (maior primeiro); horários não numéricos vão para o topo"""
+    digitos = horario.replace('h', '').replace(':', '')
+    return int(digitos) if digitos.isdigit() else 999
+
+def montar_organizados(sorteios):
+    """
+    Resultados organizados por tabela (loteria) e horário: para cada horário, as
+    posições (até 7) do sorteio mais recente, mais as estatísticas do conjunto.
+    """
+    mais_recentes = {}
+    for sorteio in sorteios:
+        if not sorteio['numeros']:
+            continue
+        tabela = sorteio.get('loteria') or 'Desconhecida'
+        horario = sorteio.get('horario') or 'N/A'
+        atual = mais_recentes.setdefault(tabela, {}).get(horario)
+        if atual is None or (sorteio.get('data') or '') >= (atual.get('data') or ''):
+            mais_recentes[tabela][horario] = sorteio
+
+    organizados = {}
+    for tabela, por_horario in mais_recentes.items():
+        organizados[tabela] = {}
+        for horario in sorted(por_horario, key=_chave_horario, reverse=True):
+            sorteio = por_horario[horario]
+            data = formatar_data(sorteio.get('data'))
+            organizados[tabela][horario] = [
+                {
+                    'horario': horario,
+                    'animal': animal,
+                    'numero': numero,
+                    'posicao': posicao,
+                    'colocacao': f"{posicao}°",
+                    'estado': sorteio.get('estado') or 'BR',
+                    'data_extracao': data,
+                    'timestamp': sorteio.get('capturado_em') or '',
+                }
+                for posicao, (numero, animal) in enumerate(
+                    zip(sorteio['numeros'][:MAX_POSICOES], sorteio['animais'][:MAX_POSICOES]), start=1
+                )
+                if numero
+            ]
+
+    return {
+        'organizados': organizados,
+        'estatisticas': {
+            'total_tabelas': len(organizados),
+            'total_horarios': sum(len(horarios) for horarios in organizados.values()),
+            'total_resultados': sum(
+                len(resultados) for horarios in organizados.values() for resultados in horarios.values()
+            ),
+        },
+        'fonte': 'bichocerto.com',
+    }
+
+def montar_por_estado(sorteios):
+    """Resultados (visão plana) agrupados por estado, com a contagem de cada um"""
+    por_estado = {}
+    for sorteio in sorteios:
+        por_estado.setdefault(sorteio.get('estado') or 'BR', []).extend(expandir_sorteio(sorteio))
+    return {
+        'por_estado': por_estado,
+        'estatisticas': {estado: len(grupo) for estado, grupo in por_estado.items()},
+        'total_resultados': sum(len(grupo) for grupo in por_estado.values()),
+        'total_estados': len(por_estado),
+    }
+
+def montar_por_data(sorteios):
+    """Resultados (visão plana) agrupados por data (DD/MM/YYYY), com a contagem de cada uma"""
+    hoje = datetime.now().strftime('%d/%m/%Y')
+    por_data = {}
+    for sorteio in sorteios:
+        data = formatar_data(sorteio.get('data')) or hoje
+        por_data.setdefault(data, []).extend(expandir_sorteio(sorteio))
+    return {
+        'por_data': por_data,
+        'estatisticas': {data: len(grupo) for data, grupo in por_data.items()},
+        'total_resultados': sum(len(grupo) for grupo in por_data.values()),
+        'total_datas': len(por_data),
+    }
+
+# Visões disponíveis: nome -> função (sorteios) -> dados
+VISOES = {
+    'organizados': montar_organizados,
+    'por_estado': montar_por_estado,
+    'por_data': montar_por_data,
+}
+
+# Bytes já servidos por este processo: (banco, nome) -> (versao, conteudo)
+_cache_visoes = {}
+_cache_visoes_lock = threading.Lock()
+
+def _com_ultima_verificacao(conteudo, ultima_verificacao):
+    """
+    Acrescenta ultima_verificacao ao objeto JSON serializado (sem reserializar a visão).
+    Vai no fim: as chaves das visões vêm ordenadas e todas ficam antes de 'ultima_verificacao'.
+    """
+    campo = b'"ultima_verificacao":' + serializacao.dumps(ultima_verificacao) + b'}'
+    return conteudo[:-1] + (b',' + campo if conteudo != b'{}' else campo)
+
+def atualizar_visoes(banco=None):
+    """
+    Recalcula e grava as visões cuja geração ficou para trás (chamado ao fim de cada
+    ciclo do monitor). Retorna os nomes das visões reconstruídas.
+    """
+    banco = banco or obter_banco()
+    # Geração lida antes dos dados: se houver escrita no meio, a visão fica marcada
+    # como antiga e é refeita no próximo acesso (nunca o contrário)
+    geracao = str(banco.geracao())
+    pendentes = [nome for nome in VISOES if (banco.ler_visao(nome) or {}).get('versao') != geracao]
+    if not pendentes:
+        return []
+
+    sorteios = banco.listar_sorteios()
+    for nome in pendentes:
+        banco.gravar_visao(nome, geracao, serializacao.dumps(VISOES[nome](sorteios), api=True))
+    logger.info(f"🧮 Visões atualizadas ({', '.join(pendentes)}) - geração {geracao}")
+    return pendentes
+
+def versao_dados(banco=None):
+    """(geração, ultima_verificacao) atuais: identificam o conteúdo de qualquer resposta do banco"""
+    banco = banco or obter_banco()
+    return banco.geracao(), banco.ultima_verificacao()
+
+def obter_visao(nome, banco=None):
+    """
+    Bytes JSON prontos da visão (com ultima_verificacao) para a versão atual dos dados:
+    memória do processo, senão a tabela visoes (gravada pelo monitor), senão recalcula.
+    """
+    banco = banco or obter_banco()
+    geracao, ultima_verificacao = versao_dados(banco)
+    geracao = str(geracao)
+    versao = f"{geracao}:{ultima_verificacao or ''}"
+    with _cache_visoes_lock:
+        entrada = _cache_visoes.get((banco.caminho, nome))
+    if entrada and entrada[0] == versao:
+        return entrada[1]
+
+    gravada = banco.ler_visao(nome)
+    if gravada and gravada['versao'] == geracao:
+        conteudo = gravada['conteudo']
+    else:
+        conteudo = serializacao.dumps(VISOES[nome](banco.listar_sorteios()), api=True)
+        banco.gravar_visao(nome, geracao, conteudo)
+    conteudo = _com_ultima_verificacao(conteudo, ultima_verificacao)
+    with _cache_visoes_lock:
+        _cache_visoes[(banco.caminho, nome)] = (versao, conteudo)
+    return conteudo
+
+# ---------------- resposta do endpoint PHP (compartilhada entre processos) ----------------
+
+def gravar_resultados_php(resultado, banco=None):
+    """Grava a última resposta do endpoint PHP para os processos que não a buscam"""
+    banco = banco or obter_banco()
+    banco.gravar_visao('resultados_php', resultado.get('atualizado_em') or '', serializacao.dumps(resultado))
+
+def ler_resultados_php(banco=None):
+    """Última resposta do endpoint PHP gravada por gravar_resultados_php (ou None)"""
+    gravada = (banco or obter_banco()).ler_visao('resultados_php')
+    return serializacao.loads(gravada['conteudo']) if gravada else None
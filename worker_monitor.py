@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Worker dedicado: monitor Selenium + bot de liquidação + atualizador PHP
+
+Roda fora do servidor web (MONITOR_MODO=externo no app_vps): o scraping e a
+liquidação não disputam CPU/memória com os workers do gunicorn, e um Chrome
+travado não derruba a API. A comunicação com a web é só pelo banco de
+resultados (sorteios, visões, log de eventos, resposta PHP gravada) e pelo
+arquivo de notificação que o banco regrava a cada escrita.
+
+Usa a mesma eleição de líder (lideranca.py): uma segunda instância fica em
+espera e assume se a primeira morrer.
+
+Uso: python3 worker_monitor.py [--intervalo 60] [--sem-bot] [--sem-php]
+"""
+
+import os
+import time
+import signal
+import logging
+import argparse
+
+from lideranca import tentar_lideranca, pid_lider, INTERVALO_LIDER
+from monitor_selenium import verificar
+from pool_navegadores import fechar_pool
+from visoes_resultados import gravar_resultados_php
+
+logger = logging.getLogger(__name__)
+
+_rodando = True
+
+def _parar(signum, frame):
+    """SIGTERM/SIGINT: termina o ciclo atual e sai"""
+    global _rodando
+    _rodando = False
+    logger.info(f"🛑 Sinal {signum} recebido, encerrando worker...")
+
+def _aguardar(segundos):
+    """Dorme em passos de 1s para responder rápido aos sinais"""
+    fim = time.monotonic() + segundos
+    while _rodando and time.monotonic() < fim:
+        time.sleep(min(1, fim - time.monotonic()))
+
+def aguardar_lideranca():
+    """Bloqueia até este processo obter a liderança (ou receber sinal de parada)"""
+    avisado = False
+    while _rodando and not tentar_lideranca():
+        if not avisado:
+            logger.info(f"⏸️  Worker em espera: líder é o processo {pid_lider()}")
+            avisado = True
+        _aguardar(INTERVALO_LIDER)
+    return _rodando
+
+def iniciar_bot():
+    """Cria e inicia o bot de liquidação (se disponível e BOT_AUTO_START=true)"""
+    try:
+        from bot_liquidacao import BotLiquidacao
+    except ImportError:
+        logger.info("ℹ️  Bot de liquidação não disponível")
+        return None
+
+    if os.getenv('BOT_AUTO_START', 'true').lower() != 'true':
+        logger.info("ℹ️  Bot de liquidação não iniciado (use BOT_AUTO_START=true)")
+        return None
+
+    try:
+        bot = BotLiquidacao(
+            database_url=os.getenv('BOT_DATABASE_URL', 'sqlite:///apostas.db'),
+            site_api_url=os.getenv('SITE_API_URL', None),
+            api_key=os.getenv('SITE_API_KEY', None)
+        )
+        bot.iniciar()
+        logger.info("✅ Bot de liquidação iniciado")
+        return bot
+    except Exception as e:
+        logger.error(f"❌ Erro ao inicializar bot de liquidação: {e}", exc_info=True)
+        return None
+
+def iniciar_php():
+    """Atualizador do endpoint PHP, gravando cada resposta no banco para a web"""
+    try:
+        from integracao_endpoint_php import registrar_ao_atualizar, iniciar_atualizador_php
+    except ImportError:
+        logger.info("ℹ️  Integração PHP não disponível")
+        return
+    registrar_ao_atualizar(gravar_resultados_php)
+    iniciar_atualizador_php()
+
+def main():
+    parser = argparse.ArgumentParser(description='Worker dedicado do monitor e do bot de liquidação')
+    parser.add_argument('--intervalo', type=int, default=int(os.getenv('MONITOR_INTERVALO', '60')),
+                        help='Intervalo do monitor em segundos')
+    parser.add_argument('--sem-bot', action='store_true', help='Não iniciar o bot de liquidação')
+    parser.add_argument('--sem-php', action='store_true', help='Não iniciar o atualizador PHP')
+    args = parser.parse_args()
+
+    signal.signal(signal.SIGTERM, _parar)
+    signal.signal(signal.SIGINT, _parar)
+
+    if not aguardar_lideranca():
+        return
+    logger.info(f"👑 Worker {os.getpid()} assumiu a liderança (monitor a cada {args.intervalo}s)")
+
+    bot = None if args.sem_bot else iniciar_bot()
+    if not args.sem_php:
+        iniciar_php()
+
+    while _rodando:
+        try:
+            verificar()
+        except Exception as e:
+            logger.error(f"❌ Erro no ciclo do monitor: {e}", exc_info=True)
+        _aguardar(args.intervalo)
+
+    if bot:
+        bot.parar()
+    fechar_pool()
+    logger.info("👋 Worker encerrado")
+
+if __name__ == '__main__':
+    main()